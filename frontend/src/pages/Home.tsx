@@ -165,16 +165,48 @@ function Home() {
       const formData = new FormData();
       formData.append('file', file);
 
-      const res = await fetch(`${baseUrl}/api/upload-cv`, {
+      const res = await fetch(`${baseUrl}/api/upload-cv/stream`, {
         method: 'POST',
         body: formData,
       });
-      if (!res.ok) {
+      if (!res.ok || !res.body) {
         const errorData = await res.json();
         throw new Error(errorData.detail || 'Upload failed');
       }
 
-      const data = await res.json();
+      // Render the summary and templates as their tokens arrive
+      let data: { summary: string; connection_requests: string } | null = null;
+      let partialSummary = '';
+      let partialRequests = '';
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (data === null) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const frames = buffer.split('\n\n');
+        buffer = frames.pop() ?? '';
+        for (const frame of frames) {
+          const event = frame.match(/^event: (.*)$/m)?.[1];
+          const payload = frame.match(/^data: (.*)$/m)?.[1];
+          if (!event || !payload) continue;
+          const body = JSON.parse(payload);
+          if (event === 'summary_token') {
+            partialSummary += body.token;
+            setResumeSummary(partialSummary);
+          } else if (event === 'template_token') {
+            partialRequests += body.token;
+            setConnectionRequests(partialRequests);
+          } else if (event === 'done') {
+            data = body;
+          }
+        }
+      }
+      if (data === null) {
+        throw new Error('Upload stream ended early');
+      }
+
       setResumeSummary(data.summary);
       setConnectionRequests(data.connection_requests);
       
@@ -53,25 +53,50 @@ const failedCount = profiles.filter((p) => p.status === 'failed').length;
   };
 
   useEffect(() => {
+    let intervalId: ReturnType<typeof setInterval> | null = null;
+    let cursor: string | null = null;
+
+    const applyState = (data: any) => {
+      // data: { profiles: [...], is_done: boolean, profiles_needed: number }
+      if (Array.isArray(data.profiles)) {
+        setProfiles(data.profiles);
+      }
+      if (typeof data.is_done === 'boolean') {
+        setIsDone(data.is_done);
+      }
+      // set how many user *asked for*
+      if (typeof data.profiles_needed === 'number') {
+        setProfilesNeeded(data.profiles_needed);
+      }
+      if (data.csv_file_path) {
+        setCsvFilePath(data.csv_file_path);
+      }
+    };
+
+    const upsertProfile = (profile: Profile) => {
+      setProfiles((prev) => {
+        const idx = prev.findIndex((p) => p.id === profile.id);
+        if (idx === -1) return [...prev, profile];
+        const next = [...prev];
+        next[idx] = profile;
+        return next;
+      });
+    };
+
     const fetchProgress = async () => {
       setIsLoading(true);
       try {
-        const resp = await fetch('http://localhost:8000/api/progress');
+        // Ask only for what changed since the last state we saw
+        const query = cursor === null ? '' : `?since=${encodeURIComponent(cursor)}`;
+        const resp = await fetch(`http://localhost:8000/api/progress${query}`);
+        if (resp.status === 304) return;
         const data = await resp.json();
-        // data: { profiles: [...], is_done: boolean, profiles_needed: number }
-
-        if (Array.isArray(data.profiles)) {
-          setProfiles(data.profiles);
-        }
-        if (typeof data.is_done === 'boolean') {
-          setIsDone(data.is_done);
-        }
-        // set how many user *asked for*
-        if (typeof data.profiles_needed === 'number') {
-          setProfilesNeeded(data.profiles_needed);
-        }
-        if (data.csv_file_path) {
-          setCsvFilePath(data.csv_file_path);
+        cursor = data.cursor;
+        if (data.full === false) {
+          data.profiles.forEach(upsertProfile);
+          applyState({ ...data, profiles: undefined });
+        } else {
+          applyState(data);
         }
       } catch (err) {
         console.error('Error fetching progress:', err);
@@ -80,11 +105,37 @@ const failedCount = profiles.filter((p) => p.status === 'failed').length;
       }
     };
 
-    // initial fetch
-    fetchProgress();
-    // poll every 5s
-    const intervalId = setInterval(fetchProgress, 10000);
-    return () => clearInterval(intervalId);
+    // Prefer pushed updates; fall back to polling if the stream fails
+    const source = new EventSource('http://localhost:8000/api/progress/stream');
+    source.addEventListener('snapshot', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      applyState(data);
+      if (data.is_done) source.close();
+    });
+    source.addEventListener('reset', () => {
+      setProfiles([]);
+      setIsDone(false);
+    });
+    source.addEventListener('target', (e) => applyState(JSON.parse((e as MessageEvent).data)));
+    source.addEventListener('profile_added', (e) => upsertProfile(JSON.parse((e as MessageEvent).data)));
+    source.addEventListener('profile_updated', (e) => upsertProfile(JSON.parse((e as MessageEvent).data)));
+    source.addEventListener('done', (e) => {
+      applyState(JSON.parse((e as MessageEvent).data));
+      source.close();
+    });
+    source.onerror = () => {
+      source.close();
+      if (intervalId === null) {
+        fetchProgress();
+        // poll every 10s
+        intervalId = setInterval(fetchProgress, 10000);
+      }
+    };
+
+    return () => {
+      source.close();
+      if (intervalId !== null) clearInterval(intervalId);
+    };
   }, []);
 
   // For convenience: how many have we actually discovered so far
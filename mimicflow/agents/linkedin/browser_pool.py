@@ -0,0 +1,185 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from browser_use.browser.browser import Browser
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+from playwright.async_api import Page
+
+# Page a context is parked on between leases
+BLANK_PAGE = "about:blank"
+
+
+class PooledContext(BrowserContext):
+    """
+    BrowserContext that only follows tabs it opened itself. Attached to a
+    running Chrome, every BrowserContext wraps the same Chrome context, and
+    browser_use points each of them at whichever tab opened last; this one
+    ignores tabs opened from other contexts' pages and keeps a list of its
+    own, so they can be closed without touching anyone else's.
+    """
+
+    def __init__(self, browser: Browser, config: BrowserContextConfig = BrowserContextConfig()):
+        super().__init__(browser=browser, config=config)
+        # The tab the session starts on, and every tab opened from it since
+        self.home_page: Optional[Page] = None
+        self.opened_pages: List[Page] = []
+
+    def _own_pages(self) -> List[Page]:
+        return [self.home_page] + self.opened_pages
+
+    def _add_new_page_listener(self, context):
+        async def on_page(page: Page):
+            opener = await page.opener()
+            if opener is None or opener not in self._own_pages():
+                return
+            self.opened_pages.append(page)
+            await page.wait_for_load_state()
+            if self.session is not None:
+                self.session.current_page = page
+
+        context.on("page", on_page)
+
+    async def _initialize_session(self):
+        session = await super()._initialize_session()
+        self.home_page = session.current_page
+        return session
+
+    async def create_new_tab(self, url: Optional[str] = None) -> None:
+        await super().create_new_tab(url)
+        self.opened_pages.append(self.session.current_page)
+
+    def release_pages(self) -> List[Page]:
+        """Tabs opened since the last call, forgotten by the context."""
+        pages, self.opened_pages = self.opened_pages, []
+        return pages
+
+
+class BrowserPool:
+    """
+    Keeps one Browser alive for a whole run and leases warmed
+    BrowserContexts to profile agents, at most `size` at a time. A returned
+    context is reset to a single blank tab and reused, so only the first
+    lease of each context pays for creating it.
+
+    When the Browser is attached to a running Chrome, every context shares
+    Chrome's own browser context and each lease is effectively one tab.
+    Contexts are PooledContexts, which only follow tabs they opened, and a
+    lease is pinned to its own tab when it starts and again when it ends.
+    """
+
+    def __init__(self, browser: Browser, size: int):
+        self.browser = browser
+        self.size = max(1, size)
+        self._slots: asyncio.Semaphore = None
+        self._idle: List[BrowserContext] = []
+        self._leased = 0
+        self._leases = 0
+        self._lease_wait_total = 0.0
+        self._lease_wait_max = 0.0
+        self._home_pages: Dict[str, object] = {}
+        self._contexts: List[BrowserContext] = []
+        # Contexts handed out for good, e.g. to the search agent
+        self._dedicated: List[BrowserContext] = []
+
+    def _lease_slots(self) -> asyncio.Semaphore:
+        # Created lazily so the pool can be built outside the event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        return self._slots
+
+    async def _new_context(self) -> BrowserContext:
+        context = PooledContext(self.browser, self.browser.config.new_context_config)
+        session = await context.get_session()
+        self._home_pages[context.context_id] = session.current_page
+        self._contexts.append(context)
+        return context
+
+    async def warm(self):
+        """Create every context of the pool up front."""
+        while len(self._contexts) < self.size:
+            self._idle.append(await self._new_context())
+
+    async def open_context(self) -> BrowserContext:
+        """
+        A PooledContext outside the leases, kept until the pool closes, for
+        agents such as the search agent that must not follow the profile
+        workers' tabs.
+        """
+        context = PooledContext(self.browser, self.browser.config.new_context_config)
+        await context.get_session()
+        self._dedicated.append(context)
+        return context
+
+    async def _reset(self, context: BrowserContext):
+        """Close the tabs this lease opened and park the context on a blank page."""
+        home_page = self._home_pages[context.context_id]
+        session = await context.get_session()
+        try:
+            for page in context.release_pages():
+                if not page.is_closed():
+                    await page.close()
+        finally:
+            session.current_page = home_page
+        await home_page.goto(BLANK_PAGE)
+
+    async def _discard(self, context: BrowserContext):
+        self._home_pages.pop(context.context_id, None)
+        self._contexts.remove(context)
+        try:
+            await context.close()
+        except Exception as e:
+            print(f"Error closing browser context: {e}")
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserContext]:
+        started = time.monotonic()
+        async with self._lease_slots():
+            waited = time.monotonic() - started
+            self._leases += 1
+            self._lease_wait_total += waited
+            self._lease_wait_max = max(self._lease_wait_max, waited)
+            # A free slot always has an idle context or room for a new one
+            context = self._idle.pop() if self._idle else await self._new_context()
+            session = await context.get_session()
+            session.current_page = self._home_pages[context.context_id]
+            self._leased += 1
+            try:
+                yield context
+            finally:
+                self._leased -= 1
+                try:
+                    await self._reset(context)
+                except Exception as e:
+                    # A crashed or closed tab is replaced on a later lease
+                    print(f"Could not reset browser context, discarding it: {e}")
+                    await self._discard(context)
+                else:
+                    self._idle.append(context)
+
+    async def close(self):
+        """Close every context the pool created. The Browser is left to its owner."""
+        for context in list(self._contexts) + self._dedicated:
+            try:
+                await context.close()
+            except Exception as e:
+                print(f"Error closing browser context: {e}")
+        self._contexts = []
+        self._dedicated = []
+        self._idle = []
+        self._home_pages = {}
+
+    def stats(self) -> Dict:
+        return {
+            "size": self.size,
+            "contexts": len(self._contexts),
+            "leased": self._leased,
+            "idle": len(self._idle),
+            "leases": self._leases,
+            "lease_wait_total_s": round(self._lease_wait_total, 3),
+            "lease_wait_max_s": round(self._lease_wait_max, 3),
+            "lease_wait_avg_s": (
+                round(self._lease_wait_total / self._leases, 3) if self._leases else 0.0
+            ),
+        }
@@ -0,0 +1,123 @@
+from typing import Optional
+
+from playwright.async_api import Page
+from pydantic import BaseModel
+
+from mimicflow.agents.linkedin.pacing import INTERACTION, PacingScheduler, linkedin_pacer
+
+# LinkedIn caps connection notes at 300 characters
+MAX_NOTE_LENGTH = 300
+# Milliseconds to wait for each expected state after a click
+STEP_TIMEOUT_MS = 5000
+# Custom_Message recorded when a profile offers no way to connect
+NO_CONNECT_MESSAGE = "No Connect Button Found or Already Connected"
+
+# The profile's own top card; "Invite ... to connect" buttons elsewhere in
+# main belong to suggested profiles
+TOP_CARD = "main section:has(h1)"
+CONNECT_BUTTON = f'{TOP_CARD} button[aria-label^="Invite"][aria-label$="to connect"]'
+MORE_BUTTON = f'{TOP_CARD} button[aria-label="More actions"]'
+MORE_MENU_CONNECT = f'{TOP_CARD} div[role="button"][aria-label^="Invite"][aria-label$="to connect"]'
+DIALOG = 'div[role="dialog"]'
+ADD_NOTE_BUTTON = f'{DIALOG} button[aria-label="Add a note"]'
+SEND_WITHOUT_NOTE_BUTTON = f'{DIALOG} button[aria-label="Send without a note"]'
+NOTE_FIELD = f'{DIALOG} textarea[name="message"]'
+SEND_BUTTON = f'{DIALOG} button[aria-label="Send invitation"], {DIALOG} button[aria-label="Send now"]'
+
+
+class ConnectOutcome(BaseModel):
+    # "sent", "not_available" (already connected or pending) or "handoff"
+    status: str
+    reason: str = ""
+
+
+async def _visible(page: Page, selector: str, timeout: int = 0) -> bool:
+    """Whether the selector shows up within `timeout` milliseconds."""
+    locator = page.locator(selector).first
+    if timeout:
+        try:
+            await locator.wait_for(state="visible", timeout=timeout)
+        except Exception:
+            return False
+        return True
+    return await locator.is_visible()
+
+
+def _names(text: str, invitee: str) -> bool:
+    """Whether text names the invitee, by first name, ignoring case."""
+    first_name = invitee.split()[0].casefold() if invitee.split() else ""
+    return bool(first_name) and first_name in (text or "").casefold()
+
+
+async def _hand_back(page: Page, reason: str, pacer: PacingScheduler) -> ConnectOutcome:
+    """Close a dialog the flow opened, so the agent starts from the profile page."""
+    if await _visible(page, DIALOG):
+        await pacer.wait(INTERACTION)
+        await page.keyboard.press("Escape")
+    return ConnectOutcome(status="handoff", reason=reason)
+
+
+async def _click(page: Page, selector: str, pacer: PacingScheduler):
+    await pacer.wait(INTERACTION)
+    await page.locator(selector).first.click(timeout=STEP_TIMEOUT_MS)
+
+
+async def run_connect_flow(
+    page: Page,
+    note: Optional[str],
+    invitee: str,
+    pacer: PacingScheduler = linkedin_pacer,
+) -> ConnectOutcome:
+    """
+    Send a connection request to `invitee` from their open profile page,
+    with a note of at most MAX_NOTE_LENGTH characters when one is given. Each click is followed by a check that
+    the page reached the expected state; anything else (an email prompt, a
+    weekly limit notice, a dialog for someone else, ...) is handed back to
+    the caller with any open dialog closed, instead of guessed at. Every
+    click and keystroke draws on the account's interaction budget.
+    """
+    # 1. Connect sits in the top card, or behind "More" for followed profiles
+    if await _visible(page, CONNECT_BUTTON):
+        connect_selector = CONNECT_BUTTON
+    elif await _visible(page, MORE_BUTTON):
+        await _click(page, MORE_BUTTON, pacer)
+        if not await _visible(page, MORE_MENU_CONNECT, STEP_TIMEOUT_MS):
+            await pacer.wait(INTERACTION)
+            await page.keyboard.press("Escape")
+            return ConnectOutcome(status="not_available", reason=NO_CONNECT_MESSAGE)
+        connect_selector = MORE_MENU_CONNECT
+    else:
+        return ConnectOutcome(status="handoff", reason="Profile actions not found")
+    label = await page.locator(connect_selector).first.get_attribute("aria-label")
+    if not _names(label, invitee):
+        return await _hand_back(page, f"Connect button is for someone else: {label}", pacer)
+    await _click(page, connect_selector, pacer)
+
+    # 2. The invitation dialog offers a note or sending without one
+    if not await _visible(page, DIALOG, STEP_TIMEOUT_MS):
+        return ConnectOutcome(status="handoff", reason="Invitation dialog did not open")
+    if not _names(await page.locator(DIALOG).first.inner_text(), invitee):
+        return await _hand_back(page, "Invitation dialog does not name the profile", pacer)
+    if note:
+        if not await _visible(page, ADD_NOTE_BUTTON):
+            return await _hand_back(page, "Unexpected invitation dialog", pacer)
+        await _click(page, ADD_NOTE_BUTTON, pacer)
+        if not await _visible(page, NOTE_FIELD, STEP_TIMEOUT_MS):
+            return await _hand_back(page, "Note field did not appear", pacer)
+        await pacer.wait(INTERACTION)
+        await page.locator(NOTE_FIELD).first.fill(note)
+        send_selector = SEND_BUTTON
+    else:
+        send_selector = SEND_WITHOUT_NOTE_BUTTON
+
+    if not await _visible(page, send_selector):
+        return await _hand_back(page, "Send button not found", pacer)
+    await _click(page, send_selector, pacer)
+
+    # 3. A sent invitation closes the dialog
+    try:
+        await page.locator(DIALOG).first.wait_for(state="hidden", timeout=STEP_TIMEOUT_MS)
+    except Exception:
+        # Possibly sent; closing the dialog keeps the agent from sending twice
+        return await _hand_back(page, "Dialog still open after sending", pacer)
+    return ConnectOutcome(status="sent")
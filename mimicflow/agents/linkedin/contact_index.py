@@ -0,0 +1,62 @@
+from typing import Dict, Iterable, Optional
+import threading
+
+from mimicflow.agents.linkedin.search_results_parser import canonical_profile_url
+from mimicflow.app.result_store import ResultStore
+
+# Outcomes recorded for a profile URL
+CONTACTED = "contacted"  # connection request sent
+EXTRACTED = "extracted"  # profile read without sending a request
+FAILED = "failed"
+SKIPPED = "skipped"  # already connected, or no way to connect
+
+# Profiles a new search leaves out: anyone we already messaged or cannot
+# connect with. Observer runs also leave out profiles they already read.
+SKIP_WHEN_CONNECTING = frozenset({CONTACTED, SKIPPED})
+SKIP_WHEN_OBSERVING = frozenset({CONTACTED, SKIPPED, EXTRACTED})
+
+
+def normalize_profile_url(url: str) -> str:
+    """One key per profile, whatever tracking parameters or casing the link had."""
+    canonical = canonical_profile_url(url)
+    if canonical is None:
+        canonical = url.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+    return canonical.lower()
+
+
+class ContactIndex:
+    """
+    Status of every profile URL visited by any run, keyed by normalized
+    URL. Lookups are dict hits; the store is read once and written through,
+    so the index survives restarts and is shared by concurrent searches.
+    """
+
+    def __init__(self, store: Optional[ResultStore] = None):
+        self.store = store
+        self._statuses: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def _loaded(self) -> Dict[str, str]:
+        if self._statuses is None:
+            with self._lock:
+                if self._statuses is None:
+                    self._statuses = self.store.get_contacts() if self.store else {}
+        return self._statuses
+
+    def status(self, url: str) -> Optional[str]:
+        return self._loaded().get(normalize_profile_url(url))
+
+    def is_known(self, url: str, statuses: Iterable[str]) -> bool:
+        return self.status(url) in statuses
+
+    def record(self, url: str, status: str, job_id: Optional[str] = None, name: str = ""):
+        key = normalize_profile_url(url)
+        self._loaded()[key] = status
+        if self.store:
+            self.store.set_contact(key, status, job_id=job_id, name=name)
+
+    def stats(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for status in self._loaded().values():
+            counts[status] = counts.get(status, 0) + 1
+        return counts
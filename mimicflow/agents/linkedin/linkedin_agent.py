@@ -3,15 +3,75 @@ import json
 import asyncio
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field, model_validator
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
 from browser_use.browser.browser import Browser, BrowserConfig, BrowserContext
-from browser_use import ActionResult, Agent, Controller
+from browser_use.browser.context import BrowserContextConfig
+from browser_use import ActionResult, Agent
+from main_content_extractor import MainContentExtractor
 from mimicflow.app.progress_manager import ProgressManager
+from mimicflow.app.llm_registry import llm_registry
+from mimicflow.agents.linkedin.result_writer import ResultWriter
+from mimicflow.agents.linkedin.pacing import (
+    PROFILE_PRIORITY,
+    SEARCH_PRIORITY,
+    linkedin_pacer,
+)
+from mimicflow.agents.linkedin.paced_controller import PacedController
+from mimicflow.agents.linkedin.browser_pool import BrowserPool
+from mimicflow.agents.linkedin.connect_flow import (
+    MAX_NOTE_LENGTH,
+    NO_CONNECT_MESSAGE,
+    run_connect_flow,
+)
+from mimicflow.agents.linkedin.contact_index import (
+    CONTACTED,
+    EXTRACTED,
+    FAILED,
+    SKIP_WHEN_CONNECTING,
+    SKIP_WHEN_OBSERVING,
+    SKIPPED,
+    ContactIndex,
+    normalize_profile_url,
+)
+from mimicflow.agents.linkedin.message_batcher import MessageBatcher
+from mimicflow.agents.linkedin.profile_page_parser import (
+    missing_fields,
+    parse_profile_page,
+)
+from mimicflow.agents.linkedin.search_url import (
+    LINKEDIN_HOME_URL,
+    FacetIdCache,
+    compile_search_url,
+    lookup_facet_id,
+)
+from mimicflow.agents.linkedin.search_results_parser import (
+    RESULTS_PER_PAGE,
+    RESULTS_READY_SELECTOR,
+    search_page_url,
+    parse_search_results_html,
+    parse_search_results_markdown,
+)
+from mimicflow.agents.linkedin.template_selector import (
+    TemplateSelector,
+    replace_templates,
+    split_templates,
+)
+
+# Models used to pick search results out of a results page
+DOM_ANALYSIS_OPENAI_MODEL = "gpt-4"
+DOM_ANALYSIS_GEMINI_MODEL = "gemini-2.0-flash-exp"
+
+# Result pages searched beyond pages_needed when duplicates leave a shortfall
+MAX_EXTRA_PAGES = 5
+
+# Result pages of a URL search loaded at once, each in a pooled tab
+SEARCH_PAGE_CONCURRENCY = 3
+
+# Profile agents run at once by default, each in its own browser
+DEFAULT_PROFILE_WORKERS = 3
 
 
 class ExtractAndSaveContent(BaseModel):
@@ -76,6 +136,21 @@ Titles: {', '.join(self.titles or [])}
 Additional Filters: {', '.join(self.additional_filters) if self.additional_filters else 'None'}"""
 
 
+def new_browser() -> Browser:
+    """The Chrome instance searches run in, logged in to LinkedIn."""
+    return Browser(
+        config=BrowserConfig(
+            headless=False,
+            chrome_instance_path="/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+            # Pacing is left to linkedin_pacer instead of fixed sleeps;
+            # pages still wait for the network to go idle
+            new_context_config=BrowserContextConfig(
+                minimum_wait_page_load_time=0, wait_between_actions=0
+            ),
+        )
+    )
+
+
 class LinkedInSearchAgent:
     def __init__(
         self,
@@ -87,8 +162,17 @@ class LinkedInSearchAgent:
         include_note: bool = True,
         template_mode: str = "examples",
         custom_template: str = None,
+        job_id: str = None,
+        output_dir: str = None,
+        profile_workers: int = DEFAULT_PROFILE_WORKERS,
+        save_search_pages: bool = False,
+        contact_index: ContactIndex = None,
+        facet_cache: FacetIdCache = None,
+        browser_pool: BrowserPool = None,
     ):
         self.filter = filter_config
+        self.profile_workers = max(1, profile_workers)
+        self.job_id = job_id
         self.send_connection_request = send_connection_request
         self.include_note = include_note
         # Assuming 10 profiles per page
@@ -96,24 +180,57 @@ class LinkedInSearchAgent:
             filter_config.profiles_needed + 9
         ) // 10  # Ceiling division
         self.profiles_needed = filter_config.profiles_needed
-        self.progress_manager = progress_manager
-        self.base_dir, self.csv_file_path = self._setup_directories(base_output_dir)
-        self.controller = Controller()
-        self.llm = self._setup_llm(llm)
-        self.browser = Browser(
-            config=BrowserConfig(
-                headless=False,
-                chrome_instance_path="/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        # Pages beyond pages_needed make up for duplicates and skipped profiles
+        self.max_pages = self.pages_needed + MAX_EXTRA_PAGES
+        # Runs outside the web app, like the CLI, track progress in memory
+        self.progress_manager = progress_manager or ProgressManager()
+        if output_dir:
+            # Resuming: keep writing into the directory of the interrupted run
+            self.base_dir = Path(output_dir)
+            self.csv_file_path = self.base_dir / "detailed_profiles.csv"
+        else:
+            self.base_dir, self.csv_file_path = self._setup_directories(
+                base_output_dir
             )
-        )
+        # Agent actions wait for the account's pacing budget, search first
+        self.controller = PacedController(priority=SEARCH_PRIORITY)
+        # Profile agents get their own controller, whose "done" returns a
+        # LinkedInProfileResult; the search agent keeps the default one
+        self.profile_controller = PacedController(priority=PROFILE_PRIORITY)
+        self.llm = self._setup_llm(llm)
+        # A pool shared by several searches stays open for its owner to close
+        self._owns_browser = browser_pool is None
+        if browser_pool is None:
+            # Profile agents lease warmed contexts of the same browser
+            browser_pool = BrowserPool(new_browser(), size=self.profile_workers)
+        self.browser_pool = browser_pool
+        self.browser = browser_pool.browser
 
         # Register the extract and save content action
         self._register_actions()
+        self._register_profile_result()
         self.total_profiles_collected = 0
         self.search_agent_history = None
         self.profile_agent_histories = {}  # Store histories for each profile agent
+        # Profiles found by the search phase, in order; the profile workers
+        # consume them from profile_queue while the search continues
+        self.discovered_profiles: List[Dict] = []
+        self.profile_queue: Optional[asyncio.Queue] = None
+        # Outcomes of every past run, so profiles are not visited twice
+        self.contact_index = contact_index or ContactIndex(
+            getattr(progress_manager, "store", None)
+        )
+        self._seen_urls = set()
+        # Form-based filters are compiled into a search URL when possible
+        self.search_url = filter_config.linkedin_url
+        self.facet_cache = facet_cache or FacetIdCache(
+            getattr(progress_manager, "store", None)
+        )
+        self.save_search_pages = save_search_pages
         self.template_mode = template_mode
         self.custom_template = custom_template
+        # Picks the templates each note prompt carries, set up by run()
+        self.template_selector: Optional[TemplateSelector] = None
 
     def _setup_directories(self, base_dir: str) -> Path:
         """Setup directory structure for this search"""
@@ -134,6 +251,10 @@ class LinkedInSearchAgent:
             first_title = self.filter.titles[0] if self.filter.titles else "no_title"
             search_id = f"{first_company}_{first_title}_{timestamp}"
 
+        # Keep concurrent jobs with the same filters in separate directories
+        if self.job_id:
+            search_id = f"{search_id}_{self.job_id}"
+
         # Create safe filename by removing special characters
         search_id = "".join(
             c for c in search_id if c.isalnum() or c in ("_", "-")
@@ -154,7 +275,7 @@ class LinkedInSearchAgent:
         return search_path, csv_file_path
 
     def _register_profile_result(self):
-        @self.controller.registry.action(
+        @self.profile_controller.registry.action(
             "Done with task", param_model=LinkedInProfileResult
         )
         async def done(params: LinkedInProfileResult):
@@ -169,16 +290,12 @@ class LinkedInSearchAgent:
             api_key = os.getenv("GEMINI_API_KEY")
             if not api_key:
                 raise ValueError("GEMINI_API_KEY not set")
-            return ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash-exp",
-                api_key=api_key,
-                temperature=0.0,
-            )
+            return llm_registry.get("google", "gemini-2.0-flash-exp", temperature=0.0)
         elif "gpt" in llm or "o1" in llm:
             return (
-                ChatOpenAI(model="gpt-4o", temperature=0.0)
+                llm_registry.get("openai", "gpt-4o", temperature=0.0)
                 if "gpt" in llm
-                else ChatOpenAI(model="gpt-4o")
+                else llm_registry.get("openai", "gpt-4o")
             )
         else:
             raise ValueError(f"Unsupported LLM type: {llm}")
@@ -187,148 +304,232 @@ class LinkedInSearchAgent:
         """Register custom actions with the controller"""
 
         @self.controller.registry.action(
-            "Extract and save page content to a file",
+            "Extract the profiles in the search results of the current page",
             param_model=ExtractAndSaveContent,
             requires_browser=True,
         )
         async def extract_and_save_content(
             params: ExtractAndSaveContent, browser: BrowserContext
         ):
-            # First use the extract_content action directly from registry
-            extract_result = await self.controller.registry.execute_action(
-                "extract_content",
-                {"include_links": params.include_links},
-                browser=browser,
+            page = await browser.get_current_page()
+            return await self._ingest_search_page(
+                params.page_number, await page.content(), params.include_links
             )
 
-            # Extract the content from the result
-            raw_content = extract_result.extracted_content
-
-            # Try OpenAI first, fallback to Gemini
-            openai_key = os.getenv('OPENAI_API_KEY')
-            if openai_key:
-                try:
-                    dom_analysis_llm = ChatOpenAI(
-                        model="gpt-4",
-                        temperature=0.0,
-                        api_key=openai_key
+    async def _ingest_search_page(
+        self, page_number: int, html: str, include_links: bool = True
+    ) -> ActionResult:
+        """
+        Pull the profiles out of one search results page, queue the new ones
+        and report whether the search is finished.
+        """
+        # Read the result cards straight from the DOM; no LLM needed
+        profiles = parse_search_results_html(html)
+        raw_content = f"{len(profiles)} profile cards parsed from the page DOM"
+        reasoning = "Structural parse of the search result cards."
+        remaining_needed = self.profiles_needed - len(self.progress_manager.profiles)
+        enough = min(RESULTS_PER_PAGE // 2, max(remaining_needed, 1))
+        unique_profiles = []
+        source = "dom"
+
+        # Update the total profiles collected
+        try:
+            if len(profiles) < enough:
+                # Unfamiliar layout: try the profile links of the page
+                # markdown, then fall back to asking an LLM
+                raw_content = await asyncio.to_thread(
+                    MainContentExtractor.extract,
+                    html=html,
+                    output_format="markdown" if include_links else "text",
+                )
+                markdown_profiles = parse_search_results_markdown(raw_content)
+                if len(markdown_profiles) > len(profiles):
+                    profiles = markdown_profiles
+                    source = "markdown"
+                    reasoning = "Profile links parsed from the page markdown."
+                if len(profiles) < enough:
+                    print(
+                        f"Only {len(profiles)} profiles parsed on page "
+                        f"{page_number}, asking the LLM"
                     )
-                except Exception as e:
-                    print(f"Failed to initialize OpenAI: {e}")
-                    dom_analysis_llm = None
-            else:
-                dom_analysis_llm = None
-
-            # Fallback to Gemini if OpenAI fails or isn't configured
-            if dom_analysis_llm is None:
-                try:
-                    dom_analysis_llm = ChatGoogleGenerativeAI(
-                        model="gemini-2.0-flash-exp",
-                        temperature=0.0,
-                        api_key=os.getenv('GEMINI_API_KEY')
+                    source = "llm"
+                    reasoning, profiles = await self._analyze_results_with_llm(
+                        raw_content
                     )
-                except Exception as e:
-                    raise Exception(f"Could not initialize any LLM service for DOM analysis: {e}")
-
-            dom_prompt = """ 
-            Your task:
-            1. The user did a search on LinkedIn for profiles.
-            2. Based on the above extracted page content, return a list of main profiles that resulted from the search in the format: [{"name": ..., "URL": ...}] - it must BE EXACTLY IN THE JSON FORMAT HERE, ELSE YOU WILL BE FINED A MILLION DOLLARS. Note, there might be a lot of noise on the page content due to page layout. Only return the profiles that were intended to be included in the search.
-
-            Provide your output as follows:
-            <REASONING>
-            Mention your strategy for thinking about how to identify which profiles directly resulted from our search vs. what profiles might be noise due to page layout. Look at the DOM above and try to refine your strategy. Apply the strategy to identify the profiles that resulted from our search.
-            </REASONING>
-            <JSON>
-            List of profiles, each profile should have "name" and "URL".
-            </JSON>
-            """
+            print(profiles)
 
-            # Create messages for LLM
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that analyzes interactive elements from the DOM of a webpage.",
-                },
-                {"role": "user", "content": raw_content + "\n" + dom_prompt},
-            ]
+            # Filter out duplicates of this page, this run and past runs
+            skip_statuses = (
+                SKIP_WHEN_CONNECTING
+                if self.send_connection_request
+                else SKIP_WHEN_OBSERVING
+            )
+            page_urls = set()
+            for profile in profiles:
+                url = profile.get("URL", "")
+                if not url:
+                    continue
+                key = normalize_profile_url(url)
+                if key in page_urls or key in self._seen_urls:
+                    continue
+                page_urls.add(key)
+                if self.contact_index.is_known(url, skip_statuses):
+                    print(f"Skipping {url}: {self.contact_index.status(url)} in an earlier run")
+                    continue
+                unique_profiles.append(profile)
+
+            profiles_to_add = unique_profiles[:remaining_needed]
+            self.total_profiles_collected += len(profiles_to_add)
+
+            for p in profiles_to_add:
+                # generate a new ID for each discovered profile
+                profile_id = await self.progress_manager.add_profile(
+                    {"name": p.get("name", "No name"), "URL": p.get("URL", "")}
+                )
+                p["id"] = profile_id
 
-            # Get LLM analysis
-            llm_response = await dom_analysis_llm.ainvoke(messages)
+            # Hand the new profiles straight to the profile workers
+            for p in profiles_to_add:
+                self._enqueue_profile(p)
 
-            # Parse the LLM response
-            response_content = llm_response.content
+        except json.JSONDecodeError:
+            print(
+                f"JSON decode error in extract_and_save_content for page {page_number}"
+            )
 
-            # Extract reasoning and JSON sections
-            reasoning = ""
-            json_content = ""
+        if self.save_search_pages:
+            self._save_search_page(
+                page_number, source, reasoning, unique_profiles, raw_content
+            )
 
-            if "<REASONING>" in response_content and "</REASONING>" in response_content:
-                reasoning = (
-                    response_content.split("<REASONING>")[1]
-                    .split("</REASONING>")[0]
-                    .strip()
-                )
+        collected = len(self.progress_manager.profiles)
+        if collected >= self.profiles_needed:
+            return ActionResult(
+                is_done=True,
+                extracted_content=f"Collected {collected} profiles, the target of {self.profiles_needed} is met. The search is finished.",
+            )
+        if not profiles:
+            return ActionResult(
+                is_done=True,
+                extracted_content=f"No search results on page {page_number}. The search is finished with {collected} profiles.",
+            )
+        if page_number >= self.max_pages:
+            return ActionResult(
+                is_done=True,
+                extracted_content=f"Reached the page limit of {self.max_pages}. The search is finished with {collected} profiles.",
+            )
+        # Duplicates left a shortfall; keep paginating past pages_needed
+        return ActionResult(
+            extracted_content=f"Extracted {len(unique_profiles)} new profiles from page {page_number}; {collected} of {self.profiles_needed} collected. Go to the next page and call extract_and_save_content again."
+        )
 
-            if "<JSON>" in response_content and "</JSON>" in response_content:
-                json_content = (
-                    response_content.split("<JSON>")[1].split("</JSON>")[0].strip()
+    def _save_search_page(
+        self,
+        page_number: int,
+        source: str,
+        reasoning: str,
+        profiles: List[Dict],
+        raw_content: str,
+    ):
+        """Append one results page to search_pages.jsonl, for debugging."""
+        record = {
+            "page_number": page_number,
+            "source": source,
+            "reasoning": reasoning,
+            "profiles": profiles,
+            "raw_content": raw_content,
+        }
+        with open(self.base_dir / "search_pages.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    async def _analyze_results_with_llm(self, raw_content: str):
+        """
+        Ask an LLM for the search results in extracted page content. Returns
+        its reasoning and the profiles as [{"name", "URL"}].
+        """
+        # Try OpenAI first, fallback to Gemini
+        openai_key = os.getenv('OPENAI_API_KEY')
+        if openai_key:
+            try:
+                dom_analysis_llm = llm_registry.get(
+                    "openai", DOM_ANALYSIS_OPENAI_MODEL, temperature=0.0
                 )
+            except Exception as e:
+                print(f"Failed to initialize OpenAI: {e}")
+                dom_analysis_llm = None
+        else:
+            dom_analysis_llm = None
 
-            # Update the total profiles collected
+        # Fallback to Gemini if OpenAI fails or isn't configured
+        if dom_analysis_llm is None:
             try:
-                profiles = json.loads(json_content)
-                print(profiles)
-
-                # Get existing profile URLs from progress manager
-                existing_urls = {p.url for p in self.progress_manager.profiles}
-
-                # Filter out duplicates
-                unique_profiles = []
-                seen_urls = set()
-                for profile in profiles:
-                    url = profile.get("URL", "")
-                    if url and url not in seen_urls and url not in existing_urls:
-                        seen_urls.add(url)
-                        unique_profiles.append(profile)
-
-                remaining_needed = self.profiles_needed - len(
-                    self.progress_manager.profiles
+                dom_analysis_llm = llm_registry.get(
+                    "google", DOM_ANALYSIS_GEMINI_MODEL, temperature=0.0
                 )
-                profiles_to_add = unique_profiles[:remaining_needed]
-                self.total_profiles_collected += len(profiles_to_add)
-
-                for p in profiles_to_add:
-                    # generate a new ID for each discovered profile
-                    profile_id = await self.progress_manager.add_profile(
-                        {"name": p.get("name", "No name"), "URL": p.get("URL", "")}
-                    )
-                    p["id"] = profile_id
-
-                json_content = json.dumps(unique_profiles, indent=2)
-                final_content = f"""Raw Page Content:
-                {raw_content}
-
-                Reasoning:
-                {reasoning}
+            except Exception as e:
+                raise Exception(f"Could not initialize any LLM service for DOM analysis: {e}")
+
+        dom_prompt = """ 
+        Your task:
+        1. The user did a search on LinkedIn for profiles.
+        2. Based on the above extracted page content, return a list of main profiles that resulted from the search in the format: [{"name": ..., "URL": ...}] - it must BE EXACTLY IN THE JSON FORMAT HERE, ELSE YOU WILL BE FINED A MILLION DOLLARS. Note, there might be a lot of noise on the page content due to page layout. Only return the profiles that were intended to be included in the search.
+
+        Provide your output as follows:
+        <REASONING>
+        Mention your strategy for thinking about how to identify which profiles directly resulted from our search vs. what profiles might be noise due to page layout. Look at the DOM above and try to refine your strategy. Apply the strategy to identify the profiles that resulted from our search.
+        </REASONING>
+        <JSON>
+        List of profiles, each profile should have "name" and "URL".
+        </JSON>
+        """
 
-                JSON Output:
-                {json_content}"""
+        # Create messages for LLM
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that analyzes interactive elements from the DOM of a webpage.",
+            },
+            {"role": "user", "content": raw_content + "\n" + dom_prompt},
+        ]
+
+        # Get LLM analysis
+        llm_response = await dom_analysis_llm.ainvoke(messages)
+
+        # Parse the LLM response
+        response_content = llm_response.content
+
+        # Extract reasoning and JSON sections
+        reasoning = ""
+        json_content = ""
+
+        if "<REASONING>" in response_content and "</REASONING>" in response_content:
+            reasoning = (
+                response_content.split("<REASONING>")[1]
+                .split("</REASONING>")[0]
+                .strip()
+            )
 
-            except json.JSONDecodeError:
-                print(
-                    f"JSON decode error in extract_and_save_content for page {params.page_number}"
-                )
+        if "<JSON>" in response_content and "</JSON>" in response_content:
+            json_content = (
+                response_content.split("<JSON>")[1].split("</JSON>")[0].strip()
+            )
 
-            # Only save if we have unique profiles
-            if unique_profiles:
-                filename = self.base_dir / f"page_{params.page_number}.txt"
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(final_content)
+        return reasoning, json.loads(json_content)
 
-            return ActionResult(
-                extracted_content=f"Extracted, analyzed, and saved content for page {params.page_number} to {filename}"
-            )
+    def _pagination_prompt(self) -> str:
+        # The extraction action decides when to stop: it ends the search once
+        # enough unique profiles are in, and asks for more pages otherwise
+        return f"""
+                    a. For each page, starting from page 1:
+                        1. Use extract_and_save_content with:
+                            - page_number: current page number
+                            - include_links: true
+                        2. If extract_and_save_content says the search is finished, you are done.
+                        3. Otherwise:
+                            - Scroll down to the end of the page to find the Next button.
+                            - Click Next to go to the next page
+                        4. Repeat steps 1-3 with the next page number until extract_and_save_content says the search is finished.
+                """
 
     def _generate_task_prompt(self) -> str:
         """Generate the task prompt based on filter configuration"""
@@ -338,25 +539,7 @@ class LinkedInSearchAgent:
                 1. Go to this specific URL: {self.filter.linkedin_url}
                 2. Wait for the search results to load. On the search results page:
             """
-            if self.pages_needed == 1:
-                prompt += """
-                    a. Use extract_and_save_content with:
-                        - page_number: 1
-                        - include_links: true
-                    b. After extraction is complete, call done.
-                """
-            else:
-                prompt += f"""
-                    a. For each page, starting from page 1 up to page {self.pages_needed}:
-                        1. Use extract_and_save_content with:
-                            - page_number: current page number
-                            - include_links: true
-                        2. If this is page {self.pages_needed}, call done after extraction.
-                        3. Otherwise:
-                            - Scroll down to Next button to the end of the page to find the Next button. 
-                            - Click Next to go to the next page
-                        4. Repeat steps 1-3 until you reach the last page, which is {self.pages_needed}, and then call extract_and_save_content one last time. Then call done.
-                """
+            prompt += self._pagination_prompt()
         else:
             prompt += f"""
 
@@ -378,109 +561,20 @@ class LinkedInSearchAgent:
                     - Additional Filters: {', '.join(self.filter.additional_filters) if self.filter.additional_filters else 'None'}. If additional filters like location or past companies are provided, add them as you did with companies and schools.
                 5. Click "Show results".
             """
-            if self.pages_needed == 1:
-                prompt += """
-                6. Wait for the search results to load. On the search results page:
-                    a. Use extract_and_save_content with:
-                        - page_number: 1
-                        - include_links: true
-                    b. After extraction is complete, call done.
-                """
-            else:
-                prompt += f"""
+            prompt += """
                 6. Wait for the search results to load. In the search results, follow these steps:
-                    a. For each page, starting from page 1 up to page {self.pages_needed}:
-                        1. Use extract_and_save_content with:
-                            - page_number: current page number
-                            - include_links: true
-                        2. If this is page {self.pages_needed}, call done after extraction.
-                        3. Otherwise:
-                            - Scroll down to Next button to the end of the page to find the Next button
-                            - Click Next to go to the next page
-                        4. Repeat steps 1-3 until you reach the last page, which is {self.pages_needed}, and then call extract_and_save_content one last time. Then call done.
-                """
+            """
+            prompt += self._pagination_prompt()
 
         return prompt
 
-    def collect_profiles_from_files(self) -> pd.DataFrame:
-        """Parse the saved content files and collect profiles into a DataFrame."""
-        profile_list = []
-        for page in range(
-            1, self.pages_needed + 10
-        ):  # Adding extra pages in case of more profiles
-            # FIXED: Changed from params.page_number to page
-            filename = self.base_dir / f"page_{page}.txt"
-            if not filename.exists():
-                continue  # No more files to process
-
-            # ADDED: Better error handling
-            try:
-                with open(filename, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # CHANGED: New way to check content structure
-                if "Raw Page Content:" in content:
-                    # ADDED: Split into sections
-                    sections = content.split("\n\n")
-                    json_section = None
-
-                    # CHANGED: New way to find JSON section
-                    for section in sections:
-                        if section.strip().startswith("JSON Output:"):
-                            json_content = section.replace("JSON Output:", "").strip()
-                            try:
-                                profiles = json.loads(json_content)
-                                # ADDED: More validation
-                                if isinstance(profiles, list):
-                                    for profile in profiles:
-                                        if (
-                                            isinstance(profile, dict)
-                                            and "name" in profile
-                                            and "URL" in profile
-                                        ):
-                                            profile_list.append(profile)
-
-                                            if (
-                                                len(profile_list)
-                                                >= self.profiles_needed
-                                            ):
-                                                break
-                            except json.JSONDecodeError as e:
-                                # ADDED: Better error message
-                                print(f"JSON decode error in file {filename}: {str(e)}")
-                            break
-
-                    # ADDED: Additional error checking
-                    if not json_section:
-                        print(
-                            f"Could not find JSON section in expected format in file {filename}"
-                        )
-
-            # ADDED: Exception handling
-            except Exception as e:
-                print(f"Error processing file {filename}: {str(e)}")
-                continue
-
-            if len(profile_list) >= self.profiles_needed:
-                break
-
-        # Create DataFrame
-        df = pd.DataFrame(profile_list)
-        # ADDED: Better feedback
-        if df.empty:
-            print("Warning: No profiles were successfully parsed from the files")
-        else:
-            print(f"Successfully parsed {len(df)} profiles")
-        print(df)
-        return df
-
     async def process_profile(self, profile: Dict, in_context_examples: str) -> Dict:
         """Navigate to the profile URL and extract detailed information."""
         profile_url = profile.get("URL")
 
         if not profile_url:
             print(f"No URL found for profile: {profile}")
-            return {}
+            return {}, None
 
         profile_id = profile.get("id")
         if not profile_id:
@@ -492,13 +586,6 @@ class LinkedInSearchAgent:
             profile_id, status="processing", message="Processing profile..."
         )
 
-        single_profile_browser = Browser(
-            config=BrowserConfig(
-                headless=False,
-                chrome_instance_path="/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            )
-        )
-
         profile_name = profile.get("name", "unknown")
         conversations_dir = self.base_dir / "conversations" / "profiles"
 
@@ -576,7 +663,7 @@ class LinkedInSearchAgent:
             # Modify the task prompt based on template mode
             if self.template_mode == "examples":
                 task_prompt += f"""
-                3b. Generate a Custom_Message using this strategy: {in_context_examples}
+                3b. Generate a Custom_Message using this strategy: {self._examples_for(profile, in_context_examples)}
                 Make sure it's concise and less than 300 characters.
                 IMPORTANT: Use my CV SUMMARY to write from first person perspective, never use these details to refer to [Linkedin Profile Name] or [Linkedin Profile Details], which must be from the LINKEDIN PROFILE that is extracted.
                 ONLY USE FIRST NAME OF LINKEDIN USER IN THIS MESSAGE NOT FULL NAME.
@@ -611,17 +698,25 @@ class LinkedInSearchAgent:
     }}
         """
 
-        try:
-            # Register the LinkedInProfileResult action
-            self._register_profile_result()
+        async with self.browser_pool.lease() as browser_context:
+            # Read the profile from the DOM and send the request with a
+            # scripted flow; the agent loop only runs when either comes up short
+            parsed, handoff = await self._process_profile_without_agent(
+                browser_context, profile_url
+            )
+            if parsed is not None:
+                await self.progress_manager.update_profile(
+                    profile_id, status="completed", message=parsed.Custom_Message
+                )
+                return parsed.model_dump(), None
 
             # Create and run agent for this profile
             agent = Agent(
-                task=task_prompt,
+                task=task_prompt + handoff,
                 llm=self.llm,
                 max_actions_per_step=1,
-                browser=single_profile_browser,
-                controller=self.controller,
+                browser_context=browser_context,
+                controller=self.profile_controller,
                 use_vision=False,
                 tool_call_in_content=False,
                 save_conversation_path=str(
@@ -655,9 +750,136 @@ class LinkedInSearchAgent:
                 await self.progress_manager.update_profile(
                     profile_id, status="failed", message="Failed to process profile"
                 )
-        finally:
-            await single_profile_browser.close()
-        return {}
+        return {}, None
+
+    async def _read_profile_page(
+        self, browser_context: BrowserContext, profile_url: str
+    ) -> Optional[Dict]:
+        """
+        Read the LinkedInProfileResult fields of a profile from its page DOM
+        in one pass. Returns None when required fields are missing, so the
+        caller can fall back to the agent.
+        """
+        # Every search shares the account, so visits are paced process-wide.
+        # The token is taken with a context in hand: workers still waiting
+        # for one would otherwise use up the budget and then visit in a burst
+        await linkedin_pacer.wait()
+        try:
+            await browser_context.navigate_to(profile_url)
+            page = await browser_context.get_current_page()
+            fields = parse_profile_page(await page.content(), profile_url)
+        except Exception as e:
+            print(f"Could not read profile page {profile_url}: {e}")
+            return None
+
+        missing = missing_fields(fields)
+        if missing:
+            print(f"Profile page {profile_url} is missing {missing}, using the agent")
+            return None
+        return fields
+
+    def _message_strategy(self, in_context_examples: str) -> str:
+        if self.template_mode != "examples" and self.custom_template:
+            return (
+                "Use this EXACT template and ONLY replace the [Linkedin Profile] "
+                "placeholders with details from the LINKEDIN PROFILE. Do not add or "
+                f"remove any words:\n{self.custom_template}"
+            )
+        return in_context_examples or (
+            "Hi [Name], I noticed your background in [field] and would love to "
+            "connect to learn more about your experience."
+        )
+
+    def _select_templates(self, fields: Dict) -> Optional[List[str]]:
+        if self.template_selector is None:
+            return None
+        return self.template_selector.select(fields)
+
+    def _examples_for(self, profile: Dict, in_context_examples: str) -> str:
+        """
+        in_context_examples with only the templates that fit the profile. A
+        search card, or a resumed profile with just its name and URL, has
+        nothing to rank on, so the agent keeps every template to choose from
+        once it has read the profile.
+        """
+        if self.template_selector is None or not self.template_selector.matches(profile):
+            return in_context_examples
+        return replace_templates(in_context_examples, self._select_templates(profile))
+
+    async def _draft_custom_message(self, fields: Dict) -> str:
+        """A connection message for a profile read from the DOM, batched with others."""
+        first_name = fields["Full_Name"].split()[0]
+        fallback = (
+            f"Hi {first_name}, I noticed your background as {fields['Current_Title']} "
+            f"at {fields['Company']} and would love to connect to learn more about "
+            "your experience."
+        )
+        # Only the fields a note can use; the URL and message are noise
+        profile = {
+            k: v for k, v in fields.items() if k not in ("Custom_Message", "Profile_URL")
+        }
+        message = await self.message_batcher.draft(
+            profile, templates=self._select_templates(profile)
+        )
+        # Cut here, so the note sent and the note saved are the same text
+        return (message or fallback)[:MAX_NOTE_LENGTH]
+
+    @staticmethod
+    def _handoff_prompt(reason: str, note: Optional[str]) -> str:
+        """
+        What the connect flow got done, for the agent taking over from it, so
+        the agent neither drafts a second note nor sends a second request.
+        """
+        prompt = f"""
+        NOTE: The profile is already open in the current tab. An earlier attempt to connect stopped because: {reason}. Any dialog it opened was closed.
+        If the profile now shows "Pending", the request was already sent: do not click Connect again, extract content and call done.
+        """
+        if note:
+            prompt += f"""Use EXACTLY this Custom_Message as the note and in the JSON, do not write a new one:
+        {note}
+        """
+        return prompt
+
+    async def _process_profile_without_agent(
+        self, browser_context: BrowserContext, profile_url: str
+    ) -> Tuple[Optional[LinkedInProfileResult], str]:
+        """
+        Handle a profile with the DOM reader and, when sending requests, the
+        scripted connect flow. Returns None to hand the profile to the agent,
+        with what the flow got done to add to the agent's task.
+        """
+        fields = await self._read_profile_page(browser_context, profile_url)
+        if fields is None:
+            return None, ""
+
+        if not self.send_connection_request:
+            message = await self._draft_custom_message(fields)
+            # Same marker the agent is told to use in observer mode
+            fields["Custom_Message"] = f"potential message: {message}"
+            return LinkedInProfileResult(**fields), ""
+
+        note = None
+        if self.include_note:
+            note = await self._draft_custom_message(fields)
+        page = await browser_context.get_current_page()
+        try:
+            outcome = await run_connect_flow(page, note, invitee=fields["Full_Name"])
+        except Exception as e:
+            print(f"Connect flow failed on {profile_url}: {e}")
+            try:
+                await page.keyboard.press("Escape")
+            except Exception:
+                pass
+            return None, self._handoff_prompt(str(e), note)
+
+        if outcome.status == "handoff":
+            print(f"Connect flow handing {profile_url} to the agent: {outcome.reason}")
+            return None, self._handoff_prompt(outcome.reason, note)
+        if outcome.status == "not_available":
+            fields["Custom_Message"] = outcome.reason
+        else:
+            fields["Custom_Message"] = note or "No Note"
+        return LinkedInProfileResult(**fields), ""
 
     def save_histories(self):
         """Save all agent histories"""
@@ -688,63 +910,293 @@ class LinkedInSearchAgent:
             except Exception as e:
                 print(f"Error saving history for profile {profile_name}: {e}")
 
-    async def run(self, in_context_examples: str) -> pd.DataFrame:
-        """Run the LinkedIn search and profile collection."""
-        try:
-            # await self.progress_manager.set_csv_file_path(self.csv_file_path)
-            # Run the initial search and extract content
-            search_agent = Agent(
-                task=self._generate_task_prompt(),
-                llm=self.llm,
-                max_actions_per_step=5,
-                browser=self.browser,
-                controller=self.controller,
-                use_vision=False,
-                tool_call_in_content=False,
-                save_conversation_path=str(
-                    self.base_dir / "conversations" / "main_search"
-                ),
+    async def _pending_profiles(self) -> List[Dict]:
+        """Checkpointed profiles that still need processing, as run() expects them."""
+        pending = await self.progress_manager.pending_profiles()
+        print(f"Resuming with {len(pending)} pending profiles")
+        return [{"name": p.name, "URL": p.url, "id": p.id} for p in pending]
+
+    def _enqueue_profile(self, profile: Dict):
+        """Hand a discovered profile to the profile workers, in discovery order."""
+        self.discovered_profiles.append(profile)
+        self._seen_urls.add(normalize_profile_url(profile.get("URL", "")))
+        if self.profile_queue is not None:
+            self.profile_queue.put_nowait((len(self.discovered_profiles) - 1, profile))
+
+    def _close_profile_queue(self):
+        # One stop marker per worker
+        for _ in range(self.profile_workers):
+            self.profile_queue.put_nowait(None)
+
+    async def _process_profiles(
+        self,
+        profile_queue: asyncio.Queue,
+        in_context_examples: str,
+        detailed_profiles: List[Dict],
+        result_writer: ResultWriter,
+    ):
+        """
+        Run self.profile_workers profile agents that drain the profile queue
+        until they meet a stop marker. Each result is recorded in the store
+        as soon as its profile finishes, so an interrupted run keeps it; the
+        CSV and returned rows follow discovery order, written once every
+        earlier profile has finished, so they do not depend on which agent
+        wins.
+        """
+        finished = {}
+        next_index = 0
+        # Keeps flushes from interleaving while a result is being recorded
+        flush_lock = asyncio.Lock()
+
+        async def flush():
+            nonlocal next_index
+            # Flush the finished run of profiles at the head of the queue
+            async with flush_lock:
+                while next_index in finished:
+                    profile_info, (extracted_info, profile_history) = finished.pop(
+                        next_index
+                    )
+                    profile_name = profile_info.get("name", f"unknown_{next_index}")
+                    next_index += 1
+                    if extracted_info:
+                        detailed_profiles.append(extracted_info)
+                        # Append just this row; the file is never rewritten
+                        result_writer.append(extracted_info)
+                        # Store single profile history JSON; profiles read
+                        # straight from the DOM have none
+                        if profile_history is not None:
+                            self.profile_agent_histories[profile_name] = profile_history
+
+        async def worker():
+            while True:
+                item = await profile_queue.get()
+                if item is None:
+                    return
+                idx, profile_info = item
+                # One bad profile must not end this worker: gather would not
+                # cancel the others, and the ordered flush would stall on idx
+                try:
+                    outcome = await self.process_profile(profile_info, in_context_examples)
+                except Exception as e:
+                    print(f"Error processing profile {profile_info.get('URL')}: {e}")
+                    outcome = ({}, None)
+                    if profile_info.get("id"):
+                        await self.progress_manager.update_profile(
+                            profile_info["id"], status="failed", message=f"Error: {e}"
+                        )
+                try:
+                    if outcome[0]:
+                        # The profile already shows as completed; resume will
+                        # not visit it again, so its result must not wait
+                        # for earlier profiles to be saved
+                        await self.progress_manager.record_result(outcome[0])
+                    self._record_contact(profile_info, outcome[0])
+                except Exception as e:
+                    print(f"Could not record result of {profile_info.get('URL')}: {e}")
+                finished[idx] = (profile_info, outcome)
+                await flush()
+
+        await asyncio.gather(*(worker() for _ in range(self.profile_workers)))
+
+    def _record_contact(self, profile: Dict, extracted_info: Dict):
+        """Remember how a profile went, for the searches that come after."""
+        url = profile.get("URL")
+        if not url:
+            return
+        if not extracted_info:
+            status = FAILED
+        elif not self.send_connection_request:
+            status = EXTRACTED
+        elif NO_CONNECT_MESSAGE in extracted_info.get("Custom_Message", ""):
+            status = SKIPPED
+        else:
+            status = CONTACTED
+        self.contact_index.record(
+            url, status, job_id=self.job_id, name=profile.get("name", "")
+        )
+
+    async def _run_search(self):
+        if not self.search_url:
+            self.search_url = await self._compile_search_url()
+        if self.search_url:
+            await self._run_url_search()
+        else:
+            # Some name could not be resolved; let the agent fill in the form
+            await self._run_agent_search()
+        await self.progress_manager.mark_search_done()
+
+    async def _compile_search_url(self) -> Optional[str]:
+        """Search URL for the form-based filter, or None if it cannot be built."""
+        async with self.browser_pool.lease() as browser_context:
+            page = None
+
+            async def lookup(kind: str, name: str) -> Optional[str]:
+                nonlocal page
+                # Only open LinkedIn for names that are not cached yet
+                if page is None:
+                    await linkedin_pacer.wait(priority=SEARCH_PRIORITY)
+                    await browser_context.navigate_to(LINKEDIN_HOME_URL)
+                    page = await browser_context.get_current_page()
+                return await lookup_facet_id(page, kind, name)
+
+            async def resolve(kind: str, name: str) -> Optional[str]:
+                return await self.facet_cache.resolve(kind, name, lookup)
+
+            try:
+                search_url = await compile_search_url(self.filter, resolve)
+            except Exception as e:
+                print(f"Could not compile a search URL: {e}")
+                return None
+        print(f"Compiled search URL: {search_url}")
+        return search_url
+
+    async def _run_agent_search(self):
+        """Run the search agent, which feeds the profile queue page by page."""
+        search_agent = Agent(
+            task=self._generate_task_prompt(),
+            llm=self.llm,
+            max_actions_per_step=5,
+            browser=self.browser,
+            # Its own tab, which profile workers opening tabs cannot move
+            browser_context=await self.browser_pool.open_context(),
+            controller=self.controller,
+            use_vision=False,
+            tool_call_in_content=False,
+            save_conversation_path=str(self.base_dir / "conversations" / "main_search"),
+        )
+        # Set a higher max_steps to allow for multiple pages
+        max_steps = self.max_pages * 10 + 20  # Adjust as needed
+        self.search_agent_history = await search_agent.run(max_steps=max_steps)
+
+    async def _fetch_search_page(self, page_number: int) -> str:
+        """HTML of one results page of the search URL, loaded in a pooled tab."""
+        url = search_page_url(self.search_url, page_number)
+        async with self.browser_pool.lease() as browser_context:
+            await linkedin_pacer.wait(priority=SEARCH_PRIORITY)
+            await browser_context.navigate_to(url)
+            page = await browser_context.get_current_page()
+            try:
+                # Results render after the load event
+                await page.wait_for_selector(RESULTS_READY_SELECTOR, timeout=10000)
+            except Exception:
+                print(f"No results rendered on search page {page_number}")
+            return await page.content()
+
+    async def _run_url_search(self):
+        """
+        Page through the search URL by its page parameter instead of clicking
+        Next: up to SEARCH_PAGE_CONCURRENCY pages load at once in pooled
+        tabs, and are extracted in page order without the LLM.
+        """
+        next_page = 1
+        while next_page <= self.max_pages:
+            # Only load as many pages as the profiles still needed could fill
+            remaining = self.profiles_needed - len(self.progress_manager.profiles)
+            if remaining <= 0:
+                return
+            batch_size = min(
+                SEARCH_PAGE_CONCURRENCY,
+                -(-remaining // RESULTS_PER_PAGE),  # Ceiling division
+                self.max_pages - next_page + 1,
             )
-            # Set a higher max_steps to allow for multiple pages
-            max_steps = self.pages_needed * 10 + 20  # Adjust as needed
-            self.search_agent_history = await search_agent.run(max_steps=max_steps)
+            pages = range(next_page, next_page + batch_size)
+            fetches = [
+                asyncio.create_task(self._fetch_search_page(page_number))
+                for page_number in pages
+            ]
+            try:
+                for page_number, fetch in zip(pages, fetches):
+                    result = await self._ingest_search_page(page_number, await fetch)
+                    print(result.extracted_content)
+                    if result.is_done:
+                        return
+            finally:
+                for fetch in fetches:
+                    fetch.cancel()
+            next_page = pages.stop
+
+    async def run(self, in_context_examples: str, resume: bool = False) -> pd.DataFrame:
+        """
+        Run the LinkedIn search and profile collection as a pipeline: profile
+        workers start on page 1's results while the search is still paging.
 
-            # Collect profiles from saved content
-            profiles_df = self.collect_profiles_from_files()
-            if profiles_df.empty:
-                print("No profiles found.")
-                return profiles_df
-
-            # Ensure we have no more than the required number of profiles
-            profiles_df = profiles_df.head(self.profiles_needed)
-
-            # Process each profile and collect detailed information
-            detailed_profiles = []
-            for idx, profile in profiles_df.iterrows():
-                profile_info = profile.to_dict()
-                profile_name = profile_info.get("name", f"unknown_{idx}")
-                extracted_info, profile_history = await self.process_profile(
-                    profile_info, in_context_examples
+        With resume=True, continue an interrupted run from the progress
+        checkpoint: the search is skipped if it had finished, completed
+        profiles are not visited again and their stored results are kept in
+        the output, and failed profiles are retried.
+        """
+        result_writer = ResultWriter(
+            self.csv_file_path, list(LinkedInProfileResult.model_fields)
+        )
+        self.profile_queue = asyncio.Queue()
+        # Each note prompt carries only the templates that fit its profile
+        strategy = self._message_strategy(in_context_examples)
+        templates = (
+            split_templates(in_context_examples)
+            if self.template_mode == "examples"
+            else []
+        )
+        if templates:
+            self.template_selector = TemplateSelector(templates)
+            strategy = replace_templates(strategy, [])
+        # Notes for profiles read from the DOM are written a batch at a time
+        self.message_batcher = MessageBatcher(
+            self.llm, strategy, max_batch=self.profile_workers
+        )
+        try:
+            if resume and self.progress_manager.store:
+                # The store has every finished result, including ones the
+                # interrupted run had not yet written to the CSV
+                detailed_profiles = await self.progress_manager.get_results()
+                result_writer.start()
+                for row in detailed_profiles:
+                    result_writer.append(row)
+            else:
+                detailed_profiles = []
+                result_writer.start(resume=resume)
+            # Open every profile tab before the search tab exists, see BrowserPool
+            await self.browser_pool.warm()
+
+            self._seen_urls = {
+                normalize_profile_url(p.url) for p in self.progress_manager.profiles
+            }
+            if resume:
+                # Every discovered profile is checkpointed in the progress manager
+                for profile in await self._pending_profiles():
+                    self._enqueue_profile(profile)
+
+            workers = asyncio.create_task(
+                self._process_profiles(
+                    self.profile_queue, in_context_examples, detailed_profiles, result_writer
                 )
-                if extracted_info:
-                    detailed_profiles.append(extracted_info)
-                    # Store single profile history JSON
-                    self.profile_agent_histories[profile_name] = profile_history
-                # Optionally, save after each profile
-                df = pd.DataFrame(detailed_profiles)
-                df.to_csv(self.base_dir / "detailed_profiles.csv", index=False)
-                # Add delay to mimic human interaction and comply with policies
-                await asyncio.sleep(2)
-
-            # Save the final DataFrame
+            )
+            try:
+                if resume and self.progress_manager.search_done:
+                    print("Search already finished in the interrupted run, skipping it")
+                else:
+                    await self._run_search()
+            except asyncio.CancelledError:
+                workers.cancel()
+                raise
+            except Exception:
+                # Finish the profiles found so far before reporting the failure
+                self._close_profile_queue()
+                await workers
+                raise
+            self._close_profile_queue()
+            await workers
+
+            if not resume and not self.discovered_profiles:
+                print("No profiles found.")
+                return pd.DataFrame()
+
+            # Every row is already on disk; build the returned DataFrame once
             df = pd.DataFrame(detailed_profiles)
-            csv_file_path = self.base_dir / "detailed_profiles.csv"
-            df.to_csv(csv_file_path, index=False)
-            await self.progress_manager.set_csv_file_path(
-                str(csv_file_path)
-            )  # Add this line
+            await self.progress_manager.set_csv_file_path(str(self.csv_file_path))
 
             await self.progress_manager.mark_done()
             return df
         finally:
-            await self.browser.close()
+            if self._owns_browser:
+                await self.browser_pool.close()
+                await self.browser.close()
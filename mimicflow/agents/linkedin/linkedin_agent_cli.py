@@ -6,6 +6,7 @@ from mimicflow.agents.linkedin.linkedin_agent import (
     LinkedInFilter,
     LinkedInSearchAgent,
 )
+from mimicflow.agents.linkedin.message_examples import load_in_context_examples
 from pathlib import Path
 
 
@@ -22,7 +23,7 @@ def main():
     parser.add_argument(
         "--universities",
         nargs="+",
-        default=[],
+        required=True,
         help="List of universities, e.g. --universities Stanford MIT",
     )
     parser.add_argument(
@@ -43,6 +44,23 @@ def main():
         default=[],
         help="Additional filters, e.g. --additional-filters 'Location:NewYork'",
     )
+    parser.add_argument(
+        "--save-search-pages",
+        action="store_true",
+        help="Write each search results page to search_pages.jsonl for debugging.",
+    )
+    parser.add_argument(
+        "--summary-file",
+        type=Path,
+        default=None,
+        help="CV summary used to write connection notes.",
+    )
+    parser.add_argument(
+        "--templates-file",
+        type=Path,
+        default=None,
+        help="Message templates separated by '----' lines, used with --summary-file.",
+    )
 
     args = parser.parse_args()
 
@@ -60,10 +78,12 @@ def main():
     agent = LinkedInSearchAgent(
         filter_config=filter_config,
         base_output_dir=base_output_dir,
+        save_search_pages=args.save_search_pages,
     )
 
     # Actually run the search agent
-    results_df = asyncio.run(agent.run())
+    in_context_examples = load_in_context_examples(args.summary_file, args.templates_file)
+    results_df = asyncio.run(agent.run(in_context_examples))
 
     # Print or do something with results
     if not results_df.empty:
@@ -0,0 +1,271 @@
+# mimicflow/agents/linkedin/linkedin_batch_cli.py
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, ValidationError
+
+from mimicflow.agents.linkedin.browser_pool import BrowserPool
+from mimicflow.agents.linkedin.contact_index import ContactIndex
+from mimicflow.agents.linkedin.linkedin_agent import (
+    DEFAULT_PROFILE_WORKERS,
+    LinkedInFilter,
+    LinkedInProfileResult,
+    LinkedInSearchAgent,
+    new_browser,
+)
+from mimicflow.agents.linkedin.message_examples import load_in_context_examples
+from mimicflow.agents.linkedin.search_url import FacetIdCache
+from mimicflow.app.exporters import iter_csv
+from mimicflow.app.job_registry import Job, JobRegistry
+from mimicflow.app.result_store import ResultStore
+
+# Manifest keys that configure the run rather than the LinkedInFilter
+RUN_OPTIONS = (
+    "send_connection_request",
+    "include_note",
+    "template_mode",
+    "custom_template",
+    "profile_workers",
+    "save_search_pages",
+)
+
+SUMMARY_COLUMNS = [
+    "name",
+    "job_id",
+    "status",
+    "error",
+    "profiles_needed",
+    "profiles_found",
+    "results",
+    "queued_s",
+    "duration_s",
+    "output_dir",
+]
+RESULT_COLUMNS = ["Search", "Job_ID"] + list(LinkedInProfileResult.model_fields)
+
+
+class BatchSearch(BaseModel):
+    """One manifest entry: a LinkedInFilter plus the options of its run."""
+
+    name: str
+    filter: LinkedInFilter
+    options: Dict[str, Any] = {}
+
+
+def load_manifest(path: Path) -> List[BatchSearch]:
+    """
+    Read the searches of a manifest: a YAML list (or a mapping with a
+    `searches` list), or JSONL with one search per line. Each entry holds
+    LinkedInFilter fields, an optional `name` and optional RUN_OPTIONS.
+    Every entry is validated before anything runs.
+    """
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML: pip install pyyaml")
+        data = yaml.safe_load(text) or []
+        entries = data.get("searches", []) if isinstance(data, dict) else data
+    else:
+        entries = []
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}")
+
+    searches = []
+    for index, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Search {index} in {path} is not a mapping")
+        entry = dict(entry)
+        name = str(entry.pop("name", f"search-{index}"))
+        options = {key: entry.pop(key) for key in RUN_OPTIONS if key in entry}
+        try:
+            search_filter = LinkedInFilter(**entry)
+        except ValidationError as e:
+            raise ValueError(f"Search {index} ({name}) in {path}: {e}")
+        searches.append(BatchSearch(name=name, filter=search_filter, options=options))
+    if not searches:
+        raise ValueError(f"No searches in {path}")
+    return searches
+
+
+async def run_batch(
+    searches: List[BatchSearch],
+    output_dir: Path,
+    in_context_examples: str = "",
+    concurrency: int = DEFAULT_PROFILE_WORKERS,
+    searches_at_once: int = 2,
+) -> List[Dict]:
+    """
+    Run every search with one browser, at most `searches_at_once` searches
+    and `concurrency` open profile tabs at a time across all of them.
+    Results, progress and contacts go to one store in output_dir; returns
+    the timing summary of each search.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    store = ResultStore(str(output_dir / "mimicflow.db"))
+    registry = JobRegistry(max_workers=searches_at_once, store=store)
+    contact_index = ContactIndex(store)
+    facet_cache = FacetIdCache(store)
+    browser_pool = BrowserPool(new_browser(), size=concurrency)
+    summaries: List[Dict] = []
+
+    def runner(search: BatchSearch, summary: Dict, submitted: float):
+        async def run(job: Job):
+            started = time.monotonic()
+            summary["queued_s"] = round(started - submitted, 3)
+            try:
+                agent = LinkedInSearchAgent(
+                    filter_config=search.filter,
+                    base_output_dir=str(output_dir / "searches"),
+                    progress_manager=job.progress_manager,
+                    job_id=job.id,
+                    contact_index=contact_index,
+                    facet_cache=facet_cache,
+                    browser_pool=browser_pool,
+                    **search.options,
+                )
+                job.agent = agent
+                summary["output_dir"] = str(agent.base_dir)
+                await job.progress_manager.set_csv_file_path(str(agent.csv_file_path))
+                await agent.run(in_context_examples)
+            finally:
+                summary["duration_s"] = round(time.monotonic() - started, 3)
+
+        return run
+
+    try:
+        # Open every profile tab before any search opens its own
+        await browser_pool.warm()
+        jobs = []
+        for search in searches:
+            job = registry.create_job(
+                request={"name": search.name, **search.filter.model_dump(), **search.options}
+            )
+            await job.progress_manager.set_target(search.filter.profiles_needed)
+            summary = {"name": search.name, "job_id": job.id, "queued_s": None, "duration_s": None}
+            summaries.append(summary)
+            registry.submit(job, runner(search, summary, time.monotonic()))
+            jobs.append(job)
+        # Failures are recorded on the job, so one search cannot stop the rest
+        await asyncio.gather(*(job.task for job in jobs))
+
+        for job, summary in zip(jobs, summaries):
+            summary.update(
+                status=job.status,
+                error=job.error,
+                profiles_needed=job.progress_manager.profiles_needed,
+                profiles_found=len(job.progress_manager.profiles),
+                results=store.count_results(job.id),
+            )
+        _write_results(output_dir / "results.csv", searches, jobs, store)
+        _write_csv(output_dir / "batch_summary.csv", summaries, SUMMARY_COLUMNS)
+        return summaries
+    finally:
+        await browser_pool.close()
+        await browser_pool.browser.close()
+        store.close()
+
+
+def _write_csv(path: Path, rows: List[Dict], columns: List[str]):
+    with open(path, "w", newline="") as f:
+        for chunk in iter_csv(rows, columns):
+            f.write(chunk)
+
+
+def _write_results(path: Path, searches: List[BatchSearch], jobs: List[Job], store: ResultStore):
+    """Every search's results in one CSV, tagged with the search they came from."""
+
+    def rows():
+        for search, job in zip(searches, jobs):
+            for row in store.iter_results(job.id):
+                yield {"Search": search.name, "Job_ID": job.id, **row}
+
+    _write_csv(path, rows(), RESULT_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run many LinkedIn searches from a manifest, without the web UI"
+    )
+    parser.add_argument(
+        "manifest",
+        type=Path,
+        help="YAML or JSONL file of searches, each a LinkedInFilter with an optional name",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Where to write the store, results.csv and batch_summary.csv. "
+        "Default: linkedin_searches/batch_<timestamp>.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_PROFILE_WORKERS,
+        help=f"Profile tabs open at once across all searches. Default={DEFAULT_PROFILE_WORKERS}.",
+    )
+    parser.add_argument(
+        "--searches-at-once",
+        type=int,
+        default=2,
+        help="Searches running at the same time. Default=2.",
+    )
+    parser.add_argument(
+        "--summary-file",
+        type=Path,
+        default=None,
+        help="CV summary used to write connection notes.",
+    )
+    parser.add_argument(
+        "--templates-file",
+        type=Path,
+        default=None,
+        help="Message templates separated by '----' lines, used with --summary-file.",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        searches = load_manifest(args.manifest)
+    except ValueError as e:
+        parser.error(str(e))
+    output_dir = args.output_dir or (
+        Path("linkedin_searches") / f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+    in_context_examples = load_in_context_examples(args.summary_file, args.templates_file)
+
+    summaries = asyncio.run(
+        run_batch(
+            searches,
+            output_dir,
+            in_context_examples=in_context_examples,
+            concurrency=args.concurrency,
+            searches_at_once=args.searches_at_once,
+        )
+    )
+
+    for summary in summaries:
+        print(
+            f"{summary['name']}: {summary['status']}, {summary['results']} results "
+            f"in {summary['duration_s']}s (queued {summary['queued_s']}s)"
+            + (f" - {summary['error']}" if summary["error"] else "")
+        )
+    print(f"Results and timings written to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
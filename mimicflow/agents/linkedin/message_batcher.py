@@ -0,0 +1,135 @@
+import asyncio
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+# Seconds a note request waits for others to share its LLM call; profile
+# visits are paced two seconds apart, so this spans a few workers
+BATCH_WINDOW = 5.0
+
+JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+def _parse_notes(content: str, count: int) -> List[Optional[str]]:
+    """
+    The notes of a batch reply, keyed by profile index. A reply that does
+    not have exactly one entry per profile is rejected as a whole, so a
+    note can never be sent to the wrong person.
+    """
+    match = JSON_ARRAY_RE.search(content)
+    if not match:
+        raise ValueError("Reply has no JSON array")
+    parsed = json.loads(match.group(0))
+    if len(parsed) != count:
+        raise ValueError(f"Reply has {len(parsed)} messages for {count} profiles")
+    notes: Dict[int, Optional[str]] = {}
+    for item in parsed:
+        index = item.get("index") if isinstance(item, dict) else None
+        if (
+            not isinstance(index, int)
+            or isinstance(index, bool)
+            or not 0 <= index < count
+            or index in notes
+        ):
+            raise ValueError(f"Reply has a missing or repeated index: {item!r}")
+        message = item.get("message")
+        notes[index] = message.strip() if isinstance(message, str) and message.strip() else None
+    return [notes[index] for index in range(count)]
+
+
+class MessageBatcher:
+    """
+    Writes Custom_Messages for several profiles in one LLM call. Profile
+    workers ask for their note as soon as the profile is read; requests that
+    arrive within BATCH_WINDOW of each other, up to max_batch, share a call,
+    so the message strategy (CV summary and templates) is sent once per
+    batch instead of once per profile. A profile can bring the templates
+    picked for it; the batch prompt lists each of those once and points
+    every profile at its own.
+    """
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        strategy: str,
+        max_batch: int = 10,
+        window: float = BATCH_WINDOW,
+    ):
+        self.llm = llm
+        self.strategy = strategy
+        self.max_batch = max(1, max_batch)
+        self.window = window
+        self._pending: List[Tuple[Dict, List[str], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Running batches, referenced so they are not garbage collected
+        self._batches = set()
+        self.calls = 0
+
+    async def draft(
+        self, profile: Dict, templates: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """The note for one profile, or None if the LLM gave none."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((profile, templates or [], future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._write_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    def _messages(self, batch: List[Tuple[Dict, List[str], asyncio.Future]]) -> List[Dict]:
+        templates: List[str] = []
+        lines = []
+        for index, (profile, picked, _) in enumerate(batch):
+            line = f"{index}. {json.dumps(profile)}"
+            if picked:
+                for template in picked:
+                    if template not in templates:
+                        templates.append(template)
+                numbers = ", ".join(str(templates.index(t) + 1) for t in picked)
+                line += f" (use template {numbers})"
+            lines.append(line)
+        numbered = "\n".join(lines)
+        if templates:
+            numbered += "\n\n<MESSAGE TEMPLATES>\n" + "\n".join(
+                f"{i}. {t}" for i, t in enumerate(templates, start=1)
+            ) + "\n</MESSAGE TEMPLATES>"
+        return [
+            {
+                "role": "system",
+                "content": "You write short LinkedIn connection messages.",
+            },
+            {
+                "role": "user",
+                "content": f"""Write one connection message for each of these LINKEDIN PROFILES:
+{numbered}
+
+Use this strategy for every message: {self.strategy}
+Keep each message under 300 characters and use only the first name of the LinkedIn user.
+Reply with a JSON array only, one object per profile: [{{"index": <profile number>, "message": "<message>"}}]""",
+            },
+        ]
+
+    async def _write_batch(self, batch: List[Tuple[Dict, List[str], asyncio.Future]]):
+        notes: List[Optional[str]] = [None] * len(batch)
+        try:
+            self.calls += 1
+            response = await self.llm.ainvoke(self._messages(batch))
+            notes = _parse_notes(response.content, len(batch))
+        except Exception as e:
+            print(f"Could not draft messages for {len(batch)} profiles: {e}")
+        for (_, _, future), note in zip(batch, notes):
+            if not future.done():
+                future.set_result(note)
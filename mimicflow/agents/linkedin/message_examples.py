@@ -0,0 +1,64 @@
+from pathlib import Path
+from typing import List, Optional
+
+# Separates templates in a templates file
+TEMPLATE_DELIMITER = "----"
+
+CUSTOM_MESSAGE_INSTRUCTIONS = """
+                MOST IMPORTANT INSTRUCTION: For second person perspective details, replace [Linkedin Profile placeholders] like
+                [Linkedin Profile Name] and [Linkedin Profile Details] with real details which are extracted from the LINKEDIN PROFILE after navigating to the profile.
+                For first person perspective details, use information from <CV SUMMARY>...</CV SUMMARY>, never use these details to refer to [Linkedin Profile Name] or [Linkedin Profile Details], which must be from the LINKEDIN PROFILE that is extracted.
+                For example: Choose a short <MESSAGE TEMPLATE>, replace [Linkedin Profile Name] with real name extracted from the LINKEDIN PROFILE, replace Best, [My Name] with MY REAL NAME from <CV SUMMARY>...</CV SUMMARY>
+                and when mentioning my details (first person perspective) use relevantinformation from <CV SUMMARY>...</CV SUMMARY>. If no relevant information is found in <CV SUMMARY>...</CV SUMMARY> or LINKEDIN PROFILE, craft a minimal message like
+                Hi [Linkedin Profile Name], I'm interested in [Field of Interest]. I'd love to connect. Thanks, [My Name].
+                Failure to follow these instructions will result in a million dollar fine.
+                </CUSTOM_MESSAGE GENERATION INSTRUCTIONS>
+                """
+
+
+def format_templates(templates: List[str]) -> str:
+    """Number the templates inside a <MESSAGE TEMPLATES> block."""
+    templates = [template.strip() for template in templates if template.strip()]
+
+    formatted_output = "<MESSAGE TEMPLATES>\n"  # Opening tag
+    for i, template in enumerate(templates, start=1):
+        formatted_output += f"{i}. {template}\n"
+    formatted_output += "</MESSAGE TEMPLATES>"  # Closing tag
+
+    return formatted_output.strip()
+
+
+def format_excerpts(input_text: str) -> str:
+    """format_templates for templates separated by '----'."""
+    return format_templates(input_text.split(TEMPLATE_DELIMITER))
+
+
+def build_in_context_examples(summary: str, message_templates: str) -> str:
+    """
+    The Custom_Message strategy given to the agent: the CV summary, the
+    formatted message templates and how to fill them in.
+    """
+    return (
+        "<CUSTOM_MESSAGE GENERATION INSTRUCTIONS>\n"
+        + "<CV SUMMARY>\n"
+        + summary
+        + "\n</CV SUMMARY>"
+        + "\n\n <MESSAGE TEMPLATES>\n"
+        + message_templates
+        + "\n</MESSAGE TEMPLATES>"
+        + CUSTOM_MESSAGE_INSTRUCTIONS
+    )
+
+
+def load_in_context_examples(
+    summary_file: Optional[Path], templates_file: Optional[Path]
+) -> str:
+    """
+    in_context_examples from a CV summary file and a '----' separated
+    templates file, for runs without the web UI. Empty without a summary.
+    """
+    if summary_file is None:
+        return ""
+    summary = Path(summary_file).read_text().strip()
+    templates = Path(templates_file).read_text() if templates_file else ""
+    return build_in_context_examples(summary, format_excerpts(templates))
@@ -0,0 +1,50 @@
+from browser_use import ActionResult, Controller
+from browser_use.browser.context import BrowserContext
+from browser_use.controller.registry.views import ActionModel
+
+from mimicflow.agents.linkedin.pacing import (
+    INTERACTION,
+    NAVIGATION,
+    PROFILE_PRIORITY,
+    PacingScheduler,
+    linkedin_pacer,
+)
+
+# Agent actions by the budget they draw on; the rest (reading the page,
+# switching tabs, done) do not touch LinkedIn and are not paced
+ACTION_KINDS = {
+    "go_to_url": NAVIGATION,
+    "search_google": NAVIGATION,
+    "open_tab": NAVIGATION,
+    "go_back": NAVIGATION,
+    "click_element": INTERACTION,
+    "input_text": INTERACTION,
+    "send_keys": INTERACTION,
+    "scroll_down": INTERACTION,
+    "scroll_up": INTERACTION,
+    "scroll_to_text": INTERACTION,
+    "select_dropdown_option": INTERACTION,
+}
+
+
+class PacedController(Controller):
+    """
+    Controller whose actions wait for the account's pacing budget instead
+    of the fixed wait_between_actions sleep of each browser context.
+    """
+
+    def __init__(
+        self,
+        priority: int = PROFILE_PRIORITY,
+        pacer: PacingScheduler = linkedin_pacer,
+    ):
+        super().__init__()
+        self.priority = priority
+        self.pacer = pacer
+
+    async def act(self, action: ActionModel, browser_context: BrowserContext) -> ActionResult:
+        for action_name, params in action.model_dump(exclude_unset=True).items():
+            kind = ACTION_KINDS.get(action_name)
+            if params is not None and kind:
+                await self.pacer.wait(kind, priority=self.priority)
+        return await super().act(action, browser_context)
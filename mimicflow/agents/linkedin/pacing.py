@@ -0,0 +1,141 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, List, Tuple
+
+# Average gap between two page loads on the LinkedIn account, in seconds
+PROFILE_VISIT_INTERVAL = 2.0
+# Average gap between two clicks, keystrokes or scrolls on the account
+INTERACTION_INTERVAL = 0.5
+
+# Kinds of paced work, each with its own budget per account
+NAVIGATION = "navigation"
+INTERACTION = "interaction"
+
+# Per-account budgets: (average seconds per action, actions allowed at once
+# after an idle spell)
+ACTION_BUDGETS: Dict[str, Tuple[float, int]] = {
+    NAVIGATION: (PROFILE_VISIT_INTERVAL, 2),
+    INTERACTION: (INTERACTION_INTERVAL, 3),
+}
+
+# Lower goes first. Search pages feed every profile worker, so they go
+# ahead of profile visits waiting for the same budget.
+SEARCH_PRIORITY = 0
+PROFILE_PRIORITY = 1
+
+# Every search in the process acts through the one logged-in account
+DEFAULT_ACCOUNT = "linkedin"
+
+
+class Pacer:
+    """
+    Token bucket: an action is allowed every `interval` seconds on average,
+    and up to `burst` at once after an idle spell. Waiters are served by
+    priority, then in arrival order, as soon as a token is available, so
+    the allowed rate is used by whichever worker is ready instead of being
+    lost to fixed sleeps.
+    """
+
+    def __init__(self, interval: float = PROFILE_VISIT_INTERVAL, burst: int = 1):
+        self.interval = interval
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = None
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._timer = None
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.interval <= 0:
+            self._tokens = float(self.burst)
+        elif self._updated is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed / self.interval)
+        self._updated = now
+
+    def _release(self):
+        """Hand out available tokens and set a timer for the next one."""
+        self._timer = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            # Waiters that were cancelled leave their token to the next one
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
+        # Drop cancelled waiters so they do not keep the timer running
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if self._waiters:
+            delay = (1 - self._tokens) * self.interval
+            self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _record(self, waited: float):
+        self._waits += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    async def wait(self, priority: int = PROFILE_PRIORITY):
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        if self._timer is None:
+            self._release()
+        await future
+        self._record(time.monotonic() - started)
+
+    def stats(self) -> Dict:
+        return {
+            "interval_s": self.interval,
+            "burst": self.burst,
+            "waiting": sum(1 for _, _, f in self._waiters if not f.done()),
+            "waits": self._waits,
+            "wait_total_s": round(self._wait_total, 3),
+            "wait_max_s": round(self._wait_max, 3),
+            "wait_avg_s": (
+                round(self._wait_total / self._waits, 3) if self._waits else 0.0
+            ),
+        }
+
+
+class PacingScheduler:
+    """
+    One Pacer per account and kind of work, built from ACTION_BUDGETS on
+    first use. Every search in the process shares the scheduler, since they
+    all act on the same LinkedIn account.
+    """
+
+    def __init__(self, budgets: Dict[str, Tuple[float, int]] = None):
+        self.budgets = dict(ACTION_BUDGETS if budgets is None else budgets)
+        self._pacers: Dict[Tuple[str, str], Pacer] = {}
+
+    def pacer(self, kind: str, account: str = DEFAULT_ACCOUNT) -> Pacer:
+        key = (account, kind)
+        if key not in self._pacers:
+            interval, burst = self.budgets[kind]
+            self._pacers[key] = Pacer(interval, burst)
+        return self._pacers[key]
+
+    async def wait(
+        self,
+        kind: str = NAVIGATION,
+        priority: int = PROFILE_PRIORITY,
+        account: str = DEFAULT_ACCOUNT,
+    ):
+        await self.pacer(kind, account).wait(priority)
+
+    def stats(self) -> Dict:
+        """Budget use and time spent waiting, per account and kind."""
+        stats: Dict[str, Dict] = {}
+        for (account, kind), pacer in self._pacers.items():
+            stats.setdefault(account, {})[kind] = pacer.stats()
+        return stats
+
+
+linkedin_pacer = PacingScheduler()
@@ -0,0 +1,115 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+# Fields a profile needs before the agent can be skipped
+REQUIRED_FIELDS = ("Full_Name", "Current_Title", "Company", "Location")
+
+# "Full-time", "Part-time" etc. trail the company name in experience entries
+EMPLOYMENT_TYPE_RE = re.compile(r"\s*·.*$")
+
+
+def _text(element) -> Optional[str]:
+    if element is None:
+        return None
+    return " ".join(element.get_text(" ", strip=True).split()) or None
+
+
+def _section(soup, anchor_id: str):
+    """The <section> holding a profile card, found by its anchor div."""
+    anchor = soup.find(id=anchor_id)
+    return anchor.find_parent("section") if anchor is not None else None
+
+
+def _entries(section) -> List[Tuple[List[str], List[List[str]]]]:
+    """
+    Visible text lines of each top-level entry of a profile card, with the
+    lines of any nested entries (several roles grouped under one company).
+    """
+    if section is None:
+        return []
+
+    def lines_of(item) -> List[str]:
+        lines = [
+            _text(span)
+            for span in item.find_all("span", attrs={"aria-hidden": "true"})
+            if span.find_parent("li") is item
+        ]
+        return [line for line in lines if line]
+
+    entries = []
+    for item in section.find_all("li", class_="artdeco-list__item"):
+        if item.find_parent("li") is not None:
+            continue
+        nested = [lines_of(role) for role in item.find_all("li") if lines_of(role)]
+        lines = lines_of(item)
+        if lines:
+            entries.append((lines, nested))
+    return entries
+
+
+def _company_name(line: str) -> str:
+    return EMPLOYMENT_TYPE_RE.sub("", line).strip()
+
+
+def parse_profile_page(html: str, profile_url: str) -> Dict:
+    """
+    Read the LinkedInProfileResult fields of a profile page straight from
+    its DOM. Fields that could not be found are left empty; Custom_Message
+    is left to the caller.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    top_card = soup.find("main") or soup
+
+    full_name = _text(top_card.find("h1"))
+    headline = _text(top_card.find("div", class_="text-body-medium"))
+    location = _text(
+        top_card.find("span", class_=lambda c: c and "text-body-small" in c and "inline" in c)
+    )
+
+    experience = _entries(_section(soup, "experience"))
+    education = _entries(_section(soup, "education"))
+
+    companies = []
+    titles = []
+    for lines, roles in experience:
+        if roles:
+            # Several roles at one company: the entry itself names the company
+            company, title = lines[0], roles[0][0]
+        else:
+            # A single role reads [title, company · employment type, ...]
+            title = lines[0]
+            company = _company_name(lines[1]) if len(lines) > 1 else ""
+        titles.append(title)
+        if company and company not in companies:
+            companies.append(company)
+
+    current_company = None
+    company_button = top_card.find(
+        "button", attrs={"aria-label": re.compile(r"^Current company:")}
+    )
+    if company_button is not None:
+        current_company = (
+            company_button["aria-label"].split(":", 1)[1].split(". Click")[0].strip()
+        )
+    if not current_company and companies:
+        current_company = companies[0]
+
+    current_title = titles[0] if titles else headline
+
+    return {
+        "Full_Name": full_name or "",
+        "Current_Title": current_title or "",
+        "Company": current_company or "",
+        "Location": location or "",
+        "Education": [lines[0] for lines, _ in education],
+        "Companies_Worked_At": companies,
+        "Common_Interests": [],
+        "Custom_Message": "",
+        "Profile_URL": profile_url,
+    }
+
+
+def missing_fields(fields: Dict) -> List[str]:
+    return [name for name in REQUIRED_FIELDS if not fields.get(name)]
@@ -0,0 +1,37 @@
+import csv
+from pathlib import Path
+from typing import Dict, List
+
+
+class ResultWriter:
+    """
+    Append-only writer for detailed_profiles.csv. Each finished profile adds
+    one row and is flushed right away, instead of rewriting the whole file
+    after every profile.
+    """
+
+    def __init__(self, csv_file_path: Path, columns: List[str]):
+        self.csv_file_path = Path(csv_file_path)
+        self.columns = columns
+
+    def start(self, resume: bool = False):
+        """
+        Prepare the file for a run. A fresh run starts from just the header;
+        a resumed run appends to the rows the interrupted run already wrote.
+        """
+        if resume and self._has_content():
+            return
+        with open(self.csv_file_path, "w", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=self.columns).writeheader()
+
+    def append(self, row: Dict):
+        write_header = not self._has_content()
+        with open(self.csv_file_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.columns, extrasaction="ignore")
+            if write_header:
+                writer.writeheader()
+            # Lists are written as their repr, the way pandas wrote them
+            writer.writerow(row)
+
+    def _has_content(self) -> bool:
+        return self.csv_file_path.exists() and self.csv_file_path.stat().st_size > 0
@@ -0,0 +1,128 @@
+import re
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from bs4 import BeautifulSoup
+
+# Profiles LinkedIn shows per search results page
+RESULTS_PER_PAGE = 10
+
+PROFILE_PATH_RE = re.compile(r"^/in/([^/?#]+)")
+MARKDOWN_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+# Screen-reader text LinkedIn puts next to a name, e.g. "View Ada's profile"
+VIEW_PROFILE_RE = re.compile(r"\s*View\s.+?[’']s?\s+profile.*$", re.IGNORECASE)
+
+# Class fragments of the elements that hold one search result
+CARD_CLASS_FRAGMENTS = (
+    "reusable-search__result-container",
+    "entity-result",
+    "search-result__wrapper",
+)
+# Present once a results page has rendered its result cards
+RESULTS_READY_SELECTOR = ", ".join(
+    f'li[class*="{fragment}"]' for fragment in CARD_CLASS_FRAGMENTS
+)
+
+
+def search_page_url(search_url: str, page_number: int) -> str:
+    """The search URL with its page parameter set to page_number."""
+    parsed = urlparse(search_url)
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key != "page"
+    ]
+    if page_number > 1:
+        query.append(("page", str(page_number)))
+    return parsed._replace(query=urlencode(query)).geturl()
+
+
+def canonical_profile_url(href: str) -> Optional[str]:
+    """https://www.linkedin.com/in/<slug> for a profile link, else None."""
+    parsed = urlparse(href)
+    if parsed.netloc and not parsed.netloc.endswith("linkedin.com"):
+        return None
+    match = PROFILE_PATH_RE.match(parsed.path)
+    if not match:
+        return None
+    return f"https://www.linkedin.com/in/{match.group(1)}"
+
+
+def _clean_name(text: str) -> str:
+    text = VIEW_PROFILE_RE.sub("", " ".join(text.split()))
+    return text.strip(" •·-")
+
+
+def _text_of_class(card, fragment: str) -> Optional[str]:
+    element = card.find(class_=lambda c: c and fragment in c)
+    if element is None:
+        return None
+    return " ".join(element.get_text(" ", strip=True).split()) or None
+
+
+def _link_name(link) -> str:
+    # The visible name sits in an aria-hidden span; the rest is screen-reader text
+    visible = link.find("span", attrs={"aria-hidden": "true"})
+    return _clean_name((visible or link).get_text(" ", strip=True))
+
+
+def parse_search_results_html(html: str) -> List[Dict]:
+    """
+    Read profile cards (name, URL, headline, location) straight from a
+    LinkedIn people-search results page, in page order.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    cards = [
+        card
+        for card in soup.find_all("li")
+        if any(
+            fragment in " ".join(card.get("class", []))
+            for fragment in CARD_CLASS_FRAGMENTS
+        )
+    ]
+
+    profiles = []
+    seen_urls = set()
+    if cards:
+        for card in cards:
+            # The first named profile link of a card is its result; later
+            # ones are mutual connections and the like
+            for link in card.find_all("a", href=True):
+                url = canonical_profile_url(link["href"])
+                name = _link_name(link) if url else ""
+                if url and name:
+                    if url not in seen_urls:
+                        seen_urls.add(url)
+                        profiles.append(
+                            {
+                                "name": name,
+                                "URL": url,
+                                "headline": _text_of_class(card, "primary-subtitle"),
+                                "location": _text_of_class(card, "secondary-subtitle"),
+                            }
+                        )
+                    break
+        return profiles
+
+    # Unknown layout: every named profile link in the main content
+    root = soup.find("main") or soup
+    for link in root.find_all("a", href=True):
+        url = canonical_profile_url(link["href"])
+        name = _link_name(link) if url else ""
+        if url and name and url not in seen_urls:
+            seen_urls.add(url)
+            profiles.append({"name": name, "URL": url, "headline": None, "location": None})
+    return profiles
+
+
+def parse_search_results_markdown(markdown: str) -> List[Dict]:
+    """Profile links from the markdown produced by the extract_content action."""
+    profiles = []
+    seen_urls = set()
+    for text, href in MARKDOWN_LINK_RE.findall(markdown):
+        url = canonical_profile_url(href)
+        name = _clean_name(text) if url else ""
+        if url and name and url not in seen_urls:
+            seen_urls.add(url)
+            profiles.append({"name": name, "URL": url, "headline": None, "location": None})
+    return profiles
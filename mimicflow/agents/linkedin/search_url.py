@@ -0,0 +1,158 @@
+import json
+import re
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+from playwright.async_api import Page
+
+from mimicflow.app.result_store import ResultStore
+
+PEOPLE_SEARCH_URL = "https://www.linkedin.com/search/results/people/"
+# Any logged-in linkedin.com page can run typeahead lookups
+LINKEDIN_HOME_URL = "https://www.linkedin.com/feed/"
+# Same-origin endpoint the search filter dropdowns use to look names up
+TYPEAHEAD_PATH = "/voyager/api/typeahead/hitsV2"
+
+# Facet kinds: the typeahead type to look up and the search URL parameter
+FACET_TYPES = {"company": "COMPANY", "school": "SCHOOL", "geo": "GEO"}
+
+# additional_filters entries "<key>:<value>" that map to a facet
+ADDITIONAL_FILTER_FACETS = {
+    "location": ("geo", "geoUrn"),
+    "geo": ("geo", "geoUrn"),
+    "past company": ("company", "pastCompany"),
+    "past companies": ("company", "pastCompany"),
+    "pastcompany": ("company", "pastCompany"),
+}
+
+# Looks up the facet ID of a name: (kind, name) -> ID, or None if not found
+FacetResolver = Callable[[str, str], Awaitable[Optional[str]]]
+
+
+def _name_key(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+class FacetIdCache:
+    """
+    Facet IDs of company, school and location names, filled on first lookup
+    and kept in the result store, so a repeated search resolves instantly.
+    Names that could not be resolved are not cached; a wrong ID can be
+    dropped with invalidate or pinned with override.
+    """
+
+    def __init__(self, store: Optional[ResultStore] = None):
+        self.store = store
+        self._ids: Dict[tuple, str] = {}
+
+    async def resolve(self, kind: str, name: str, lookup: FacetResolver) -> Optional[str]:
+        key = (kind, _name_key(name))
+        facet_id = self._ids.get(key)
+        if facet_id is None and self.store:
+            facet_id = self.store.get_facet_id(*key)
+        if facet_id is None:
+            facet_id = await lookup(kind, name)
+            if facet_id is None:
+                return None
+            if self.store:
+                self.store.set_facet_id(*key, facet_id, name=name)
+        self._ids[key] = facet_id
+        return facet_id
+
+    def invalidate(self, kind: str, name: str):
+        """Forget the ID of a name, so the next resolve looks it up again."""
+        key = (kind, _name_key(name))
+        self._ids.pop(key, None)
+        if self.store:
+            self.store.delete_facet_id(*key)
+
+    def override(self, kind: str, name: str, facet_id: str):
+        """Use facet_id for a name from now on, whatever the lookup says."""
+        key = (kind, _name_key(name))
+        self._ids[key] = facet_id
+        if self.store:
+            self.store.set_facet_id(*key, facet_id, name=name)
+
+
+async def lookup_facet_id(page: Page, kind: str, name: str) -> Optional[str]:
+    """
+    Ask LinkedIn's typeahead for the facet ID of a name, from a logged-in
+    linkedin.com page so the request carries the session cookies.
+    """
+    text = await page.evaluate(
+        """async ([path, keywords, type]) => {
+            const csrf = (document.cookie.match(/JSESSIONID="?([^";]+)/) || [])[1] || "";
+            const params = new URLSearchParams({keywords, origin: "OTHER", q: "type", type});
+            const response = await fetch(`${path}?${params}`, {
+                headers: {"csrf-token": csrf, "x-restli-protocol-version": "2.0.0"},
+                credentials: "include",
+            });
+            return response.ok ? await response.text() : "";
+        }""",
+        [TYPEAHEAD_PATH, name, FACET_TYPES[kind]],
+    )
+    return match_facet_id(text, kind, name)
+
+
+def match_facet_id(text: str, kind: str, name: str) -> Optional[str]:
+    """
+    The facet ID of the typeahead hit whose display name is `name`. The
+    first hit is often a different company or place with a similar name, so
+    without an exact match the name counts as unresolved.
+    """
+    try:
+        hits = json.loads(text).get("elements", []) if text else []
+    except (ValueError, AttributeError):
+        return None
+    for hit in hits:
+        display_name = (hit.get("text") or {}).get("text", "")
+        if _name_key(display_name) != _name_key(name):
+            continue
+        # The hit's URN carries the ID, e.g. urn:li:fs_miniCompany:1441
+        match = re.search(rf"urn:li:[A-Za-z_]*{kind}:(\d+)", json.dumps(hit), re.IGNORECASE)
+        if match:
+            return match.group(1)
+    return None
+
+
+async def compile_search_url(search_filter, resolve: FacetResolver) -> Optional[str]:
+    """
+    Build the people-search URL for a form-based LinkedInFilter, with
+    companies, schools and mapped additional filters as facet IDs. Returns
+    None when a name cannot be resolved or an additional filter has no
+    facet, so the caller can fall back to filling in the search form.
+    """
+    facets: Dict[str, List[str]] = {}
+    keywords = " OR ".join(search_filter.titles or [])
+
+    async def add_facet(kind: str, parameter: str, name: str) -> bool:
+        facet_id = await resolve(kind, name)
+        if facet_id is None:
+            print(f"Could not resolve {kind} '{name}' to a LinkedIn ID")
+            return False
+        ids = facets.setdefault(parameter, [])
+        if facet_id not in ids:
+            ids.append(facet_id)
+        return True
+
+    for company in search_filter.companies or []:
+        if not await add_facet("company", "currentCompany", company):
+            return None
+    for school in search_filter.universities or []:
+        if not await add_facet("school", "schoolFilter", school):
+            return None
+    for extra in search_filter.additional_filters or []:
+        key, _, value = extra.partition(":")
+        mapped = ADDITIONAL_FILTER_FACETS.get(_name_key(key))
+        if not (mapped and value.strip()):
+            # As a keyword it would match any profile mentioning the words,
+            # not apply the filter; the form-based agent can apply it
+            print(f"No search URL facet for additional filter '{extra}'")
+            return None
+        if not await add_facet(*mapped, value.strip()):
+            return None
+
+    params = {"keywords": keywords, "origin": "FACETED_SEARCH"}
+    for parameter, ids in facets.items():
+        params[parameter] = json.dumps(ids, separators=(",", ":"))
+    return f"{PEOPLE_SEARCH_URL}?{urlencode(params)}"
@@ -0,0 +1,143 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+# Templates a profile's note is drafted from, out of all the user gave
+TEMPLATES_PER_PROFILE = 2
+
+# Greedy, so a block wrapped in a second pair of tags is taken whole
+TEMPLATES_BLOCK_RE = re.compile(
+    r"<MESSAGE TEMPLATES>(.*)</MESSAGE TEMPLATES>", re.DOTALL
+)
+TEMPLATE_TAG_RE = re.compile(r"</?MESSAGE TEMPLATES>")
+NUMBERED_ITEM_RE = re.compile(r"^\s*\d+\.\s+", re.MULTILINE)
+PLACEHOLDER_RE = re.compile(r"\[([^\]]+)\]")
+# <CV SUMMARY ...> slots describe the user, not the profile
+CV_SLOT_RE = re.compile(r"<[^>]*>")
+WORD_RE = re.compile(r"[a-z0-9]+")
+# Tokens are cut to this many letters, a crude stem that matches
+# engineer/engineering and finance/financial
+STEM_LENGTH = 6
+# Placeholders name what the template needs from the profile
+PLACEHOLDER_WEIGHT = 2
+
+STOPWORDS = frozenset(
+    "an and any at for from hi hey in is it me my of on or the to with would "
+    "you your".split()
+)
+# Profile keys that say nothing about which template fits
+IGNORED_FIELDS = frozenset({"URL", "Profile_URL", "Custom_Message", "id"})
+# A name alone says nothing about which template fits
+NAME_FIELDS = frozenset({"name", "Full_Name"})
+
+
+def split_templates(in_context_examples: str) -> List[str]:
+    """The numbered templates of a <MESSAGE TEMPLATES> block, in order."""
+    match = TEMPLATES_BLOCK_RE.search(in_context_examples or "")
+    if not match:
+        return []
+    block = TEMPLATE_TAG_RE.sub("", match.group(1))
+    # Text before the first number is not a template
+    items = NUMBERED_ITEM_RE.split(block)[1:]
+    return [item.strip() for item in items if item.strip()]
+
+
+def replace_templates(in_context_examples: str, templates: List[str]) -> str:
+    """
+    in_context_examples with its <MESSAGE TEMPLATES> block holding only
+    `templates`, or without the block if there are none.
+    """
+    if templates:
+        numbered = "\n".join(f"{i}. {t}" for i, t in enumerate(templates, start=1))
+        block = f"<MESSAGE TEMPLATES>\n{numbered}\n</MESSAGE TEMPLATES>"
+    else:
+        block = ""
+    return TEMPLATES_BLOCK_RE.sub(lambda _: block, in_context_examples, count=1)
+
+
+def _terms(text: str) -> List[str]:
+    return [
+        word[:STEM_LENGTH]
+        for word in WORD_RE.findall(text.lower())
+        if len(word) > 1 and word not in STOPWORDS
+    ]
+
+
+def _template_terms(template: str) -> Counter:
+    template = CV_SLOT_RE.sub(" ", template)
+    counts = Counter(_terms(PLACEHOLDER_RE.sub(" ", template)))
+    for placeholder in PLACEHOLDER_RE.findall(template):
+        for term in _terms(placeholder):
+            counts[term] += PLACEHOLDER_WEIGHT
+    return counts
+
+
+def _field_text(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _field_text(item)
+
+
+def _profile_terms(fields: Dict) -> Counter:
+    return Counter(
+        term
+        for key, value in fields.items()
+        if key not in IGNORED_FIELDS
+        for text in _field_text(value)
+        for term in _terms(text)
+    )
+
+
+class TemplateSelector:
+    """
+    Ranks message templates against a profile by TF-IDF cosine similarity,
+    locally, so a note prompt carries the few templates that fit the profile
+    instead of all of them. Words every template shares ("LinkedIn Profile
+    Name", "Company Name") get no weight; words like "research" or
+    "co-founder" pick the template out.
+    """
+
+    def __init__(self, templates: List[str]):
+        self.templates = list(templates)
+        counts = [_template_terms(t) for t in self.templates]
+        document_frequency = Counter(term for c in counts for term in c)
+        total = len(self.templates)
+        # Smoothed so a term in every template weighs nothing
+        self._idf = {
+            term: math.log((1 + total) / (1 + df))
+            for term, df in document_frequency.items()
+        }
+        self._vectors = [self._vector(c) for c in counts]
+
+    def _vector(self, counts: Counter) -> Dict[str, float]:
+        vector = {
+            term: count * self._idf[term]
+            for term, count in counts.items()
+            if self._idf.get(term)
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {term: w / norm for term, w in vector.items()} if norm else {}
+
+    def scores(self, fields: Dict) -> List[float]:
+        query = self._vector(_profile_terms(fields))
+        return [
+            sum(w * vector.get(term, 0.0) for term, w in query.items())
+            for vector in self._vectors
+        ]
+
+    def matches(self, fields: Dict) -> bool:
+        """Whether anything but the name ties the profile to some template."""
+        ranking_fields = {k: v for k, v in fields.items() if k not in NAME_FIELDS}
+        return any(score > 0 for score in self.scores(ranking_fields))
+
+    def select(self, fields: Dict, k: int = TEMPLATES_PER_PROFILE) -> List[str]:
+        """
+        The k templates that best match the profile fields, best first.
+        Ties, including a profile that matches nothing, keep template order.
+        """
+        scores = self.scores(fields)
+        ranked = sorted(range(len(self.templates)), key=lambda i: -scores[i])
+        return [self.templates[i] for i in ranked[:k]]
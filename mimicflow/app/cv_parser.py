@@ -0,0 +1,150 @@
+# mimicflow/app/cv_parser.py
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from xml.etree import ElementTree
+import io
+import multiprocessing
+import os
+import zipfile
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from PyPDF2 import PdfReader
+
+# Largest CV we accept; checked while the request body arrives, not after
+MAX_UPLOAD_BYTES = int(os.getenv("MIMICFLOW_MAX_UPLOAD_MB", "10")) * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Allowance for the multipart framing around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+# PDFs with at least this many pages are split across worker processes
+PARALLEL_PAGE_THRESHOLD = 8
+MAX_PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+class UnsupportedDocumentError(ValueError):
+    pass
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # spawn: forking a process that runs the event loop's threads is unsafe
+        _process_pool = ProcessPoolExecutor(
+            max_workers=MAX_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware that caps the request body of the upload routes. The
+    body is counted as it is received, before the form is parsed and
+    spooled, so an oversized upload is cut off at the cap whatever its
+    Content-Length says; a declared length over the cap is refused unread.
+    """
+
+    def __init__(
+        self,
+        app,
+        paths,
+        max_bytes: int = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            response = JSONResponse({"detail": _too_large_message()}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing
+                    raise HTTPException(status_code=413, detail=_too_large_message())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def read_upload(file: UploadFile) -> bytes:
+    """Read an upload into memory, rejecting it as soon as it exceeds the cap."""
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        buffer.extend(chunk)
+        if len(buffer) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=_too_large_message())
+    return bytes(buffer)
+
+
+def _too_large_message() -> str:
+    return f"CV is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+
+
+def _extract_pdf_pages(data: bytes, start: int, stop: int) -> List[str]:
+    # Runs in a worker process, so it opens its own reader over the bytes
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def extract_pdf_text(data: bytes) -> str:
+    reader = PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    if page_count < PARALLEL_PAGE_THRESHOLD:
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+    chunk = -(-page_count // MAX_PARSE_WORKERS)  # Ceiling division
+    starts = range(0, page_count, chunk)
+    stops = [min(start + chunk, page_count) for start in starts]
+    chunks = _get_process_pool().map(
+        _extract_pdf_pages, [data] * len(starts), starts, stops
+    )
+    return "\n".join(text for pages in chunks for text in pages)
+
+
+def extract_docx_text(data: bytes) -> str:
+    """Pull paragraph text out of word/document.xml; no extra dependency needed."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+
+    paragraphs = []
+    for paragraph in root.iter(f"{WORD_NS}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{WORD_NS}t" and node.text:
+                parts.append(node.text)
+            elif node.tag == f"{WORD_NS}tab":
+                parts.append("\t")
+            elif node.tag in (f"{WORD_NS}br", f"{WORD_NS}cr"):
+                parts.append("\n")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs).strip()
+
+
+def extract_cv_text(data: bytes, filename: str = "") -> str:
+    """Extract plain text from a PDF, .docx or .txt CV held in memory."""
+    name = (filename or "").lower()
+    if data.startswith(b"%PDF") or name.endswith(".pdf"):
+        return extract_pdf_text(data)
+    if name.endswith(".docx") or data.startswith(b"PK\x03\x04"):
+        return extract_docx_text(data)
+    if name.endswith(".txt"):
+        return data.decode("utf-8", errors="replace")
+    raise UnsupportedDocumentError(f"Unsupported CV format: {filename or 'unknown'}")
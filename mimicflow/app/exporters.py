@@ -0,0 +1,96 @@
+# mimicflow/app/exporters.py
+from typing import Dict, Iterable, Iterator, List
+import csv
+import io
+import json
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+# Rows per Parquet row group; each group is flushed to the client as it fills
+PARQUET_BATCH_ROWS = 500
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def iter_csv(rows: Iterable[Dict], columns: List[str]) -> Iterator[str]:
+    """Render rows as CSV, one chunk per row."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        # Lists are written as their repr, the way pandas wrote them
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_jsonl(rows: Iterable[Dict], columns: List[str]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps({column: row.get(column) for column in columns}) + "\n"
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_parquet(
+    rows: Iterable[Dict], columns: List[str], list_columns: Iterable[str] = ()
+) -> Iterator[bytes]:
+    """Render rows as a Parquet file, streamed one row group at a time."""
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+
+    list_columns = set(list_columns)
+    schema = pa.schema(
+        [
+            (column, pa.list_(pa.string()) if column in list_columns else pa.string())
+            for column in columns
+        ]
+    )
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    def write_batch(batch: List[Dict]):
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+    batch = []
+    for row in rows:
+        batch.append({column: row.get(column) for column in columns})
+        if len(batch) >= PARQUET_BATCH_ROWS:
+            write_batch(batch)
+            batch = []
+            yield sink.drain()
+    if batch:
+        write_batch(batch)
+    writer.close()
+    yield sink.drain()
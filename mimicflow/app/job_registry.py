@@ -0,0 +1,117 @@
+# mimicflow/app/job_registry.py
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import uuid
+
+from .progress_manager import ProgressManager
+from .result_store import ResultStore
+
+
+class Job:
+    """One LinkedIn search run with its own progress state and agent."""
+
+    def __init__(
+        self,
+        job_id: str,
+        store: Optional[ResultStore] = None,
+        progress_manager: Optional[ProgressManager] = None,
+    ):
+        self.id = job_id
+        self.store = store
+        self.progress_manager = progress_manager or ProgressManager(job_id, store)
+        self.agent: Optional[Any] = None  # LinkedInSearchAgent once started
+        self.task: Optional[asyncio.Task] = None
+        # queued, running, completed, failed, or interrupted by a restart
+        self.status: str = "queued"
+        self.error: Optional[str] = None
+        self.request: Optional[Dict] = None
+        self.created_at = datetime.now()
+
+    def set_status(self, status: str, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+        if self.store:
+            self.store.update_job(self.id, status=status, error=error)
+
+    def summary(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "is_done": self.progress_manager.is_done,
+            "profiles_needed": self.progress_manager.profiles_needed,
+            "profiles_found": len(self.progress_manager.profiles),
+        }
+
+
+class JobRegistry:
+    """
+    Hands out job IDs and runs each job in the background, with at most
+    `max_workers` searches running at once. Jobs beyond that wait in
+    "queued" until a worker frees up. With a store, jobs from earlier server
+    processes are loaded back; any that had not finished become "interrupted".
+    """
+
+    def __init__(self, max_workers: int = 2, store: Optional[ResultStore] = None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.store = store
+        self.jobs: Dict[str, Job] = {}
+        self.latest_job_id: Optional[str] = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+        if store:
+            self._restore()
+
+    def _restore(self):
+        for row in self.store.list_jobs():
+            job = Job(
+                row["id"],
+                store=self.store,
+                progress_manager=ProgressManager.restore(row["id"], self.store),
+            )
+            job.request = row["request"]
+            job.created_at = datetime.fromisoformat(row["created_at"])
+            job.status, job.error = row["status"], row["error"]
+            if job.status in ("queued", "running"):
+                job.set_status("interrupted", "Server stopped before the job finished")
+            self.jobs[job.id] = job
+            self.latest_job_id = job.id
+
+    def create_job(self, request: Optional[Dict] = None) -> Job:
+        job = Job(uuid.uuid4().hex[:12], store=self.store)
+        job.request = request
+        if self.store:
+            self.store.create_job(job.id, request, job.created_at.isoformat())
+        self.jobs[job.id] = job
+        self.latest_job_id = job.id
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def latest(self) -> Optional[Job]:
+        return self.jobs.get(self.latest_job_id) if self.latest_job_id else None
+
+    def list_jobs(self) -> List[Dict]:
+        return [job.summary() for job in self.jobs.values()]
+
+    def submit(self, job: Job, runner: Callable[[Job], Awaitable[None]]) -> asyncio.Task:
+        """Schedule `runner(job)` once a worker slot is free."""
+        self.latest_job_id = job.id
+
+        async def _run():
+            async with self._semaphore:
+                job.set_status("running")
+                try:
+                    await runner(job)
+                    job.set_status("completed")
+                except Exception as e:
+                    job.set_status("failed", str(e))
+                finally:
+                    await job.progress_manager.mark_done()
+
+        job.task = asyncio.create_task(_run())
+        return job.task
@@ -0,0 +1,89 @@
+# mimicflow/app/llm_cache.py
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import threading
+
+
+class LLMCache:
+    """
+    Persistent content-addressed cache for LLM outputs. Entries are keyed on
+    a hash of the input text plus model and prompt version, stored one file
+    per entry, and the least recently used ones are evicted once the cache
+    grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = "linkedin_searches/llm_cache", max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = sum(path.stat().st_size for path in self._entries())
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def _entries(self):
+        return self.cache_dir.glob("*/*.json")
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        with self._lock:
+            try:
+                value = json.loads(path.read_text(encoding="utf-8"))["value"]
+            except (OSError, ValueError, KeyError):
+                self.misses += 1
+                return None
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str):
+        path = self._path(key)
+        payload = json.dumps({"value": value})
+        with self._lock:
+            path.parent.mkdir(exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, path)
+            self._total_bytes += path.stat().st_size - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(
+            ((path.stat().st_mtime, path.stat().st_size, path) for path in self._entries()),
+            key=lambda entry: entry[0],
+        )
+        for _, size, path in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._total_bytes -= size
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,79 @@
+# mimicflow/app/llm_registry.py
+from typing import Dict, Optional, Tuple
+import os
+import threading
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_openai import ChatOpenAI
+
+# Environment variable holding each provider's API key
+API_KEY_ENV = {
+    "google": "GEMINI_API_KEY",
+    "openai": "OPENAI_API_KEY",
+}
+
+
+class LLMRegistry:
+    """
+    Process-wide cache of chat model clients keyed by provider, model and
+    parameters. Call sites share one long-lived client per configuration, so
+    its HTTP connection pool is reused instead of rebuilt on every request.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple, BaseChatModel] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(provider: str, model: str, params: Dict) -> Tuple:
+        # The API key is part of the key, so a changed key never reuses a stale client
+        api_key = os.getenv(API_KEY_ENV[provider])
+        return (provider, model, api_key, tuple(sorted(params.items())))
+
+    def get(self, provider: str, model: str, **params) -> BaseChatModel:
+        if provider not in API_KEY_ENV:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+        key = self._key(provider, model, params)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._build(provider, model, key[2], params)
+                self._clients[key] = client
+            return client
+
+    @staticmethod
+    def _build(provider: str, model: str, api_key: Optional[str], params: Dict) -> BaseChatModel:
+        if api_key:
+            params = {**params, "api_key": api_key}
+        if provider == "google":
+            return ChatGoogleGenerativeAI(model=model, **params)
+        return ChatOpenAI(model=model, **params)
+
+    def invalidate(self, provider: Optional[str] = None):
+        """Drop cached clients, e.g. after the provider's API key changed."""
+        with self._lock:
+            for key in list(self._clients):
+                if provider is None or key[0] == provider:
+                    del self._clients[key]
+
+    async def warm(self, provider: str, model: str, **params):
+        """
+        Build the client ahead of its first real call and, where the SDK
+        allows a free request, open its connection pool.
+        """
+        client = self.get(provider, model, **params)
+        root_async_client = getattr(client, "root_async_client", None)
+        if root_async_client is not None:
+            try:
+                # Listing models costs no tokens but completes the TLS handshake
+                await root_async_client.models.list()
+            except Exception as e:
+                print(f"Could not warm {provider} client for {model}: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"clients": [f"{key[0]}:{key[1]}" for key in self._clients]}
+
+
+llm_registry = LLMRegistry()
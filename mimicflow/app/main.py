@@ -1,27 +1,77 @@
 # mimicflow/app/main.py
 
-from fastapi import FastAPI, BackgroundTasks
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, get_origin
 import asyncio
-from PyPDF2 import PdfReader
+import json
 import os
 from fastapi import File, UploadFile
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 # Utils to keep track of progress
 from .progress_manager import ProgressManager
+from .job_registry import Job, JobRegistry
+from .result_store import ResultStore
+from .cv_parser import (
+    UnsupportedDocumentError,
+    UploadSizeLimit,
+    extract_cv_text,
+    read_upload,
+)
+from .llm_cache import LLMCache
+from .exporters import (
+    EXPORT_MEDIA_TYPES,
+    iter_csv,
+    iter_jsonl,
+    iter_parquet,
+    parquet_available,
+)
 
-
-# OpenAI for PDF summarization
-from langchain_google_genai import ChatGoogleGenerativeAI
+# Shared LLM clients for PDF summarization
+from .llm_registry import llm_registry
 
 # Import your LinkedInFilter, LinkedInSearchAgent from your new location:
-from mimicflow.agents.linkedin.linkedin_agent import LinkedInFilter, LinkedInSearchAgent
+from mimicflow.agents.linkedin.linkedin_agent import (
+    DEFAULT_PROFILE_WORKERS,
+    DOM_ANALYSIS_OPENAI_MODEL,
+    LinkedInFilter,
+    LinkedInProfileResult,
+    LinkedInSearchAgent,
+)
+from mimicflow.agents.linkedin.contact_index import ContactIndex
+from mimicflow.agents.linkedin.message_examples import (
+    build_in_context_examples,
+    format_templates,
+)
+from mimicflow.agents.linkedin.pacing import linkedin_pacer
+from mimicflow.agents.linkedin.search_url import FacetIdCache
 
 app = FastAPI()
-progress_manager = ProgressManager()
+# Jobs, discovered profiles and extracted results persist here across restarts
+result_store = ResultStore(os.getenv("MIMICFLOW_DB_PATH", "linkedin_searches/mimicflow.db"))
+# Every profile any search has visited, so later searches skip them
+contact_index = ContactIndex(result_store)
+# Company, school and location IDs for building search URLs from form filters
+facet_cache = FacetIdCache(result_store)
+# Maximum number of searches running at the same time; others are queued
+job_registry = JobRegistry(
+    max_workers=int(os.getenv("MIMICFLOW_MAX_WORKERS", "2")), store=result_store
+)
+# Served by the legacy endpoints before any job has been started
+_idle_progress_manager = ProgressManager()
+# Summaries and templates of CVs we have already seen, so re-uploads skip the LLM
+llm_cache = LLMCache(
+    os.getenv("MIMICFLOW_LLM_CACHE_DIR", "linkedin_searches/llm_cache"),
+    max_bytes=int(os.getenv("MIMICFLOW_LLM_CACHE_MB", "50")) * 1024 * 1024,
+)
+
+# Bump a prompt version whenever its prompt changes, so cached outputs expire
+SUMMARY_MODEL = "gemini-2.0-flash-exp"
+SUMMARY_PROMPT_VERSION = "1"
+CONNECTION_REQUESTS_MODEL = "gemini-2.0-flash-exp"
+CONNECTION_REQUESTS_PROMPT_VERSION = "1"
 
 # Add CORS middleware:
 app.add_middleware(
@@ -31,6 +81,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Oversized CVs are cut off while they arrive, before the form is parsed
+app.add_middleware(UploadSizeLimit, paths=["/api/upload-cv", "/api/upload-cv/stream"])
 
 
 # 1) A Pydantic model to define the request body structure
@@ -43,33 +95,14 @@ class SummarySaveRequest(BaseModel):
     summary: str
 
 
-def format_excerpts(input_text):
-    # Split the input text by the '----' delimiter
-    excerpts = input_text.split("----")
-    # Remove any extra whitespace or empty lines
-    excerpts = [excerpt.strip() for excerpt in excerpts if excerpt.strip()]
-
-    # Create the numbered format
-    formatted_output = "<MESSAGE TEMPLATES>\n"  # Opening tag
-    for i, excerpt in enumerate(excerpts, start=1):
-        formatted_output += f"{i}. {excerpt}\n"
-    formatted_output += "</MESSAGE TEMPLATES>"  # Closing tag
-
-    return formatted_output.strip()
-
-
 # 2) The new endpoint
 @app.post("/api/linkedin-examples")
 def handle_linkedin_examples(data: LinkedInExamplesRequest):
     """
     Endpoint to receive the connection request templates from the frontend.
     """
-    # Join the templates with the delimiter
-    templates_text = "———".join(data.templates)
-
-    formatted_excerpts = format_excerpts(templates_text)
     global SYSTEM_PROMPT
-    SYSTEM_PROMPT = formatted_excerpts
+    SYSTEM_PROMPT = format_templates(data.templates)
 
     print("Received connection requests:\n", SYSTEM_PROMPT)
     return {"message": "Connection requests received successfully!"}
@@ -92,21 +125,37 @@ class OpenAIKeyRequest(BaseModel):
 
 
 @app.post("/api/set-key")
-def set_key(data: GeminiKeyRequest):
+def set_key(data: GeminiKeyRequest, background_tasks: BackgroundTasks):
     """
     Store the user's GEMINI API key in an environment variable,
     so that ChatGoogleGenerativeAI or other LLM code can pick it up.
     """
     os.environ["GEMINI_API_KEY"] = data.key
+    # Clients built with the old key are dropped; prebuild the ones we use
+    llm_registry.invalidate("google")
+    background_tasks.add_task(
+        llm_registry.warm, "google", SUMMARY_MODEL, temperature=0.0
+    )
+    background_tasks.add_task(
+        llm_registry.warm,
+        "google",
+        CONNECTION_REQUESTS_MODEL,
+        temperature=0.5,
+        max_tokens=300,
+    )
     return {"message": f"Key set. Length: {len(data.key)} chars."}
 
 
 @app.post("/api/set-gpt-key")
-def set_gpt_key(data: OpenAIKeyRequest):
+def set_gpt_key(data: OpenAIKeyRequest, background_tasks: BackgroundTasks):
     """
     Store the user's OpenAI API key in an environment variable.
     """
     os.environ["OPENAI_API_KEY"] = data.key
+    llm_registry.invalidate("openai")
+    background_tasks.add_task(
+        llm_registry.warm, "openai", DOM_ANALYSIS_OPENAI_MODEL, temperature=0.0
+    )
     return {"message": f"OpenAI key set. Length: {len(data.key)} chars."}
 
 
@@ -115,27 +164,24 @@ class UploadResponse(BaseModel):
     connection_requests: str
 
 
-@app.post("/api/upload-cv", response_model=UploadResponse)
-async def upload_cv(file: UploadFile = File(...)):
-    """Receive PDF or docx from the user, parse, summarize, then print & return summary."""
-    contents = await file.read()
+async def _read_cv_text(file: UploadFile) -> str:
+    contents = await read_upload(file)
 
-    # 1. Parse PDF
+    # Parse in memory on a worker thread, so the event loop stays free
     try:
-        with open("temp.pdf", "wb") as f:
-            f.write(contents)
+        return await asyncio.to_thread(extract_cv_text, contents, file.filename)
+    except UnsupportedDocumentError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        # Summarizing the error would cache it as this upload's summary
+        raise HTTPException(status_code=400, detail=f"Could not parse the CV: {e}")
 
-        pdf_reader = PdfReader("temp.pdf")
-        text_pages = []
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text_pages.append(page.extract_text() or "")
-        cv_text = "\n".join(text_pages)
 
-    except Exception as e:
-        cv_text = (
-            f"Could not parse PDF text properly. We'll proceed with raw text.\n{e}"
-        )
+@app.post("/api/upload-cv", response_model=UploadResponse)
+async def upload_cv(file: UploadFile = File(...)):
+    """Receive PDF or docx from the user, parse, summarize, then print & return summary."""
+    # 1. Parse
+    cv_text = await _read_cv_text(file)
 
     # 2. Summarize with GPT-4
     summary = await summarize_resume(cv_text)
@@ -152,14 +198,80 @@ async def upload_cv(file: UploadFile = File(...)):
     return {"summary": summary, "connection_requests": connection_requests}
 
 
-async def summarize_resume(cv_text: str) -> str:
-    """Summarize the given resume text with GPT-4."""
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-exp",
-        temperature=0.0,
-        api_key=os.getenv("GEMINI_API_KEY"),
+@app.post("/api/upload-cv/stream")
+async def upload_cv_stream(request: Request, file: UploadFile = File(...)):
+    """
+    Streaming variant of /api/upload-cv. Sends server-sent events:
+    summary_token (many), summary_done, template_token (many), then done with
+    the final summary and connection_requests, which are authoritative.
+    An error event precedes done if a stage fails. Generation stops when
+    the client goes away.
+    """
+    cv_text = await _read_cv_text(file)
+
+    async def event_stream():
+        summary_parts = []
+        try:
+            async for token in stream_resume_summary(cv_text):
+                if await request.is_disconnected():
+                    return
+                summary_parts.append(token)
+                yield _format_sse("summary_token", {"token": token})
+        except Exception as e:
+            summary_parts = [f"Could not generate summary with Gemini:\n{e}"]
+            yield _format_sse("error", {"stage": "summary", "message": str(e)})
+        summary = "".join(summary_parts).strip()
+        yield _format_sse("summary_done", {"summary": summary})
+
+        template_parts = []
+        try:
+            async for token in stream_connection_requests(summary):
+                if await request.is_disconnected():
+                    return
+                template_parts.append(token)
+                yield _format_sse("template_token", {"token": token})
+            connection_requests = "".join(template_parts).strip()
+        except Exception as e:
+            connection_requests = FALLBACK_CONNECTION_REQUESTS
+            yield _format_sse("error", {"stage": "templates", "message": str(e)})
+
+        yield _format_sse(
+            "done", {"summary": summary, "connection_requests": connection_requests}
+        )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+
+@app.get("/api/cache-stats")
+def cache_stats():
+    """Hit/miss counters and size of the CV summary/template cache."""
+    return llm_cache.stats()
+
+
+@app.get("/api/contact-stats")
+def contact_stats():
+    """How many known profiles were contacted, extracted, failed or skipped."""
+    return contact_index.stats()
+
+
+@app.get("/api/pacing-stats")
+def pacing_stats():
+    """Pacing budgets of the LinkedIn account and how long actions waited for them."""
+    return linkedin_pacer.stats()
+
+
+def _summary_cache_key(cv_text: str) -> str:
+    return LLMCache.make_key("summary", SUMMARY_MODEL, SUMMARY_PROMPT_VERSION, cv_text)
+
+
+def _summary_request(cv_text: str):
+    """LLM client and messages for summarizing a resume."""
+    llm = llm_registry.get("google", SUMMARY_MODEL, temperature=0.0)
+
     messages = [
         {
             "role": "system",
@@ -181,25 +293,47 @@ instead write "This is a summary of my resume". Do not write "The user is a stud
         },
         {"role": "user", "content": "Here is my resume:\n" + cv_text},
     ]
+    return llm, messages
+
 
+async def summarize_resume(cv_text: str) -> str:
+    """Summarize the given resume text with GPT-4."""
+    cache_key = _summary_cache_key(cv_text)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    llm, messages = _summary_request(cv_text)
     try:
         response = await llm.ainvoke(messages)
-        return response.content.strip()
+        summary = response.content.strip()
+        llm_cache.set(cache_key, summary)
+        return summary
     except Exception as e:
         return f"Could not generate summary with Gemini:\n{e}"
 
 
-# --- CHANGED: Return a single string with 5 example messages
-async def generate_connection_requests(summary_text: str) -> str:
-    """
-    Generate one combined text block that contains 5 LinkedIn
-    connection request examples referencing the user's background.
-    """
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash-exp",
-        temperature=0.5,
-        max_tokens=300,
-        api_key=os.getenv("GEMINI_API_KEY"),
+async def stream_resume_summary(cv_text: str) -> AsyncIterator[str]:
+    """Like summarize_resume, but yield tokens as the model produces them."""
+    cache_key = _summary_cache_key(cv_text)
+    async for token in _stream_cached(cache_key, lambda: _summary_request(cv_text)):
+        yield token
+
+
+def _connection_requests_cache_key(summary_text: str) -> str:
+    # The summary is derived from the CV text, so keying on it covers both
+    return LLMCache.make_key(
+        "connection_requests",
+        CONNECTION_REQUESTS_MODEL,
+        CONNECTION_REQUESTS_PROMPT_VERSION,
+        summary_text,
+    )
+
+
+def _connection_requests_request(summary_text: str):
+    """LLM client and messages for writing connection request templates."""
+    llm = llm_registry.get(
+        "google", CONNECTION_REQUESTS_MODEL, temperature=0.5, max_tokens=300
     )
     prompt = [
         {
@@ -316,12 +450,58 @@ These messages are shorter and more personal, and they mention a relevant and in
             + "\n</CV SUMMARY>",
         },
     ]
+    return llm, prompt
+
+
+# --- CHANGED: Return a single string with 5 example messages
+async def generate_connection_requests(summary_text: str) -> str:
+    """
+    Generate one combined text block that contains 5 LinkedIn
+    connection request examples referencing the user's background.
+    """
+    cache_key = _connection_requests_cache_key(summary_text)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    llm, prompt = _connection_requests_request(summary_text)
     try:
         response = await llm.ainvoke(prompt)
-        return response.content.strip()
+        connection_requests = response.content.strip()
+        llm_cache.set(cache_key, connection_requests)
+        return connection_requests
     except Exception:
         # Return a fallback string if error
-        return """
+        return FALLBACK_CONNECTION_REQUESTS
+
+
+async def stream_connection_requests(summary_text: str) -> AsyncIterator[str]:
+    """Like generate_connection_requests, but yield tokens as they arrive."""
+    cache_key = _connection_requests_cache_key(summary_text)
+    async for token in _stream_cached(
+        cache_key, lambda: _connection_requests_request(summary_text)
+    ):
+        yield token
+
+
+async def _stream_cached(cache_key: str, make_request) -> AsyncIterator[str]:
+    """Stream a completion token by token, or replay it whole from the cache."""
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    llm, messages = make_request()
+    chunks = []
+    async for chunk in llm.astream(messages):
+        if chunk.content:
+            chunks.append(chunk.content)
+            yield chunk.content
+    llm_cache.set(cache_key, "".join(chunks).strip())
+
+
+# Served when template generation fails
+FALLBACK_CONNECTION_REQUESTS = """
 Hi Brett, I'm really interested in [Company Name]. I'm building a platform to connect patients with rare diseases and would love to hear about your experience in the field.  
 Best,
 [Your Name]
@@ -373,6 +553,8 @@ class LinkedInSearchRequest(BaseModel):
     include_note: bool = True
     template_mode: str = "examples"
     custom_template: Optional[str] = None
+    # Profile agents run in parallel, each in its own browser
+    profile_workers: int = DEFAULT_PROFILE_WORKERS
 
 
 # We'll store the last result in memory (just for demo)
@@ -383,19 +565,72 @@ LAST_RESULT = []
 async def run_linkedin_search(
     data: LinkedInSearchRequest, background_tasks: BackgroundTasks
 ):
-    await progress_manager.reset()
-    await progress_manager.set_target(data.profiles_needed)
-    asyncio.create_task(_background_linkedin_search(data, progress_manager))
-    return {"message": "Search initiated. Check Progress tab for details."}
+    job = job_registry.create_job(request=data.model_dump())
+    await job.progress_manager.set_target(data.profiles_needed)
+    job_registry.submit(job, lambda job: _background_linkedin_search(data, job))
+    return {
+        "message": "Search initiated. Check Progress tab for details.",
+        "job_id": job.id,
+    }
 
 
-@app.get("/api/progress")
-async def get_progress():
+@app.get("/api/jobs")
+async def list_jobs():
+    """List every search job with its status."""
+    return {"jobs": job_registry.list_jobs(), "max_workers": job_registry.max_workers}
+
+
+def _get_job_or_404(job_id: str) -> Job:
+    job = job_registry.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@app.post("/api/jobs/{job_id}/resume")
+async def resume_job(job_id: str):
     """
-    Return the current progress (list of profiles and whether done).
-    The frontend will poll this endpoint to see new data.
+    Continue an interrupted or failed job from its checkpoint: profiles that
+    already completed or failed are skipped, and the search itself is skipped
+    if it had finished.
     """
-    state = await progress_manager.get_state()
+    job = _get_job_or_404(job_id)
+    if job.status not in ("interrupted", "failed"):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {job.status}; only interrupted or failed jobs can be resumed",
+        )
+    if not job.request:
+        raise HTTPException(status_code=409, detail="Job has no stored request to resume")
+
+    data = LinkedInSearchRequest(**job.request)
+    job.set_status("queued")
+    await job.progress_manager.reopen()
+    job_registry.submit(
+        job, lambda job: _background_linkedin_search(data, job, resume=True)
+    )
+    return {"message": "Job resumed. Check Progress tab for details.", "job_id": job.id}
+
+
+@app.get("/api/jobs/{job_id}/browser-pool")
+async def browser_pool_stats(job_id: str):
+    """Size, usage and lease-wait times of a job's browser context pool."""
+    job = _get_job_or_404(job_id)
+    if job.agent is None:
+        raise HTTPException(status_code=409, detail="Job has no running browser")
+    return job.agent.browser_pool.stats()
+
+
+def _latest_progress_manager() -> ProgressManager:
+    """Progress of the most recent job, for the job-less legacy endpoints."""
+    job = job_registry.latest()
+    return job.progress_manager if job else _idle_progress_manager
+
+
+async def _progress_response(progress_manager: ProgressManager, since: Optional[str]):
+    state = await progress_manager.get_state(since=since)
+    if state is None:
+        return Response(status_code=304)
     if state.get("is_done"):
         # If task is done, don't reset to initial state
         return {
@@ -407,10 +642,128 @@ async def get_progress():
     return state
 
 
-@app.get("/api/download-results")
-async def download_results():
-    """Serve the CSV file for download when processing is done."""
-    state = await progress_manager.get_state()
+@app.get("/api/progress")
+async def get_progress(since: Optional[str] = None):
+    """
+    Return the current progress (list of profiles and whether done) of the
+    most recent job. Polling fallback for clients that cannot use
+    /api/progress/stream. Pass ?since=<cursor> from a previous response to
+    get only the profiles changed after it; 304 is returned when nothing changed.
+    A cursor from another job or server process gets a full snapshot.
+    """
+    return await _progress_response(_latest_progress_manager(), since)
+
+
+@app.get("/api/jobs/{job_id}/progress")
+async def get_job_progress(job_id: str, since: Optional[str] = None):
+    """Same as /api/progress, for one specific job."""
+    return await _progress_response(_get_job_or_404(job_id).progress_manager, since)
+
+
+def _format_sse(event: str, data: dict, version: Optional[int] = None) -> str:
+    """Serialize one server-sent event frame."""
+    frame = f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    if version is not None:
+        frame = f"id: {version}\n" + frame
+    return frame
+
+
+def _progress_stream(progress_manager: ProgressManager, request: Request):
+    # Subscribe before taking the snapshot so no change falls in between
+    queue = progress_manager.subscribe()
+
+    async def event_stream():
+        try:
+            state = await progress_manager.get_state()
+            yield _format_sse("snapshot", state, state["version"])
+            if state.get("is_done"):
+                return
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_sse(event["event"], event["data"], event["version"])
+                if event["event"] == "done":
+                    break
+        finally:
+            progress_manager.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/progress/stream")
+async def stream_progress(request: Request):
+    """
+    Push progress of the most recent job as server-sent events instead of
+    polling. Sends a full snapshot first, then one event per add/update, and
+    closes after the done event. /api/progress stays available as a fallback.
+    """
+    return _progress_stream(_latest_progress_manager(), request)
+
+
+@app.get("/api/jobs/{job_id}/progress/stream")
+async def stream_job_progress(job_id: str, request: Request):
+    """Same as /api/progress/stream, for one specific job."""
+    return _progress_stream(_get_job_or_404(job_id).progress_manager, request)
+
+
+# Column layout of exported LinkedInProfileResult rows
+RESULT_COLUMNS = list(LinkedInProfileResult.model_fields)
+RESULT_LIST_COLUMNS = [
+    name
+    for name, field in LinkedInProfileResult.model_fields.items()
+    if get_origin(field.annotation) is list
+]
+
+
+def _export_response(job_id: str, export_format: str):
+    """Stream a job's stored result rows in the given format."""
+    rows = result_store.iter_results(job_id)
+    if export_format == "csv":
+        body = iter_csv(rows, RESULT_COLUMNS)
+    elif export_format == "jsonl":
+        body = iter_jsonl(rows, RESULT_COLUMNS)
+    elif export_format == "parquet":
+        if not parquet_available():
+            raise HTTPException(
+                status_code=501, detail="Parquet export needs pyarrow: pip install pyarrow"
+            )
+        body = iter_parquet(rows, RESULT_COLUMNS, RESULT_LIST_COLUMNS)
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown export format {export_format!r}; use one of {sorted(EXPORT_MEDIA_TYPES)}",
+        )
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="linkedin_profiles.{export_format}"'
+        },
+    )
+
+
+@app.get("/api/jobs/{job_id}/export")
+async def export_job_results(job_id: str, format: str = "csv"):
+    """
+    Stream the stored results of a job as csv, jsonl or parquet, straight
+    from the store and without building a DataFrame.
+    """
+    return _export_response(_get_job_or_404(job_id).id, format)
+
+
+async def _download_response(job: Optional[Job]):
+    if job is not None and result_store.count_results(job.id) > 0:
+        return _export_response(job.id, "csv")
+    # Runs from before the store existed only have the CSV on disk
+    state = await (job.progress_manager if job else _idle_progress_manager).get_state()
     csv_file_path = state.get("csv_file_path")
     if state.get("is_done") and csv_file_path and os.path.exists(csv_file_path):
         return FileResponse(
@@ -420,13 +773,31 @@ async def download_results():
         return {"error": "File not found or processing not yet complete"}
 
 
+@app.get("/api/download-results")
+async def download_results():
+    """Serve the results of the most recent job as CSV."""
+    return await _download_response(job_registry.latest())
+
+
+@app.get("/api/jobs/{job_id}/download-results")
+async def download_job_results(job_id: str):
+    """Serve the results of one specific job as CSV."""
+    return await _download_response(_get_job_or_404(job_id))
+
+
 async def _background_linkedin_search(
-    data: LinkedInSearchRequest, progress_manager: ProgressManager
+    data: LinkedInSearchRequest, job: Job, resume: bool = False
 ):
     """
-    The actual background function that runs the agent logic.
+    The actual background function that runs the agent logic for one job.
     Now handles both URL-based and form-based searches.
     """
+    progress_manager = job.progress_manager
+    search_filter = None
+    # A resumed run keeps writing into the directory of the interrupted one
+    output_dir = None
+    if resume and progress_manager.csv_file_path:
+        output_dir = os.path.dirname(progress_manager.csv_file_path)
     try:
         if data.linkedin_url:
             # URL-based search
@@ -462,38 +833,26 @@ async def _background_linkedin_search(
             include_note=data.include_note,
             template_mode=data.template_mode,
             custom_template=data.custom_template,
+            job_id=job.id,
+            output_dir=output_dir,
+            profile_workers=data.profile_workers,
+            contact_index=contact_index,
+            facet_cache=facet_cache,
         )
+        job.agent = agent
         await progress_manager.set_csv_file_path(str(agent.csv_file_path))
 
         # Only prepare in_context_examples if sending connection requests with notes
         in_context_examples = ""
         if data.send_connection_request and data.include_note:
             try:
-                in_context_examples = (
-                    "<CUSTOM_MESSAGE GENERATION INSTRUCTIONS>\n"
-                    + "<CV SUMMARY>\n"
-                    + SUMMARY
-                    + "\n</CV SUMMARY>"
-                    + "\n\n <MESSAGE TEMPLATES>\n"
-                    + SYSTEM_PROMPT
-                    + "\n</MESSAGE TEMPLATES>"
-                )
-                in_context_examples += """ 
-                MOST IMPORTANT INSTRUCTION: For second person perspective details, replace [Linkedin Profile placeholders] like
-                [Linkedin Profile Name] and [Linkedin Profile Details] with real details which are extracted from the LINKEDIN PROFILE after navigating to the profile.
-                For first person perspective details, use information from <CV SUMMARY>...</CV SUMMARY>, never use these details to refer to [Linkedin Profile Name] or [Linkedin Profile Details], which must be from the LINKEDIN PROFILE that is extracted.
-                For example: Choose a short <MESSAGE TEMPLATE>, replace [Linkedin Profile Name] with real name extracted from the LINKEDIN PROFILE, replace Best, [My Name] with MY REAL NAME from <CV SUMMARY>...</CV SUMMARY>
-                and when mentioning my details (first person perspective) use relevantinformation from <CV SUMMARY>...</CV SUMMARY>. If no relevant information is found in <CV SUMMARY>...</CV SUMMARY> or LINKEDIN PROFILE, craft a minimal message like 
-                Hi [Linkedin Profile Name], I'm interested in [Field of Interest]. I'd love to connect. Thanks, [My Name].
-                Failure to follow these instructions will result in a million dollar fine.
-                </CUSTOM_MESSAGE GENERATION INSTRUCTIONS>
-                """
+                in_context_examples = build_in_context_examples(SUMMARY, SYSTEM_PROMPT)
             except NameError:
                 # If SYSTEM_PROMPT or SUMMARY isn't defined, use a minimal template
                 in_context_examples = "Hi [Linkedin Profile Name], I'm interested in your work and would love to connect.\nBest,\n[My Name]"
 
         # Run the agent with the examples (empty string if not sending connection requests)
-        results_df = await agent.run(in_context_examples)
+        results_df = await agent.run(in_context_examples, resume=resume)
 
         if results_df is not None:
             LAST_RESULT = results_df.to_dict(orient="records")
@@ -505,8 +864,7 @@ async def _background_linkedin_search(
         print(f"Error while running LinkedIn search: {e}")
         print(data)
         print(search_filter)
-    finally:
-        await progress_manager.mark_done()
+        raise
 
 
 def _split_input(input_str: str) -> List[str]:
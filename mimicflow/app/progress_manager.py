@@ -1,7 +1,12 @@
 # mimicflow/app/progress_manager.py
-from typing import Dict, List, Optional
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 from pydantic import BaseModel
 import asyncio
+import uuid
+
+if TYPE_CHECKING:
+    from .result_store import ResultStore
 
 
 class Profile(BaseModel):
@@ -13,22 +18,90 @@ class Profile(BaseModel):
 
 
 class ProgressManager:
-    def __init__(self):
+    def __init__(self, job_id: Optional[str] = None, store: Optional["ResultStore"] = None):
+        # With a store, every change is written through so it survives restarts
+        self.job_id = job_id
+        self.store = store if job_id else None
         self.profiles: List[Profile] = []
         self.is_done: bool = False
         self.profiles_needed: int = 0
+        # Set once the search phase has discovered all profiles (checkpoint)
+        self.search_done: bool = False
         self._lock = asyncio.Lock()
         self.csv_file_path: Optional[str] = None  # Add this line
+        # Queues of listeners on the event stream, fed on every change
+        self._subscribers: Set[asyncio.Queue] = set()
+        # Monotonic version, bumped on every mutation (never reset)
+        self.version: int = 0
+        # Version at the last reset; older cursors need a full snapshot
+        self._reset_version: int = 0
+        # Versions restart in every process and on restore(); cursors carry
+        # the job and epoch so one from another job or process is never
+        # read as a position in this change log
+        self.epoch: str = uuid.uuid4().hex[:8]
+        self._profiles_by_id: Dict[str, Profile] = {}
+        # (version, profile_id) in ascending version order
+        self._change_log: List[Tuple[int, str]] = []
+
+    @classmethod
+    def restore(cls, job_id: str, store: "ResultStore") -> "ProgressManager":
+        """Rebuild a job's progress from the store, e.g. after a restart."""
+        manager = cls(job_id=job_id, store=store)
+        job = store.get_job(job_id) or {}
+        manager.profiles_needed = job.get("profiles_needed", 0)
+        manager.is_done = job.get("is_done", False)
+        manager.search_done = job.get("search_done", False)
+        manager.csv_file_path = job.get("csv_file_path")
+        for row in store.get_profiles(job_id):
+            profile = Profile(**row)
+            manager.profiles.append(profile)
+            manager._profiles_by_id[profile.id] = profile
+            manager._bump(profile.id)
+        return manager
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a listener; every change is pushed onto the returned queue."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _bump(self, profile_id: Optional[str] = None) -> int:
+        self.version += 1
+        if profile_id is not None:
+            self._change_log.append((self.version, profile_id))
+        return self.version
+
+    def _publish(self, event: str, data: Dict):
+        # Called with the lock held, so listeners see events in mutation order
+        for queue in self._subscribers:
+            queue.put_nowait({"event": event, "data": data, "version": self.version})
 
     async def reset(self):
         async with self._lock:
             self.profiles = []
             self.is_done = False
+            self.search_done = False
             self.profiles_needed = 0
+            self._profiles_by_id = {}
+            self._change_log = []
+            self._reset_version = self._bump()
+            if self.store:
+                self.store.delete_profiles(self.job_id)
+                self.store.update_job(
+                    self.job_id, is_done=False, search_done=False, profiles_needed=0
+                )
+            self._publish("reset", {})
 
     async def set_target(self, count: int):
         async with self._lock:
             self.profiles_needed = count
+            self._bump()
+            if self.store:
+                self.store.update_job(self.job_id, profiles_needed=count)
+            self._publish("target", {"profiles_needed": count})
 
     async def add_profile(self, profile: Dict):
         async with self._lock:
@@ -40,31 +113,129 @@ class ProgressManager:
                 message="Profile discovered",
             )
             self.profiles.append(new_profile)
+            self._profiles_by_id[new_profile.id] = new_profile
+            self._bump(new_profile.id)
+            if self.store:
+                self.store.upsert_profile(self.job_id, new_profile.model_dump())
+            self._publish("profile_added", new_profile.model_dump())
             return new_profile.id
 
     async def update_profile(self, profile_id: str, **kwargs):
         async with self._lock:
-            for profile in self.profiles:
-                if profile.id == profile_id:
-                    for key, value in kwargs.items():
-                        setattr(profile, key, value)
-                    break
+            profile = self._profiles_by_id.get(profile_id)
+            if profile is None:
+                return
+            for key, value in kwargs.items():
+                setattr(profile, key, value)
+            self._bump(profile_id)
+            if self.store:
+                self.store.upsert_profile(self.job_id, profile.model_dump())
+            self._publish("profile_updated", profile.model_dump())
 
     async def mark_done(self):
         async with self._lock:
             self.is_done = True
+            self._bump()
+            if self.store:
+                self.store.update_job(self.job_id, is_done=True)
+            self._publish(
+                "done", {"is_done": True, "csv_file_path": self.csv_file_path}
+            )
+
+    async def reopen(self):
+        """Clear the done flag so a resumed job reports progress again."""
+        async with self._lock:
+            self.is_done = False
+            self._bump()
+            if self.store:
+                self.store.update_job(self.job_id, is_done=False)
+            self._publish("reopened", {"is_done": False})
+
+    async def mark_search_done(self):
+        async with self._lock:
+            self.search_done = True
+            if self.store:
+                self.store.update_job(self.job_id, search_done=True)
+
+    async def pending_profiles(self) -> List[Profile]:
+        """
+        Discovered profiles without a result yet: never visited, cut off
+        mid-visit, or failed, which is often the browser or model giving out
+        rather than the profile.
+        """
+        async with self._lock:
+            return [p.model_copy() for p in self.profiles if p.status != "completed"]
+
+    async def get_results(self) -> List[Dict]:
+        """Extracted result rows already persisted for this job."""
+        if not self.store:
+            return []
+        async with self._lock:
+            return list(self.store.iter_results(self.job_id))
 
     async def set_csv_file_path(self, path: str):
         async with self._lock:
             self.csv_file_path = path
+            self._bump()
+            if self.store:
+                self.store.update_job(self.job_id, csv_file_path=path)
+
+    async def record_result(self, result: Dict):
+        """Persist one extracted LinkedInProfileResult row for this job."""
+        if self.store:
+            async with self._lock:
+                self.store.add_result(self.job_id, result.get("Profile_URL", ""), result)
 
-    async def get_state(self):
+    @property
+    def cursor(self) -> str:
+        """Opaque position in this manager's change log: job:epoch:version."""
+        return f"{self.job_id or ''}:{self.epoch}:{self.version}"
+
+    def _cursor_version(self, cursor: Optional[str]) -> Optional[int]:
+        """The version of a cursor issued by this manager, else None."""
+        if not cursor:
+            return None
+        parts = cursor.rsplit(":", 2)
+        if len(parts) != 3 or parts[0] != (self.job_id or "") or parts[1] != self.epoch:
+            return None
+        try:
+            return int(parts[2])
+        except ValueError:
+            return None
+
+    async def get_state(self, since: Optional[str] = None):
+        """
+        Return the progress state. With `since`, a cursor from an earlier
+        state, only profiles changed after it are included ("full": False),
+        and None is returned when nothing changed at all. Cursors from before
+        the last reset, another job, or another server process or restore get
+        a full snapshot.
+        """
         async with self._lock:
+            version = self._cursor_version(since)
+            if version is not None and version == self.version:
+                return None
+
+            full = (
+                version is None
+                or version < self._reset_version
+                or version > self.version
+            )
+            if full:
+                profiles = self.profiles
+            else:
+                start = bisect_right(self._change_log, version, key=lambda c: c[0])
+                changed_ids = dict.fromkeys(pid for _, pid in self._change_log[start:])
+                profiles = [self._profiles_by_id[pid] for pid in changed_ids]
+
             return {
-                "profiles": [p.dict() for p in self.profiles],
+                "profiles": [p.dict() for p in profiles],
                 "is_done": self.is_done,
                 "profiles_needed": self.profiles_needed,
                 "csv_file_path": self.csv_file_path
                 if self.csv_file_path
                 else None,  # Add this line
+                "version": self.version,
+                "cursor": self.cursor,
+                "full": full,
             }
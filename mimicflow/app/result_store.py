@@ -0,0 +1,248 @@
+# mimicflow/app/result_store.py
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import json
+import sqlite3
+import threading
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'queued',
+    profiles_needed INTEGER NOT NULL DEFAULT 0,
+    is_done INTEGER NOT NULL DEFAULT 0,
+    csv_file_path TEXT,
+    search_done INTEGER NOT NULL DEFAULT 0,
+    request TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    profile_id TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'pending',
+    message TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (job_id, profile_id)
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_url ON profiles(url);
+CREATE TABLE IF NOT EXISTS results (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    profile_url TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (job_id, profile_url)
+);
+CREATE INDEX IF NOT EXISTS idx_results_profile_url ON results(profile_url);
+CREATE TABLE IF NOT EXISTS facet_ids (
+    kind TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    facet_id TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (kind, name_key)
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    job_id TEXT,
+    name TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL
+);
+"""
+
+JOB_FIELDS = {
+    "status",
+    "profiles_needed",
+    "is_done",
+    "csv_file_path",
+    "search_done",
+    "error",
+}
+
+
+class ResultStore:
+    """
+    Embedded SQLite store for jobs, discovered profiles and extracted
+    LinkedInProfileResult rows, so runs survive a server restart and past
+    results can be queried without scanning linkedin_searches/. It also
+    keeps the outcome for every profile URL ever visited, across all runs,
+    and the LinkedIn facet IDs of company, school and location names.
+    """
+
+    def __init__(self, db_path: str = "linkedin_searches/mimicflow.db"):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat()
+
+    # --- jobs
+
+    def create_job(self, job_id: str, request: Optional[Dict] = None, created_at: Optional[str] = None):
+        now = self._now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (id, request, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(request) if request is not None else None, created_at or now, now),
+            )
+
+    def update_job(self, job_id: str, **fields):
+        unknown = set(fields) - JOB_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+        if not fields:
+            return
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ?",
+                (*fields.values(), self._now(), job_id),
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job_row(row) if row else None
+
+    def list_jobs(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY created_at").fetchall()
+        return [self._job_row(row) for row in rows]
+
+    @staticmethod
+    def _job_row(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job["is_done"] = bool(job["is_done"])
+        job["search_done"] = bool(job["search_done"])
+        job["request"] = json.loads(job["request"]) if job["request"] else None
+        return job
+
+    # --- discovered profiles
+
+    def upsert_profile(self, job_id: str, profile: Dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO profiles (job_id, profile_id, name, url, status, message, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (job_id, profile_id) DO UPDATE SET
+                    name = excluded.name, url = excluded.url, status = excluded.status,
+                    message = excluded.message, updated_at = excluded.updated_at""",
+                (
+                    job_id,
+                    profile["id"],
+                    profile.get("name", ""),
+                    profile.get("url", ""),
+                    profile.get("status", "pending"),
+                    profile.get("message", ""),
+                    self._now(),
+                ),
+            )
+
+    def get_profiles(self, job_id: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT profile_id AS id, name, url, status, message FROM profiles
+                WHERE job_id = ? ORDER BY CAST(profile_id AS INTEGER), profile_id""",
+                (job_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete_profiles(self, job_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM profiles WHERE job_id = ?", (job_id,))
+
+    # --- extracted results
+
+    def add_result(self, job_id: str, profile_url: str, data: Dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO results (job_id, profile_url, data, created_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (job_id, profile_url) DO UPDATE SET data = excluded.data""",
+                (job_id, profile_url, json.dumps(data), self._now()),
+            )
+
+    def count_results(self, job_id: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM results WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+
+    def iter_results(self, job_id: str, batch_size: int = 200) -> Iterator[Dict]:
+        """Yield result rows of a job in insertion order, a batch at a time."""
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, data FROM results WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                    (job_id, last_seq, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield json.loads(row["data"])
+            last_seq = rows[-1]["seq"]
+
+    # --- contacted profiles, across all jobs
+
+    def set_contact(self, url: str, status: str, job_id: Optional[str] = None, name: str = ""):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO contacts (url, status, job_id, name, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    status = excluded.status, job_id = excluded.job_id,
+                    name = excluded.name, updated_at = excluded.updated_at""",
+                (url, status, job_id, name, self._now()),
+            )
+
+    def get_contacts(self) -> Dict[str, str]:
+        """Status of every known profile URL."""
+        with self._lock:
+            rows = self._conn.execute("SELECT url, status FROM contacts").fetchall()
+        return {row["url"]: row["status"] for row in rows}
+
+    # --- LinkedIn search facet IDs
+
+    def get_facet_id(self, kind: str, name_key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT facet_id FROM facet_ids WHERE kind = ? AND name_key = ?",
+                (kind, name_key),
+            ).fetchone()
+        return row["facet_id"] if row else None
+
+    def set_facet_id(self, kind: str, name_key: str, facet_id: str, name: str = ""):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT INTO facet_ids (kind, name_key, facet_id, name, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, name_key) DO UPDATE SET
+                    facet_id = excluded.facet_id, name = excluded.name,
+                    updated_at = excluded.updated_at""",
+                (kind, name_key, facet_id, name, self._now()),
+            )
+
+    def delete_facet_id(self, kind: str, name_key: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM facet_ids WHERE kind = ? AND name_key = ?", (kind, name_key)
+            )
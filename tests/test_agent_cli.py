@@ -0,0 +1,46 @@
+import sys
+
+from mimicflow.agents.linkedin import linkedin_agent, linkedin_agent_cli
+
+
+def test_cli_runs_a_search_end_to_end(tmp_path, monkeypatch, capsys):
+    class FakeBrowser:
+        async def close(self):
+            pass
+
+    class FakePool:
+        def __init__(self, browser, size):
+            self.browser = browser
+
+        async def warm(self):
+            pass
+
+        async def close(self):
+            pass
+
+    async def run_search(agent):
+        agent._enqueue_profile({"name": "Ada", "URL": "https://x/in/ada"})
+        await agent.progress_manager.mark_search_done()
+
+    async def process_profile(agent, profile, in_context_examples):
+        return {"Full_Name": profile["name"], "Profile_URL": profile["URL"]}, None
+
+    Agent = linkedin_agent.LinkedInSearchAgent
+    monkeypatch.setattr(linkedin_agent, "new_browser", FakeBrowser)
+    monkeypatch.setattr(linkedin_agent, "BrowserPool", FakePool)
+    monkeypatch.setattr(Agent, "_setup_llm", lambda self, llm: None)
+    monkeypatch.setattr(
+        Agent, "_setup_directories", lambda self, base_dir: (tmp_path, tmp_path / "detailed_profiles.csv")
+    )
+    monkeypatch.setattr(Agent, "_run_search", run_search)
+    monkeypatch.setattr(Agent, "process_profile", process_profile)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["linkedin_agent_cli", "--companies", "OpenAI", "--universities", "MIT", "--titles", "Engineer"],
+    )
+
+    linkedin_agent_cli.main()
+
+    assert "Collected profiles:" in capsys.readouterr().out
+    assert "Ada" in (tmp_path / "detailed_profiles.csv").read_text()
@@ -0,0 +1,119 @@
+import asyncio
+import csv
+import json
+
+import pytest
+
+from mimicflow.agents.linkedin import linkedin_batch_cli as batch
+
+
+def test_load_manifest_jsonl_and_yaml(tmp_path):
+    jsonl = tmp_path / "searches.jsonl"
+    jsonl.write_text(
+        "# overnight\n"
+        + json.dumps({"name": "ml", "companies": ["OpenAI"], "universities": ["MIT"], "titles": ["Engineer"], "profiles_needed": 5, "send_connection_request": False})
+        + "\n\n"
+        + json.dumps({"linkedin_url": "https://www.linkedin.com/search/results/people/?keywords=x", "profiles_needed": 3})
+        + "\n"
+    )
+    first, second = batch.load_manifest(jsonl)
+    assert first.name == "ml" and first.filter.companies == ["OpenAI"]
+    assert first.options == {"send_connection_request": False}
+    assert second.name == "search-2" and second.options == {}
+
+    yaml_file = tmp_path / "searches.yaml"
+    yaml_file.write_text(
+        "searches:\n"
+        "  - name: finance\n"
+        "    companies: [Goldman Sachs]\n"
+        "    universities: [NYU]\n"
+        "    titles: [Analyst]\n"
+        "    profiles_needed: 10\n"
+        "    profile_workers: 2\n"
+    )
+    (search,) = batch.load_manifest(yaml_file)
+    assert search.filter.titles == ["Analyst"] and search.options == {"profile_workers": 2}
+
+
+def test_load_manifest_rejects_invalid_entries(tmp_path):
+    manifest = tmp_path / "bad.jsonl"
+    manifest.write_text(json.dumps({"name": "empty", "profiles_needed": 5}) + "\n")
+    with pytest.raises(ValueError, match="empty"):
+        batch.load_manifest(manifest)
+
+
+def test_run_batch_limits_searches_and_combines_results(tmp_path, monkeypatch):
+    running = []
+    peak = []
+
+    class FakeBrowser:
+        async def close(self):
+            pass
+
+    class FakePool:
+        def __init__(self, browser, size):
+            self.browser = browser
+            self.size = size
+
+        async def warm(self):
+            pass
+
+        async def close(self):
+            pass
+
+    class FakeAgent:
+        def __init__(self, filter_config, base_output_dir, progress_manager, job_id, **kwargs):
+            self.filter = filter_config
+            self.progress_manager = progress_manager
+            self.job_id = job_id
+            self.base_dir = tmp_path / "searches" / job_id
+            self.csv_file_path = self.base_dir / "detailed_profiles.csv"
+            assert kwargs["browser_pool"].size == 4
+
+        async def run(self, in_context_examples):
+            running.append(self)
+            peak.append(len(running))
+            await asyncio.sleep(0.02)
+            running.remove(self)
+            if self.filter.companies == ["Broken"]:
+                raise RuntimeError("search page did not load")
+            self.progress_manager.store.add_result(
+                self.job_id,
+                f"https://www.linkedin.com/in/{self.job_id}",
+                {"Full_Name": f"Person at {self.filter.companies[0]}", "Education": []},
+            )
+
+    monkeypatch.setattr(batch, "new_browser", FakeBrowser)
+    monkeypatch.setattr(batch, "BrowserPool", FakePool)
+    monkeypatch.setattr(batch, "LinkedInSearchAgent", FakeAgent)
+
+    searches = [
+        batch.BatchSearch(
+            name=company,
+            filter=batch.LinkedInFilter(
+                companies=[company], universities=["MIT"], titles=["Engineer"], profiles_needed=2
+            ),
+        )
+        for company in ["OpenAI", "Broken", "DeepMind"]
+    ]
+    summaries = asyncio.run(
+        batch.run_batch(searches, tmp_path, concurrency=4, searches_at_once=2)
+    )
+
+    assert max(peak) == 2
+    assert [s["status"] for s in summaries] == ["completed", "failed", "completed"]
+    assert summaries[1]["error"] == "search page did not load"
+    assert [s["results"] for s in summaries] == [1, 0, 1]
+    assert all(s["duration_s"] is not None for s in summaries)
+    # The third search waited for a free slot
+    assert summaries[2]["queued_s"] > 0
+
+    with open(tmp_path / "results.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["Search"], r["Full_Name"]) for r in rows] == [
+        ("OpenAI", "Person at OpenAI"),
+        ("DeepMind", "Person at DeepMind"),
+    ]
+    with open(tmp_path / "batch_summary.csv") as f:
+        assert [r["name"] for r in csv.DictReader(f)] == ["OpenAI", "Broken", "DeepMind"]
+    assert (tmp_path / "mimicflow.db").exists()
@@ -0,0 +1,135 @@
+import asyncio
+
+from mimicflow.agents.linkedin import browser_pool as pool_module
+from mimicflow.agents.linkedin.browser_pool import BLANK_PAGE, BrowserPool, PooledContext
+
+
+class FakePage:
+    def __init__(self, opener=None):
+        self.url = None
+        self.closed = False
+        self._opener = opener
+
+    async def opener(self):
+        return self._opener
+
+    async def wait_for_load_state(self):
+        pass
+
+    async def goto(self, url):
+        self.url = url
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self):
+        self.current_page = FakePage()
+
+
+class FakeContext:
+    def __init__(self, browser, config):
+        self.context_id = f"ctx{len(browser.contexts)}"
+        browser.contexts.append(self)
+        self.session = FakeSession()
+        self.opened_pages = []
+        self.closed = False
+
+    async def get_session(self):
+        return self.session
+
+    def release_pages(self):
+        pages, self.opened_pages = self.opened_pages, []
+        return pages
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    class config:
+        new_context_config = None
+
+    def __init__(self):
+        self.contexts = []
+
+
+def test_pool_reuses_and_resets_contexts(monkeypatch):
+    monkeypatch.setattr(pool_module, "PooledContext", FakeContext)
+    browser = FakeBrowser()
+    pool = BrowserPool(browser, size=2)
+
+    async def profile_agent():
+        async with pool.lease() as context:
+            home_page = context.session.current_page
+            # The agent wanders off into a new tab
+            tab = FakePage()
+            context.opened_pages.append(tab)
+            context.session.current_page = tab
+            await asyncio.sleep(0.01)
+        assert tab.closed
+        assert context.session.current_page is home_page
+        assert home_page.url == BLANK_PAGE
+
+    async def main():
+        await asyncio.gather(*(profile_agent() for _ in range(5)))
+        await pool.close()
+
+    asyncio.run(main())
+
+    assert len(browser.contexts) == 2
+    assert all(context.closed for context in browser.contexts)
+    stats = pool.stats()
+    assert stats["leases"] == 5
+    assert stats["leased"] == 0
+    assert stats["lease_wait_max_s"] > 0
+
+
+def test_reset_closes_only_the_leases_own_tabs(monkeypatch):
+    monkeypatch.setattr(pool_module, "PooledContext", FakeContext)
+    pool = BrowserPool(FakeBrowser(), size=2)
+
+    async def main():
+        async with pool.lease() as first:
+            async with pool.lease() as second:
+                live_tab = FakePage()
+                second.opened_pages.append(live_tab)
+                # browser_use moved the first context onto the second's tab
+                first.session.current_page = live_tab
+            assert live_tab.closed
+            other_tab = FakePage()
+            first.session.current_page = other_tab
+        # Not opened by the first lease, so left alone; the lease is re-pinned
+        assert not other_tab.closed
+        assert first.session.current_page is not other_tab
+
+    asyncio.run(main())
+
+
+def test_pooled_context_follows_only_tabs_opened_from_its_own():
+    class FakeChromeContext:
+        def on(self, event, handler):
+            self.handler = handler
+
+    context = PooledContext(browser=None)
+    context.home_page = FakePage()
+    context.session = FakeSession()
+    context.session.current_page = context.home_page
+    chrome = FakeChromeContext()
+    context._add_new_page_listener(chrome)
+
+    async def main():
+        await chrome.handler(FakePage())  # another context's new tab
+        await chrome.handler(FakePage(opener=FakePage()))  # another's popup
+        popup = FakePage(opener=context.home_page)
+        await chrome.handler(popup)
+        return popup
+
+    popup = asyncio.run(main())
+    assert context.opened_pages == [popup]
+    assert context.session.current_page is popup
+    assert context.release_pages() == [popup] and context.opened_pages == []
@@ -0,0 +1,169 @@
+import asyncio
+
+from mimicflow.agents.linkedin import connect_flow as flow
+from mimicflow.agents.linkedin import linkedin_agent
+from mimicflow.agents.linkedin.linkedin_agent import LinkedInSearchAgent
+from mimicflow.agents.linkedin.pacing import INTERACTION, NAVIGATION, PacingScheduler
+
+
+def fast_pacer():
+    # No waiting, but every paced action is still counted
+    return PacingScheduler({NAVIGATION: (0, 1), INTERACTION: (0, 1)})
+
+
+class FakeLocator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+        self.first = self
+
+    async def is_visible(self):
+        return self.selector in self.page.visible
+
+    async def wait_for(self, state, timeout):
+        if (self.selector in self.page.visible) != (state == "visible"):
+            raise TimeoutError(self.selector)
+
+    async def click(self, timeout):
+        self.page.clicks.append(self.selector)
+        self.page.visible = self.page.transitions.get(self.selector, self.page.visible)
+
+    async def fill(self, text):
+        self.page.filled = text
+
+    async def get_attribute(self, name):
+        return self.page.texts.get(self.selector, "Invite Ada Lovelace to connect")
+
+    async def inner_text(self):
+        return self.page.texts.get(self.selector, "Add a note to your invitation to Ada?")
+
+
+class FakeKeyboard:
+    def __init__(self, page):
+        self.page = page
+
+    async def press(self, key):
+        self.page.pressed.append(key)
+        if key == "Escape":
+            self.page.visible = set()
+
+
+class FakePage:
+    """Profile page whose visible elements change on each click."""
+
+    def __init__(self, visible, transitions, texts=None):
+        self.visible = set(visible)
+        self.transitions = {k: set(v) for k, v in transitions.items()}
+        self.texts = texts or {}
+        self.clicks = []
+        self.pressed = []
+        self.filled = None
+        self.keyboard = FakeKeyboard(self)
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+
+def test_connect_with_note_through_more_menu():
+    page = FakePage(
+        visible=[flow.MORE_BUTTON],
+        transitions={
+            flow.MORE_BUTTON: [flow.MORE_MENU_CONNECT],
+            flow.MORE_MENU_CONNECT: [flow.DIALOG, flow.ADD_NOTE_BUTTON],
+            flow.ADD_NOTE_BUTTON: [flow.DIALOG, flow.NOTE_FIELD, flow.SEND_BUTTON],
+            flow.SEND_BUTTON: [],
+        },
+    )
+    pacer = fast_pacer()
+    outcome = asyncio.run(flow.run_connect_flow(page, "Hi Ada", "Ada Lovelace", pacer))
+    assert outcome.status == "sent"
+    # Four clicks and the note each drew on the interaction budget
+    assert pacer.stats()["linkedin"][INTERACTION]["waits"] == 5
+    assert page.clicks[-1] == flow.SEND_BUTTON
+    assert page.filled == "Hi Ada"
+
+
+def test_unexpected_dialog_is_handed_back():
+    # LinkedIn asks for the member's email instead of offering a note
+    page = FakePage(
+        visible=[flow.CONNECT_BUTTON],
+        transitions={flow.CONNECT_BUTTON: [flow.DIALOG]},
+    )
+    outcome = asyncio.run(flow.run_connect_flow(page, "Hi Ada", "Ada Lovelace", fast_pacer()))
+    assert outcome.status == "handoff"
+    # The agent takes over from the profile page, not a half-open dialog
+    assert page.pressed == ["Escape"]
+    assert flow.DIALOG not in page.visible
+
+    connected = FakePage(visible=[flow.MORE_BUTTON], transitions={flow.MORE_BUTTON: []})
+    outcome = asyncio.run(flow.run_connect_flow(connected, None, "Ada Lovelace", fast_pacer()))
+    assert outcome.status == "not_available"
+
+
+def test_invitation_for_someone_else_is_not_sent():
+    transitions = {
+        flow.CONNECT_BUTTON: [flow.DIALOG, flow.SEND_WITHOUT_NOTE_BUTTON],
+        flow.SEND_WITHOUT_NOTE_BUTTON: [],
+    }
+    button = FakePage(
+        visible=[flow.CONNECT_BUTTON],
+        transitions=transitions,
+        texts={flow.CONNECT_BUTTON: "Invite Grace Hopper to connect"},
+    )
+    outcome = asyncio.run(flow.run_connect_flow(button, None, "Ada Lovelace", fast_pacer()))
+    assert outcome.status == "handoff"
+    assert button.clicks == []
+
+    dialog = FakePage(
+        visible=[flow.CONNECT_BUTTON],
+        transitions=transitions,
+        texts={flow.DIALOG: "Add a note to your invitation to Grace?"},
+    )
+    outcome = asyncio.run(flow.run_connect_flow(dialog, None, "Ada Lovelace", fast_pacer()))
+    assert outcome.status == "handoff"
+    assert flow.SEND_WITHOUT_NOTE_BUTTON not in dialog.clicks
+    assert dialog.pressed == ["Escape"]
+
+
+def test_saved_note_is_the_note_sent(monkeypatch):
+    # Skip __init__, which launches a browser
+    agent = LinkedInSearchAgent.__new__(LinkedInSearchAgent)
+    agent.send_connection_request = True
+    agent.include_note = True
+    agent.template_selector = None
+    sent = []
+
+    class Batcher:
+        async def draft(self, profile, templates=None):
+            return "Hi Ada" + "!" * 400
+
+    class Context:
+        async def get_current_page(self):
+            return None
+
+    async def read_profile_page(browser_context, profile_url):
+        return {
+            "Full_Name": "Ada Lovelace",
+            "Current_Title": "Engineer",
+            "Company": "Acme",
+            "Location": "London",
+            "Education": [],
+            "Companies_Worked_At": [],
+            "Common_Interests": [],
+            "Custom_Message": "",
+            "Profile_URL": profile_url,
+        }
+
+    async def run_connect_flow(page, note, invitee):
+        sent.append(note)
+        return flow.ConnectOutcome(status="sent")
+
+    agent.message_batcher = Batcher()
+    agent._read_profile_page = read_profile_page
+    monkeypatch.setattr(linkedin_agent, "run_connect_flow", run_connect_flow)
+
+    result, _ = asyncio.run(
+        agent._process_profile_without_agent(Context(), "https://x/in/ada")
+    )
+    assert len(sent[0]) == flow.MAX_NOTE_LENGTH
+    assert result.Custom_Message == sent[0]
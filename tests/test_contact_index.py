@@ -0,0 +1,29 @@
+from mimicflow.agents.linkedin.contact_index import (
+    CONTACTED,
+    EXTRACTED,
+    SKIP_WHEN_CONNECTING,
+    ContactIndex,
+    normalize_profile_url,
+)
+from mimicflow.app.result_store import ResultStore
+
+
+def test_normalized_urls_ignore_tracking_and_case():
+    assert (
+        normalize_profile_url("https://www.linkedin.com/in/Ada-Lovelace/?miniProfileUrn=x&trk=y")
+        == normalize_profile_url("/in/ada-lovelace")
+        == "https://www.linkedin.com/in/ada-lovelace"
+    )
+
+
+def test_contact_index_persists_across_restarts(tmp_path):
+    db_path = str(tmp_path / "store.db")
+    index = ContactIndex(ResultStore(db_path))
+    index.record("https://www.linkedin.com/in/ada?trk=x", CONTACTED, job_id="job1", name="Ada")
+    index.record("https://www.linkedin.com/in/bob", EXTRACTED)
+
+    restarted = ContactIndex(ResultStore(db_path))
+    assert restarted.status("https://www.linkedin.com/in/ADA/") == CONTACTED
+    assert restarted.is_known("https://www.linkedin.com/in/ada", SKIP_WHEN_CONNECTING)
+    assert not restarted.is_known("https://www.linkedin.com/in/bob", SKIP_WHEN_CONNECTING)
+    assert restarted.stats() == {CONTACTED: 1, EXTRACTED: 1}
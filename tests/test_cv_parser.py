@@ -0,0 +1,114 @@
+import io
+import zipfile
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from mimicflow.app import cv_parser
+from mimicflow.app.cv_parser import (
+    UnsupportedDocumentError,
+    UploadSizeLimit,
+    extract_cv_text,
+    read_upload,
+)
+
+
+def _make_pdf(pages):
+    """A minimal PDF with one line of Helvetica text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    font = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (font, content)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+def _make_docx(body: str) -> bytes:
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def test_extract_docx_text_keeps_paragraphs_and_tabs():
+    data = _make_docx(
+        "<w:p><w:r><w:t>Ada Lovelace</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>Engineer</w:t><w:tab/><w:t>London</w:t></w:r></w:p>"
+    )
+    assert extract_cv_text(data, "cv.docx") == "Ada Lovelace\nEngineer\tLondon"
+
+
+def test_extract_cv_text_rejects_unknown_formats():
+    with pytest.raises(UnsupportedDocumentError):
+        extract_cv_text(b"\xd0\xcf\x11\xe0legacy word", "cv.doc")
+
+
+def test_extract_pdf_text():
+    text = extract_cv_text(_make_pdf(["Ada Lovelace", "Analytical Engine"]), "cv.pdf")
+    assert text.splitlines() == ["Ada Lovelace", "Analytical Engine"]
+
+
+def test_long_pdf_is_split_across_workers_in_page_order():
+    pages = [f"Page {i}" for i in range(cv_parser.PARALLEL_PAGE_THRESHOLD + 2)]
+    assert extract_cv_text(_make_pdf(pages)).splitlines() == pages
+
+
+def _upload_app():
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimit, paths=["/upload"], max_bytes=2048)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await read_upload(file))}
+
+    return app
+
+
+def test_upload_cap_is_enforced_while_the_body_arrives():
+    client = TestClient(_upload_app())
+    assert client.post("/upload", files={"file": ("cv.txt", b"x" * 100)}).json() == {"size": 100}
+
+    too_large = client.post("/upload", files={"file": ("cv.txt", b"x" * 5000)})
+    assert too_large.status_code == 413
+
+    # A body sent without a Content-Length is still counted
+    def chunks():
+        yield b"--b\r\nContent-Disposition: form-data; name=file; filename=cv.txt\r\n\r\n"
+        for _ in range(10):
+            yield b"x" * 1024
+        yield b"\r\n--b--\r\n"
+
+    streamed = client.post(
+        "/upload", content=chunks(), headers={"content-type": "multipart/form-data; boundary=b"}
+    )
+    assert streamed.status_code == 413
@@ -0,0 +1,150 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mimicflow.app.llm_cache import LLMCache
+
+
+class Chunk:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    """Streams a canned summary or set of templates, or fails."""
+
+    def __init__(self, fail_summary=False):
+        self.fail_summary = fail_summary
+        self.calls = 0
+
+    async def astream(self, messages):
+        self.calls += 1
+        if "Here is my resume" in messages[-1]["content"]:
+            if self.fail_summary:
+                raise RuntimeError("quota exceeded")
+            tokens = ["I am ", "Ada."]
+        else:
+            tokens = ["Hi [Name], ", "let's connect."]
+        for token in tokens:
+            yield Chunk(token)
+
+
+@pytest.fixture
+def main(tmp_path, monkeypatch):
+    monkeypatch.setenv("MIMICFLOW_DB_PATH", str(tmp_path / "mimicflow.db"))
+    monkeypatch.setenv("MIMICFLOW_LLM_CACHE_DIR", str(tmp_path / "llm_cache"))
+    from mimicflow.app import main
+
+    monkeypatch.setattr(main, "llm_cache", LLMCache(str(tmp_path / "llm_cache")))
+    monkeypatch.setattr(main, "extract_cv_text", lambda contents, filename: contents.decode())
+    return main
+
+
+def _use_llm(main, monkeypatch, llm):
+    monkeypatch.setattr(main.llm_registry, "get", lambda *args, **kwargs: llm)
+
+
+def _events(main, cv=b"Ada Lovelace, engineer"):
+    client = TestClient(main.app)
+    response = client.post("/api/upload-cv/stream", files={"file": ("cv.txt", cv)})
+    assert response.status_code == 200
+    events = []
+    for frame in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_sends_tokens_then_done(main, monkeypatch):
+    _use_llm(main, monkeypatch, FakeLLM())
+    events = _events(main)
+    assert [name for name, _ in events] == [
+        "summary_token",
+        "summary_token",
+        "summary_done",
+        "template_token",
+        "template_token",
+        "done",
+    ]
+    assert events[2][1] == {"summary": "I am Ada."}
+    assert events[-1][1] == {
+        "summary": "I am Ada.",
+        "connection_requests": "Hi [Name], let's connect.",
+    }
+
+
+def test_cached_upload_is_replayed_without_the_model(main, monkeypatch):
+    llm = FakeLLM()
+    _use_llm(main, monkeypatch, llm)
+    first = _events(main)
+    again = _events(main)
+    assert llm.calls == 2
+    # Each stage comes back whole, as a single token
+    assert again == [
+        ("summary_token", {"token": "I am Ada."}),
+        ("summary_done", {"summary": "I am Ada."}),
+        ("template_token", {"token": "Hi [Name], let's connect."}),
+        ("done", first[-1][1]),
+    ]
+
+
+def test_failed_summary_sends_an_error_event(main, monkeypatch):
+    llm = FakeLLM(fail_summary=True)
+    _use_llm(main, monkeypatch, llm)
+    events = _events(main)
+    assert events[0] == ("error", {"stage": "summary", "message": "quota exceeded"})
+    assert [name for name, _ in events[1:]] == [
+        "summary_done",
+        "template_token",
+        "template_token",
+        "done",
+    ]
+    # The failed summary is not cached, so a retry asks the model again
+    assert _events(main)[0][0] == "error"
+    assert llm.calls == 3
+
+
+def test_stream_stops_when_the_client_leaves(main, monkeypatch):
+    llm = FakeLLM()
+    _use_llm(main, monkeypatch, llm)
+
+    async def read_cv_text(file):
+        return "Ada Lovelace, engineer"
+
+    class LeavingRequest:
+        def __init__(self):
+            self.checks = 0
+
+        async def is_disconnected(self):
+            self.checks += 1
+            return self.checks > 1
+
+    monkeypatch.setattr(main, "_read_cv_text", read_cv_text)
+
+    async def consume():
+        response = await main.upload_cv_stream(LeavingRequest(), file=None)
+        return [frame async for frame in response.body_iterator]
+
+    frames = asyncio.run(consume())
+    assert len(frames) == 1 and frames[0].startswith("event: summary_token")
+    # Templates were never requested
+    assert llm.calls == 1
+
+
+def test_unparseable_cv_is_rejected_without_caching(main, monkeypatch, tmp_path):
+    llm = FakeLLM()
+    _use_llm(main, monkeypatch, llm)
+
+    def extract_cv_text(contents, filename):
+        raise ValueError("broken xref table")
+
+    monkeypatch.setattr(main, "extract_cv_text", extract_cv_text)
+    client = TestClient(main.app)
+    for path in ["/api/upload-cv", "/api/upload-cv/stream"]:
+        response = client.post(path, files={"file": ("cv.pdf", b"%PDF-broken")})
+        assert response.status_code == 400
+        assert "broken xref table" in response.json()["detail"]
+    assert llm.calls == 0
+    assert main.llm_cache.stats()["bytes"] == 0
@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+
+import pytest
+
+from mimicflow.agents.linkedin.result_writer import ResultWriter
+from mimicflow.app.exporters import iter_csv, iter_jsonl, iter_parquet, parquet_available
+
+COLUMNS = ["Full_Name", "Education"]
+ROWS = [
+    {"Full_Name": "Ada", "Education": ["Cambridge"]},
+    {"Full_Name": "Bob", "Education": []},
+]
+
+
+def test_result_writer_appends_rows(tmp_path):
+    path = tmp_path / "detailed_profiles.csv"
+    writer = ResultWriter(path, COLUMNS)
+    writer.start()
+    writer.append(ROWS[0])
+
+    # A resumed run keeps what is already there
+    resumed = ResultWriter(path, COLUMNS)
+    resumed.start(resume=True)
+    resumed.append(ROWS[1])
+
+    with open(path, newline="") as f:
+        assert [row["Full_Name"] for row in csv.DictReader(f)] == ["Ada", "Bob"]
+
+
+def test_csv_and_jsonl_exports():
+    text = "".join(iter_csv(ROWS, COLUMNS))
+    assert [row["Full_Name"] for row in csv.DictReader(io.StringIO(text))] == ["Ada", "Bob"]
+
+    lines = "".join(iter_jsonl(ROWS, COLUMNS)).splitlines()
+    assert json.loads(lines[0]) == ROWS[0]
+
+
+@pytest.mark.skipif(not parquet_available(), reason="pyarrow not installed")
+def test_parquet_export_round_trips():
+    import pyarrow.parquet as pq
+
+    data = b"".join(iter_parquet(ROWS, COLUMNS, list_columns=["Education"]))
+    assert pq.read_table(io.BytesIO(data)).to_pylist() == ROWS
@@ -0,0 +1,29 @@
+import asyncio
+
+from mimicflow.app.job_registry import JobRegistry
+
+
+def test_jobs_are_isolated_and_bounded_by_max_workers():
+    async def scenario():
+        registry = JobRegistry(max_workers=1)
+        running = []
+        peak = 0
+
+        async def runner(job):
+            nonlocal peak
+            running.append(job.id)
+            peak = max(peak, len(running))
+            await job.progress_manager.add_profile({"name": job.id, "URL": job.id})
+            await asyncio.sleep(0.01)
+            running.remove(job.id)
+
+        jobs = [registry.create_job() for _ in range(3)]
+        await asyncio.gather(*(registry.submit(job, runner) for job in jobs))
+        return registry, jobs, peak
+
+    registry, jobs, peak = asyncio.run(scenario())
+    assert peak == 1
+    assert registry.latest() is jobs[-1]
+    for job in jobs:
+        assert job.status == "completed"
+        assert [p.name for p in job.progress_manager.profiles] == [job.id]
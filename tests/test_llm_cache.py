@@ -0,0 +1,31 @@
+import os
+
+from mimicflow.app.llm_cache import LLMCache
+
+
+def test_cache_hits_misses_and_persists(tmp_path):
+    cache = LLMCache(str(tmp_path))
+    key = LLMCache.make_key("summary", "model", "1", "cv text")
+    assert cache.get(key) is None
+    cache.set(key, "summary text")
+    assert cache.get(key) == "summary text"
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    reopened = LLMCache(str(tmp_path))
+    assert reopened.get(key) == "summary text"
+    assert LLMCache.make_key("ab", "c") != LLMCache.make_key("a", "bc")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path), max_bytes=300)
+    keys = [LLMCache.make_key(str(i)) for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.set(key, "x" * 80)
+        path = cache._path(key)
+        os.utime(path, (age, age))
+    cache.get(keys[0])  # refresh the oldest entry
+    cache.set(LLMCache.make_key("new"), "x" * 80)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.stats()["bytes"] <= 300
@@ -0,0 +1,15 @@
+from mimicflow.app.llm_registry import LLMRegistry
+
+
+def test_registry_reuses_clients_until_key_changes(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-first")
+    registry = LLMRegistry()
+    client = registry.get("openai", "gpt-4o", temperature=0.0)
+    assert registry.get("openai", "gpt-4o", temperature=0.0) is client
+    assert registry.get("openai", "gpt-4o", temperature=0.5) is not client
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-second")
+    assert registry.get("openai", "gpt-4o", temperature=0.0) is not client
+
+    registry.invalidate("openai")
+    assert registry.stats() == {"clients": []}
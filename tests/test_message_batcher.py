@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+from mimicflow.agents.linkedin.message_batcher import MessageBatcher
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        names = [line.split('"Full_Name": "')[1].split('"')[0] for line in prompt.splitlines() if "Full_Name" in line]
+
+        class Response:
+            # Out of order, to check notes are matched by index
+            content = "Sure:\n" + json.dumps(
+                [{"index": i, "message": f"Hi {name}!"} for i, name in enumerate(names)][::-1]
+            )
+
+        return Response()
+
+
+def test_concurrent_notes_share_one_llm_call():
+    llm = FakeLLM()
+    batcher = MessageBatcher(llm, strategy="<CV SUMMARY>long</CV SUMMARY>", max_batch=3, window=1.0)
+
+    async def main():
+        return await asyncio.gather(
+            *(batcher.draft({"Full_Name": name}) for name in ["Ada", "Bob", "Cy", "Di"])
+        )
+
+    notes = asyncio.run(main())
+    assert notes == ["Hi Ada!", "Hi Bob!", "Hi Cy!", "Hi Di!"]
+    # Three fill a batch at once; the fourth goes out when the window closes
+    assert batcher.calls == 2
+    assert all(prompt.count("<CV SUMMARY>") == 1 for prompt in llm.prompts)
+
+
+def test_failed_batch_returns_no_notes():
+    class BrokenLLM:
+        async def ainvoke(self, messages):
+            raise RuntimeError("quota exceeded")
+
+    batcher = MessageBatcher(BrokenLLM(), strategy="", max_batch=2)
+
+    async def main():
+        return await asyncio.gather(*(batcher.draft({"Full_Name": n}) for n in ["Ada", "Bob"]))
+
+    assert asyncio.run(main()) == [None, None]
+
+
+def test_batch_lists_each_picked_template_once():
+    llm = FakeLLM()
+    batcher = MessageBatcher(llm, strategy="", max_batch=2)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.draft({"Full_Name": "Ada"}, templates=["Founder note", "Research note"]),
+            batcher.draft({"Full_Name": "Bob"}, templates=["Research note"]),
+        )
+
+    assert asyncio.run(main()) == ["Hi Ada!", "Hi Bob!"]
+    prompt = llm.prompts[0]
+    assert prompt.count("Research note") == 1
+    assert '"Ada"} (use template 1, 2)' in prompt
+    assert '"Bob"} (use template 2)' in prompt
+
+
+def test_short_reply_fails_the_whole_batch():
+    class ShortLLM:
+        async def ainvoke(self, messages):
+            class Response:
+                content = json.dumps(["Hi Bob!", "Hi Cara!"])
+
+            return Response()
+
+    batcher = MessageBatcher(ShortLLM(), strategy="", max_batch=3)
+
+    async def main():
+        return await asyncio.gather(
+            *(batcher.draft({"Full_Name": n}) for n in ["Ann", "Bob", "Cara"])
+        )
+
+    assert asyncio.run(main()) == [None, None, None]
+
+
+def test_repeated_index_fails_the_whole_batch():
+    class RepeatingLLM:
+        async def ainvoke(self, messages):
+            class Response:
+                content = json.dumps(
+                    [{"index": 0, "message": "Hi Ann!"}, {"index": 0, "message": "Hi Bob!"}]
+                )
+
+            return Response()
+
+    batcher = MessageBatcher(RepeatingLLM(), strategy="", max_batch=2)
+
+    async def main():
+        return await asyncio.gather(*(batcher.draft({"Full_Name": n}) for n in ["Ann", "Bob"]))
+
+    assert asyncio.run(main()) == [None, None]
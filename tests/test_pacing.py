@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+from mimicflow.agents.linkedin.pacing import (
+    INTERACTION,
+    NAVIGATION,
+    Pacer,
+    PacingScheduler,
+)
+
+
+def test_pacer_spaces_out_concurrent_waiters():
+    pacer = Pacer(interval=0.05)
+    starts = []
+
+    async def worker():
+        await pacer.wait()
+        starts.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(*(worker() for _ in range(3)))
+
+    asyncio.run(main())
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
+
+
+def test_pacer_bursts_then_serves_waiters_by_priority():
+    pacer = Pacer(interval=0.05, burst=2)
+    order = []
+
+    async def worker(name, priority):
+        await pacer.wait(priority)
+        order.append(name)
+
+    async def main():
+        # Two tokens go at once; the rest queue for the next ones
+        await asyncio.gather(
+            worker("a", 1), worker("b", 1), worker("profile", 1), worker("search", 0)
+        )
+
+    started = time.monotonic()
+    asyncio.run(main())
+    assert order == ["a", "b", "search", "profile"]
+    assert time.monotonic() - started >= 0.09
+    stats = pacer.stats()
+    assert stats["waits"] == 4 and stats["wait_max_s"] >= 0.09
+
+
+def test_scheduler_keeps_a_budget_per_account_and_kind():
+    scheduler = PacingScheduler({NAVIGATION: (10.0, 1), INTERACTION: (10.0, 1)})
+
+    async def main():
+        # One token each, so none of these waits
+        await scheduler.wait(NAVIGATION, account="a")
+        await scheduler.wait(INTERACTION, account="a")
+        await scheduler.wait(NAVIGATION, account="b")
+
+    asyncio.run(asyncio.wait_for(main(), timeout=1))
+    stats = scheduler.stats()
+    assert set(stats) == {"a", "b"}
+    assert stats["a"][INTERACTION]["waits"] == 1
+    assert stats["b"][NAVIGATION]["wait_max_s"] < 0.05
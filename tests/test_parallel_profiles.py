@@ -0,0 +1,266 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from mimicflow.agents.linkedin import linkedin_agent
+from mimicflow.agents.linkedin.contact_index import ContactIndex
+from mimicflow.agents.linkedin.linkedin_agent import LinkedInSearchAgent
+from mimicflow.agents.linkedin.result_writer import ResultWriter
+from mimicflow.app.progress_manager import ProgressManager
+from mimicflow.app.result_store import ResultStore
+
+
+def bare_agent(profile_workers: int) -> LinkedInSearchAgent:
+    # Skip __init__, which launches a browser
+    agent = LinkedInSearchAgent.__new__(LinkedInSearchAgent)
+    agent.job_id = None
+    agent.send_connection_request = False
+    agent.profile_workers = profile_workers
+    agent.progress_manager = ProgressManager()
+    agent.contact_index = ContactIndex()
+    agent.profile_agent_histories = {}
+    agent.discovered_profiles = []
+    agent._seen_urls = set()
+    agent.llm = None
+    agent.template_mode = "examples"
+    agent.custom_template = None
+    agent.template_selector = None
+    agent._owns_browser = True
+    return agent
+
+
+def test_profiles_run_in_parallel_and_merge_in_order(tmp_path):
+    agent = bare_agent(profile_workers=3)
+    running = 0
+    peak = 0
+
+    async def process_profile(profile, in_context_examples):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        # Later profiles finish first
+        await asyncio.sleep(0.01 * (5 - profile["position"]))
+        running -= 1
+        return {"Full_Name": profile["name"]}, None
+
+    agent.process_profile = process_profile
+    profiles = [{"name": f"p{i}", "URL": f"https://x/in/p{i}", "position": i} for i in range(5)]
+    detailed_profiles = []
+    writer = ResultWriter(tmp_path / "detailed_profiles.csv", ["Full_Name"])
+
+    async def main():
+        queue = asyncio.Queue()
+        for item in enumerate(profiles):
+            queue.put_nowait(item)
+        for _ in range(agent.profile_workers):
+            queue.put_nowait(None)
+        await agent._process_profiles(queue, "", detailed_profiles, writer)
+
+    asyncio.run(main())
+
+    assert peak == 3
+    assert [p["Full_Name"] for p in detailed_profiles] == [f"p{i}" for i in range(5)]
+    assert (tmp_path / "detailed_profiles.csv").read_text().split() == [
+        "Full_Name",
+        *[f"p{i}" for i in range(5)],
+    ]
+
+
+def test_failing_profile_does_not_stall_the_others(tmp_path):
+    agent = bare_agent(profile_workers=2)
+    profiles = [{"name": f"p{i}", "URL": f"https://x/in/p{i}"} for i in range(4)]
+
+    async def process_profile(profile, in_context_examples):
+        if profile["name"] == "p1":
+            raise RuntimeError("browser crashed")
+        return {"Full_Name": profile["name"]}, None
+
+    agent.process_profile = process_profile
+    detailed_profiles = []
+    writer = ResultWriter(tmp_path / "detailed_profiles.csv", ["Full_Name"])
+
+    async def main():
+        queue = asyncio.Queue()
+        for idx, profile in enumerate(profiles):
+            profile["id"] = await agent.progress_manager.add_profile(profile)
+            queue.put_nowait((idx, profile))
+        for _ in range(agent.profile_workers):
+            queue.put_nowait(None)
+        await asyncio.wait_for(
+            agent._process_profiles(queue, "", detailed_profiles, writer), timeout=5
+        )
+
+    asyncio.run(main())
+
+    # Profiles after the failed one are still flushed, in order
+    assert [p["Full_Name"] for p in detailed_profiles] == ["p0", "p2", "p3"]
+    assert agent.progress_manager.profiles[1].status == "failed"
+    assert agent.contact_index.status("https://x/in/p1") == "failed"
+
+
+def test_finished_result_survives_an_interrupted_run(tmp_path):
+    agent = bare_agent(profile_workers=2)
+    store = ResultStore(str(tmp_path / "store.db"))
+    store.create_job("job")
+    agent.progress_manager = ProgressManager(job_id="job", store=store)
+
+    async def process_profile(profile, in_context_examples):
+        if profile["name"] == "p0":
+            # Profile 0 never finishes, so nothing can be written in order
+            await asyncio.Event().wait()
+        return {"Full_Name": profile["name"], "Profile_URL": profile["URL"]}, None
+
+    agent.process_profile = process_profile
+    writer = ResultWriter(tmp_path / "detailed_profiles.csv", ["Full_Name"])
+
+    async def main():
+        queue = asyncio.Queue()
+        for idx in range(2):
+            queue.put_nowait((idx, {"name": f"p{idx}", "URL": f"https://x/in/p{idx}"}))
+        run = asyncio.create_task(agent._process_profiles(queue, "", [], writer))
+        for _ in range(100):
+            if store.count_results("job"):
+                break
+            await asyncio.sleep(0.01)
+        # Interrupted while profile 0 is still running
+        run.cancel()
+
+    asyncio.run(main())
+
+    assert list(store.iter_results("job")) == [
+        {"Full_Name": "p1", "Profile_URL": "https://x/in/p1"}
+    ]
+
+
+def test_profiles_start_while_search_is_still_paging(tmp_path):
+    agent = bare_agent(profile_workers=2)
+    agent.csv_file_path = tmp_path / "detailed_profiles.csv"
+    events = []
+
+    class Closeable:
+        async def warm(self):
+            pass
+
+        async def close(self):
+            pass
+
+    agent.browser_pool = agent.browser = Closeable()
+
+    async def run_search():
+        for page in range(2):
+            agent._enqueue_profile({"name": f"page{page}", "URL": f"https://x/in/{page}"})
+            await asyncio.sleep(0.05)
+            events.append(f"page {page} done")
+        await agent.progress_manager.mark_search_done()
+
+    async def process_profile(profile, in_context_examples):
+        events.append(f"visit {profile['name']}")
+        return {"Full_Name": profile["name"]}, None
+
+    agent._run_search = run_search
+    agent.process_profile = process_profile
+
+    df = asyncio.run(agent.run(""))
+
+    assert events.index("visit page0") < events.index("page 0 done")
+    assert list(df["Full_Name"]) == ["page0", "page1"]
+    assert agent.progress_manager.is_done
+
+
+def test_resume_skips_the_search_and_finished_profiles(tmp_path):
+    store = ResultStore(str(tmp_path / "store.db"))
+    store.create_job("job")
+    manager = ProgressManager(job_id="job", store=store)
+
+    async def interrupted_run():
+        for name, status in [("p0", "completed"), ("p1", "failed"), ("p2", "processing")]:
+            profile_id = await manager.add_profile({"name": name, "URL": f"https://x/in/{name}"})
+            await manager.update_profile(profile_id, status=status)
+        await manager.record_result({"Full_Name": "p0", "Profile_URL": "https://x/in/p0"})
+        await manager.mark_search_done()
+
+    asyncio.run(interrupted_run())
+
+    agent = bare_agent(profile_workers=2)
+    agent.progress_manager = ProgressManager.restore("job", store)
+    agent.csv_file_path = tmp_path / "detailed_profiles.csv"
+    visited = []
+
+    class Closeable:
+        async def warm(self):
+            pass
+
+        async def close(self):
+            pass
+
+    agent.browser_pool = agent.browser = Closeable()
+
+    async def run_search():
+        raise AssertionError("the search had finished and must not run again")
+
+    async def process_profile(profile, in_context_examples):
+        visited.append(profile["name"])
+        await agent.progress_manager.update_profile(profile["id"], status="completed")
+        return {"Full_Name": profile["name"], "Profile_URL": profile["URL"]}, None
+
+    agent._run_search = run_search
+    agent.process_profile = process_profile
+
+    df = asyncio.run(agent.run("", resume=True))
+
+    assert visited == ["p1", "p2"]
+    assert list(df["Full_Name"]) == ["p0", "p1", "p2"]
+    assert agent.csv_file_path.read_text().count("https://x/in/") == 3
+
+
+def test_visit_is_paced_only_once_a_context_is_leased(tmp_path, monkeypatch):
+    agent = bare_agent(profile_workers=1)
+    agent.base_dir = tmp_path
+    events = []
+
+    class Pacer:
+        async def wait(self, *args, **kwargs):
+            events.append("pace")
+
+    class Page:
+        async def content(self):
+            return ""
+
+    class Context:
+        async def navigate_to(self, url):
+            events.append("navigate")
+
+        async def get_current_page(self):
+            return Page()
+
+    class Pool:
+        @asynccontextmanager
+        async def lease(self):
+            events.append("lease")
+            yield Context()
+
+    class Batcher:
+        async def draft(self, profile, templates=None):
+            return "Hi Ada"
+
+    monkeypatch.setattr(linkedin_agent, "linkedin_pacer", Pacer())
+    fields = {
+        "Full_Name": "Ada Lovelace",
+        "Current_Title": "Engineer",
+        "Company": "Acme",
+        "Location": "London",
+        "Education": [],
+        "Companies_Worked_At": [],
+        "Common_Interests": [],
+        "Profile_URL": "https://x/in/ada",
+    }
+    monkeypatch.setattr(linkedin_agent, "parse_profile_page", lambda html, url: dict(fields))
+    monkeypatch.setattr(linkedin_agent, "missing_fields", lambda fields: [])
+    agent.browser_pool = Pool()
+    agent.message_batcher = Batcher()
+
+    profile = {"name": "Ada", "URL": "https://x/in/ada", "id": "1"}
+    result, _ = asyncio.run(agent.process_profile(profile, ""))
+
+    # A worker waiting for a context holds no pacing token
+    assert events == ["lease", "pace", "navigate"]
+    assert result["Custom_Message"] == "potential message: Hi Ada"
@@ -0,0 +1,51 @@
+from mimicflow.agents.linkedin.profile_page_parser import missing_fields, parse_profile_page
+
+PROFILE_PAGE = """
+<html><body><main>
+  <section class="artdeco-card">
+    <h1 class="text-heading-xlarge">Ada Lovelace</h1>
+    <div class="text-body-medium break-words">Mathematician | Writing about engines</div>
+    <span class="text-body-small inline t-black--light break-words">London, England</span>
+    <button aria-label="Current company: Engines Ltd. Click to skip to experience card"></button>
+  </section>
+  <section class="artdeco-card">
+    <div id="experience" class="pv-profile-card__anchor"></div>
+    <ul>
+      <li class="artdeco-list__item">
+        <span aria-hidden="true">Engines Ltd</span>
+        <span aria-hidden="true">Full-time · 3 yrs</span>
+        <ul>
+          <li><span aria-hidden="true">Lead Analyst</span><span aria-hidden="true">2024 - Present</span></li>
+          <li><span aria-hidden="true">Analyst</span></li>
+        </ul>
+      </li>
+      <li class="artdeco-list__item">
+        <span aria-hidden="true">Translator</span>
+        <span aria-hidden="true">Royal Society · Contract</span>
+      </li>
+    </ul>
+  </section>
+  <section class="artdeco-card">
+    <div id="education" class="pv-profile-card__anchor"></div>
+    <ul>
+      <li class="artdeco-list__item"><span aria-hidden="true">University of London</span></li>
+    </ul>
+  </section>
+</main></body></html>
+"""
+
+
+def test_profile_page_fields_are_read_from_the_dom():
+    fields = parse_profile_page(PROFILE_PAGE, "https://www.linkedin.com/in/ada-lovelace")
+    assert fields["Full_Name"] == "Ada Lovelace"
+    assert fields["Current_Title"] == "Lead Analyst"
+    assert fields["Company"] == "Engines Ltd"
+    assert fields["Location"] == "London, England"
+    assert fields["Education"] == ["University of London"]
+    assert fields["Companies_Worked_At"] == ["Engines Ltd", "Royal Society"]
+    assert missing_fields(fields) == []
+
+
+def test_missing_sections_are_reported():
+    fields = parse_profile_page("<main><h1>Ada Lovelace</h1></main>", "https://x/in/ada")
+    assert missing_fields(fields) == ["Current_Title", "Company", "Location"]
@@ -0,0 +1,66 @@
+import asyncio
+
+from mimicflow.app.progress_manager import ProgressManager
+
+
+def test_subscribers_receive_events_in_order():
+    async def scenario():
+        manager = ProgressManager()
+        queue = manager.subscribe()
+        profile_id = await manager.add_profile({"name": "Ada", "URL": "https://x/in/ada"})
+        await manager.update_profile(profile_id, status="completed")
+        await manager.mark_done()
+        manager.unsubscribe(queue)
+        await manager.add_profile({"name": "Late", "URL": "https://x/in/late"})
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    events = asyncio.run(scenario())
+    assert [e["event"] for e in events] == ["profile_added", "profile_updated", "done"]
+    assert events[1]["data"]["status"] == "completed"
+
+
+def test_get_state_since_returns_only_changed_profiles():
+    async def scenario():
+        manager = ProgressManager()
+        first = await manager.add_profile({"name": "Ada", "URL": "https://x/in/ada"})
+        await manager.add_profile({"name": "Bob", "URL": "https://x/in/bob"})
+        cursor = (await manager.get_state())["cursor"]
+        unchanged = await manager.get_state(since=cursor)
+        await manager.update_profile(first, status="processing")
+        await manager.update_profile(first, status="completed")
+        delta = await manager.get_state(since=cursor)
+        await manager.reset()
+        after_reset = await manager.get_state(since=cursor)
+        return unchanged, delta, after_reset
+
+    unchanged, delta, after_reset = asyncio.run(scenario())
+    assert unchanged is None
+    assert delta["full"] is False
+    assert [p["name"] for p in delta["profiles"]] == ["Ada"]
+    assert delta["profiles"][0]["status"] == "completed"
+    assert after_reset["full"] is True and after_reset["profiles"] == []
+
+
+def test_cursor_from_another_job_or_process_gets_a_full_snapshot():
+    async def scenario():
+        job_a = ProgressManager("a")
+        await job_a.add_profile({"name": "Ada", "URL": "https://x/in/ada"})
+        cursor = (await job_a.get_state())["cursor"]
+
+        job_b = ProgressManager("b")
+        await job_b.add_profile({"name": "Bob", "URL": "https://x/in/bob"})
+        await job_b.add_profile({"name": "Cy", "URL": "https://x/in/cy"})
+        other_job = await job_b.get_state(since=cursor)
+
+        # Same job after a restart: versions restart but the epoch changes
+        restarted = ProgressManager("a")
+        await restarted.add_profile({"name": "Ada", "URL": "https://x/in/ada"})
+        await restarted.add_profile({"name": "Di", "URL": "https://x/in/di"})
+        other_process = await restarted.get_state(since=cursor)
+        garbage = await restarted.get_state(since="not-a-cursor")
+        return other_job, other_process, garbage
+
+    other_job, other_process, garbage = asyncio.run(scenario())
+    assert other_job["full"] is True and len(other_job["profiles"]) == 2
+    assert other_process["full"] is True and len(other_process["profiles"]) == 2
+    assert garbage["full"] is True
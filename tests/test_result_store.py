@@ -0,0 +1,39 @@
+import asyncio
+
+from mimicflow.app.job_registry import JobRegistry
+from mimicflow.app.result_store import ResultStore
+
+
+def test_progress_survives_restart(tmp_path):
+    db_path = str(tmp_path / "store.db")
+
+    async def first_process():
+        registry = JobRegistry(store=ResultStore(db_path))
+        job = registry.create_job(request={"profiles_needed": 2})
+        job.set_status("running")
+        manager = job.progress_manager
+        await manager.set_target(2)
+        profile_id = await manager.add_profile({"name": "Ada", "URL": "https://x/in/ada"})
+        await manager.update_profile(profile_id, status="completed")
+        await manager.add_profile({"name": "Bob", "URL": "https://x/in/bob"})
+        await manager.mark_search_done()
+        await manager.record_result({"Full_Name": "Ada", "Profile_URL": "https://x/in/ada"})
+        return job.id
+
+    job_id = asyncio.run(first_process())
+
+    store = ResultStore(db_path)
+    job = JobRegistry(store=store).get(job_id)
+    assert job.status == "interrupted"
+    assert job.request == {"profiles_needed": 2}
+    assert job.progress_manager.profiles_needed == 2
+    assert job.progress_manager.search_done
+    assert [(p.name, p.status) for p in job.progress_manager.profiles] == [
+        ("Ada", "completed"),
+        ("Bob", "pending"),
+    ]
+    pending = asyncio.run(job.progress_manager.pending_profiles())
+    assert [p.name for p in pending] == ["Bob"]
+    assert list(store.iter_results(job_id)) == [
+        {"Full_Name": "Ada", "Profile_URL": "https://x/in/ada"}
+    ]
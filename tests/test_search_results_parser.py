@@ -0,0 +1,174 @@
+from mimicflow.agents.linkedin.search_results_parser import (
+    canonical_profile_url,
+    parse_search_results_html,
+    parse_search_results_markdown,
+)
+
+RESULTS_PAGE = """
+<html><body>
+<header><a href="https://www.linkedin.com/in/me-myself/">Me</a></header>
+<main><ul>
+  <li class="reusable-search__result-container">
+    <span class="entity-result__title-text">
+      <a class="app-aware-link" href="https://www.linkedin.com/in/ada-lovelace?miniProfileUrn=abc">
+        <span dir="ltr"><span aria-hidden="true">Ada Lovelace</span>
+        <span class="visually-hidden">View Ada Lovelace’s profile</span></span>
+      </a>
+    </span>
+    <div class="entity-result__primary-subtitle">Analyst at Engines Ltd</div>
+    <div class="entity-result__secondary-subtitle">London, England</div>
+    <a href="/in/charles-babbage/">Charles Babbage</a> is a mutual connection
+  </li>
+  <li class="reusable-search__result-container">
+    <a href="/in/grace-hopper/"><span aria-hidden="true">Grace Hopper</span></a>
+  </li>
+</ul></main>
+</body></html>
+"""
+
+
+def test_html_parser_reads_result_cards_in_order():
+    assert parse_search_results_html(RESULTS_PAGE) == [
+        {
+            "name": "Ada Lovelace",
+            "URL": "https://www.linkedin.com/in/ada-lovelace",
+            "headline": "Analyst at Engines Ltd",
+            "location": "London, England",
+        },
+        {
+            "name": "Grace Hopper",
+            "URL": "https://www.linkedin.com/in/grace-hopper",
+            "headline": None,
+            "location": None,
+        },
+    ]
+
+
+def test_markdown_parser_and_url_canonicalisation():
+    markdown = (
+        "[Ada Lovelace View Ada Lovelace's profile](https://www.linkedin.com/in/ada-lovelace/)\n"
+        "[Jobs](https://www.linkedin.com/jobs/)\n"
+        "[Ada again](https://www.linkedin.com/in/ada-lovelace?trk=x)"
+    )
+    assert [(p["name"], p["URL"]) for p in parse_search_results_markdown(markdown)] == [
+        ("Ada Lovelace", "https://www.linkedin.com/in/ada-lovelace")
+    ]
+    assert canonical_profile_url("https://example.com/in/ada") is None
+
+
+def test_search_action_hands_profiles_to_the_profile_phase(tmp_path, monkeypatch):
+    import asyncio
+    import json
+
+    from mimicflow.agents.linkedin.linkedin_agent import (
+        ExtractAndSaveContent,
+        LinkedInFilter,
+        LinkedInSearchAgent,
+    )
+    from mimicflow.app.progress_manager import ProgressManager
+
+    class Page:
+        async def content(self):
+            return RESULTS_PAGE
+
+    class Context:
+        async def get_current_page(self):
+            return Page()
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    agent = LinkedInSearchAgent(
+        filter_config=LinkedInFilter(linkedin_url="https://x/search", profiles_needed=1),
+        base_output_dir=str(tmp_path),
+        progress_manager=ProgressManager(),
+        save_search_pages=True,
+    )
+    action = agent.controller.registry.registry.actions["extract_and_save_content"]
+
+    result = asyncio.run(
+        action.function(ExtractAndSaveContent(page_number=1, include_links=True), browser=Context())
+    )
+
+    # Only as many as needed, in page order, with the progress IDs attached
+    assert [p["name"] for p in agent.discovered_profiles] == ["Ada Lovelace"]
+    assert agent.discovered_profiles[0]["id"] == agent.progress_manager.profiles[0].id
+    # The target is met, so the search stops here
+    assert result.is_done
+    record = json.loads((agent.base_dir / "search_pages.jsonl").read_text())
+    assert record["source"] == "dom"
+    assert len(record["profiles"]) == 2
+
+
+def test_search_action_asks_for_more_pages_on_a_shortfall(tmp_path, monkeypatch):
+    import asyncio
+
+    from mimicflow.agents.linkedin.linkedin_agent import (
+        ExtractAndSaveContent,
+        LinkedInFilter,
+        LinkedInSearchAgent,
+    )
+    from mimicflow.app.progress_manager import ProgressManager
+
+    class Page:
+        async def content(self):
+            return RESULTS_PAGE
+
+    class Context:
+        async def get_current_page(self):
+            return Page()
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    agent = LinkedInSearchAgent(
+        filter_config=LinkedInFilter(linkedin_url="https://x/search", profiles_needed=2),
+        base_output_dir=str(tmp_path),
+        progress_manager=ProgressManager(),
+    )
+    action = agent.controller.registry.registry.actions["extract_and_save_content"]
+    # Ada was contacted by an earlier run, which leaves one profile short
+    agent.contact_index.record("https://www.linkedin.com/in/ada-lovelace", "contacted")
+
+    result = asyncio.run(
+        action.function(ExtractAndSaveContent(page_number=1, include_links=True), browser=Context())
+    )
+
+    assert not result.is_done
+    assert "next page" in result.extracted_content
+    assert [p["name"] for p in agent.discovered_profiles] == ["Grace Hopper"]
+
+
+def test_url_search_pages_by_query_parameter(tmp_path, monkeypatch):
+    import asyncio
+
+    from mimicflow.agents.linkedin.linkedin_agent import LinkedInFilter, LinkedInSearchAgent
+    from mimicflow.agents.linkedin.search_results_parser import search_page_url
+    from mimicflow.app.progress_manager import ProgressManager
+
+    search_url = "https://www.linkedin.com/search/results/people/?keywords=ai&page=4"
+    assert search_page_url(search_url, 1) == (
+        "https://www.linkedin.com/search/results/people/?keywords=ai"
+    )
+    assert search_page_url(search_url, 2).endswith("?keywords=ai&page=2")
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    agent = LinkedInSearchAgent(
+        filter_config=LinkedInFilter(linkedin_url=search_url, profiles_needed=12),
+        base_output_dir=str(tmp_path),
+        progress_manager=ProgressManager(),
+    )
+    fetched = []
+
+    async def fetch_search_page(page_number):
+        fetched.append(page_number)
+        cards = "".join(
+            f'<li class="reusable-search__result-container">'
+            f'<a href="/in/p{page_number}-{i}"><span aria-hidden="true">P {page_number} {i}</span></a></li>'
+            for i in range(10)
+        )
+        return f"<main><ul>{cards}</ul></main>"
+
+    agent._fetch_search_page = fetch_search_page
+    asyncio.run(agent._run_url_search())
+
+    # 12 profiles fit on two pages, fetched together; no third page is loaded
+    assert sorted(fetched) == [1, 2]
+    assert len(agent.discovered_profiles) == 12
+    assert agent.discovered_profiles[10]["URL"] == "https://www.linkedin.com/in/p2-0"
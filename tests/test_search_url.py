@@ -0,0 +1,111 @@
+import asyncio
+import json
+from urllib.parse import parse_qs, urlparse
+
+from mimicflow.agents.linkedin.linkedin_agent import LinkedInFilter
+from mimicflow.agents.linkedin.search_url import FacetIdCache, compile_search_url, match_facet_id
+from mimicflow.app.result_store import ResultStore
+
+IDS = {("company", "Google DeepMind"): "1441", ("school", "MIT"): "1503", ("geo", "New York"): "105080838"}
+
+
+def test_filter_compiles_to_a_faceted_search_url(tmp_path):
+    lookups = []
+
+    async def lookup(kind, name):
+        lookups.append(name)
+        return IDS.get((kind, name))
+
+    search_filter = LinkedInFilter(
+        companies=["Google DeepMind"],
+        universities=["MIT"],
+        titles=["Research Scientist", "Engineer"],
+        profiles_needed=5,
+        additional_filters=["Location: New York"],
+    )
+
+    async def compile_with(cache):
+        return await compile_search_url(
+            search_filter, lambda kind, name: cache.resolve(kind, name, lookup)
+        )
+
+    db_path = str(tmp_path / "store.db")
+    url = asyncio.run(compile_with(FacetIdCache(ResultStore(db_path))))
+    params = {key: values[0] for key, values in parse_qs(urlparse(url).query).items()}
+    assert params == {
+        "keywords": "Research Scientist OR Engineer",
+        "origin": "FACETED_SEARCH",
+        "currentCompany": '["1441"]',
+        "schoolFilter": '["1503"]',
+        "geoUrn": '["105080838"]',
+    }
+
+    # A later run, even after a restart, resolves everything from the cache
+    assert asyncio.run(compile_with(FacetIdCache(ResultStore(db_path)))) == url
+    assert len(lookups) == 3
+
+
+def test_unresolved_name_falls_back_to_the_form():
+    async def lookup(kind, name):
+        return None
+
+    search_filter = LinkedInFilter(
+        companies=["Nowhere Inc"], universities=["MIT"], titles=["Engineer"], profiles_needed=1
+    )
+    cache = FacetIdCache()
+    url = asyncio.run(
+        compile_search_url(search_filter, lambda kind, name: cache.resolve(kind, name, lookup))
+    )
+    assert url is None
+
+
+def test_filter_without_a_facet_falls_back_to_the_form():
+    async def lookup(kind, name):
+        return IDS.get((kind, name))
+
+    search_filter = LinkedInFilter(
+        companies=["Google DeepMind"],
+        universities=["MIT"],
+        titles=["Engineer"],
+        profiles_needed=1,
+        additional_filters=["open to work"],
+    )
+    cache = FacetIdCache()
+    url = asyncio.run(
+        compile_search_url(search_filter, lambda kind, name: cache.resolve(kind, name, lookup))
+    )
+    assert url is None
+
+
+def test_typeahead_hit_must_match_the_name():
+    text = json.dumps(
+        {
+            "elements": [
+                {"text": {"text": "Apple Bank"}, "targetUrn": "urn:li:fs_miniCompany:22"},
+                {"text": {"text": "Apple"}, "targetUrn": "urn:li:fs_miniCompany:162479"},
+            ]
+        }
+    )
+    assert match_facet_id(text, "company", "apple") == "162479"
+    assert match_facet_id(text, "company", "Apple Inc") is None
+    assert match_facet_id("", "company", "Apple") is None
+
+
+def test_wrong_cached_id_can_be_replaced(tmp_path):
+    lookups = []
+
+    async def lookup(kind, name):
+        lookups.append(name)
+        return "22"
+
+    db_path = str(tmp_path / "store.db")
+    cache = FacetIdCache(ResultStore(db_path))
+    assert asyncio.run(cache.resolve("company", "Apple", lookup)) == "22"
+
+    cache.override("company", "Apple", "162479")
+    restarted = FacetIdCache(ResultStore(db_path))
+    assert asyncio.run(restarted.resolve("company", "apple", lookup)) == "162479"
+
+    restarted.invalidate("company", "Apple")
+    assert asyncio.run(FacetIdCache(ResultStore(db_path)).resolve("company", "Apple", lookup)) == "22"
+    assert lookups == ["Apple", "Apple"]
@@ -0,0 +1,79 @@
+from mimicflow.agents.linkedin.linkedin_agent import LinkedInSearchAgent
+from mimicflow.agents.linkedin.message_examples import (
+    build_in_context_examples,
+    format_templates,
+)
+from mimicflow.agents.linkedin.template_selector import (
+    TemplateSelector,
+    replace_templates,
+    split_templates,
+)
+
+TEMPLATES = [
+    "Hi [LinkedIn Profile Name], I'm interested in your work at [Company Name] "
+    "and your background in [LinkedIn Profile Research Experience]. I'm currently "
+    "involved in <CV SUMMARY Research Project>.",
+    "Hey [LinkedIn Profile Name], I noticed your experience as a co-founder of "
+    "[Company Name]. I'm working on <CV SUMMARY Startup Project> and would love "
+    "to hear about your entrepreneurial journey.",
+    "Hi [LinkedIn Profile Name], I'm interested in your background in "
+    "[LinkedIn Profile Finance Background] at [Company Name].",
+]
+
+EXAMPLES = (
+    "<CUSTOM_MESSAGE GENERATION INSTRUCTIONS>\n<CV SUMMARY>\nML engineer\n</CV SUMMARY>"
+    "\n\n <MESSAGE TEMPLATES>\n<MESSAGE TEMPLATES>\n"
+    + "".join(f"{i}. {t}\n" for i, t in enumerate(TEMPLATES, start=1))
+    + "</MESSAGE TEMPLATES>\n</MESSAGE TEMPLATES> Keep it short."
+)
+
+
+def test_split_and_replace_templates():
+    assert split_templates(EXAMPLES) == TEMPLATES
+    assert split_templates("no templates here") == []
+
+    narrowed = replace_templates(EXAMPLES, [TEMPLATES[2]])
+    assert split_templates(narrowed) == [TEMPLATES[2]]
+    assert "<CV SUMMARY>\nML engineer" in narrowed
+    assert narrowed.endswith("Keep it short.")
+    assert "MESSAGE TEMPLATES" not in replace_templates(EXAMPLES, [])
+
+
+def test_selects_templates_matching_the_profile():
+    selector = TemplateSelector(TEMPLATES)
+
+    founder = {"Full_Name": "Ada Lovelace", "Current_Title": "Co-Founder & CEO", "Company": "Acme"}
+    assert selector.select(founder, k=1) == [TEMPLATES[1]]
+
+    analyst = {
+        "Full_Name": "Bob Smith",
+        "Current_Title": "Financial Analyst",
+        "Companies_Worked_At": ["Goldman Sachs"],
+    }
+    assert selector.select(analyst)[0] == TEMPLATES[2]
+
+    researcher = {"name": "Cy", "headline": "Research Scientist at DeepMind", "URL": "https://x/in/founder"}
+    assert selector.select(researcher, k=1) == [TEMPLATES[0]]
+
+
+def test_profile_matching_nothing_keeps_template_order():
+    selector = TemplateSelector(TEMPLATES)
+    assert selector.select({"Full_Name": "Di"}) == TEMPLATES[:2]
+
+
+def test_templates_from_the_ui_are_split_back_out():
+    examples = build_in_context_examples("ML engineer", format_templates(TEMPLATES))
+    assert split_templates(examples) == TEMPLATES
+
+
+def test_sparse_profile_keeps_every_template():
+    # Skip __init__, which launches a browser
+    agent = LinkedInSearchAgent.__new__(LinkedInSearchAgent)
+    agent.template_selector = TemplateSelector(TEMPLATES)
+
+    resumed = {"name": "Research Founder", "URL": "https://x/in/rf", "id": "3"}
+    assert not agent.template_selector.matches(resumed)
+    assert agent._examples_for(resumed, EXAMPLES) == EXAMPLES
+
+    card = {"name": "Cy", "URL": "https://x/in/cy", "headline": "Research Scientist"}
+    assert split_templates(agent._examples_for(card, EXAMPLES))[0] == TEMPLATES[0]